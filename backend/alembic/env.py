@@ -14,7 +14,7 @@ sys.path.insert(0, os.path.realpath(os.path.join(os.path.dirname(__file__), '..'
 
 from app.core.config import settings
 from app.db.database import Base
-from app.models import Estudiante, Curso, Matricula  # Importar todos los modelos
+import app.models  # noqa: F401  Registrar todos los modelos en Base.metadata
 
 
 config = context.config
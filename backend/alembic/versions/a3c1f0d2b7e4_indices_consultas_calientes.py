@@ -0,0 +1,56 @@
+"""indices compuestos para las consultas calientes
+
+- matricula (cod_persona, per_matricula) [INCLUDE cod_curso, nota,
+  hrs_inasistencia en PostgreSQL]: historial de un alumno agrupado por
+  período (login, resúmenes, features en línea).
+- Se elimina ix_matricula_cod_persona: es prefijo del índice nuevo y de la PK.
+- Se garantizan los índices del ORM que csv_import pudo no crear
+  (seccion.cod_curso para los IN del login y de /mejor-horario, matricula
+  cod_curso / per_matricula).
+
+Las tablas que todavía no existen se omiten: init_db las crea con estos
+mismos índices.
+
+Revision ID: a3c1f0d2b7e4
+Revises:
+Create Date: 2026-10-19 17:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c1f0d2b7e4'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existe(tabla: str) -> bool:
+    return sa.inspect(op.get_bind()).has_table(tabla)
+
+
+def upgrade() -> None:
+    if _existe("matricula"):
+        op.create_index(
+            "ix_matricula_persona_periodo",
+            "matricula",
+            ["cod_persona", "per_matricula"],
+            if_not_exists=True,
+            postgresql_include=["cod_curso", "nota", "hrs_inasistencia"],
+        )
+        op.create_index("ix_matricula_cod_curso", "matricula", ["cod_curso"], if_not_exists=True)
+        op.create_index("ix_matricula_per_matricula", "matricula", ["per_matricula"], if_not_exists=True)
+        op.drop_index("ix_matricula_cod_persona", table_name="matricula", if_exists=True)
+
+    if _existe("seccion"):
+        op.create_index("ix_seccion_cod_curso", "seccion", ["cod_curso"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    if _existe("matricula"):
+        op.create_index("ix_matricula_cod_persona", "matricula", ["cod_persona"], if_not_exists=True)
+        op.drop_index("ix_matricula_persona_periodo", table_name="matricula", if_exists=True)
@@ -0,0 +1,112 @@
+"""listas nativas en curso (prerequisito, prerequisito_cod, resources)
+
+Las columnas pasan de texto ("['CALCULO I', 'MATEMATICA II']") a ARRAY de
+texto en PostgreSQL y JSON en SQLite. Los valores existentes se parsean una
+sola vez aquí, con la misma conversión que usa el importador de CSV.
+
+Revision ID: b7d2e9a41c58
+Revises: a3c1f0d2b7e4
+Create Date: 2026-10-19 18:40:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e9a41c58'
+down_revision: Union[str, None] = 'a3c1f0d2b7e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNAS = {"prerequisito": 200, "prerequisito_cod": 200, "resources": 1000}
+
+
+def _tipo_lista():
+    return sa.JSON().with_variant(postgresql.ARRAY(sa.Text()), "postgresql")
+
+
+def _columnas_pendientes(conn) -> list:
+    """Columnas de lista que todavía son texto."""
+    inspector = sa.inspect(conn)
+    if not inspector.has_table("curso"):
+        return []
+    tipos = {c["name"]: c["type"] for c in inspector.get_columns("curso")}
+    return [
+        nombre for nombre in COLUMNAS
+        if nombre in tipos and isinstance(tipos[nombre], sa.String)
+    ]
+
+
+def _lista_a_texto(columna: str, valores):
+    """Formato de texto original de cada columna (downgrade)."""
+    if valores is None:
+        return None
+    if columna == "prerequisito_cod":
+        return "[" + ", ".join(valores) + "]"
+    return str(list(valores))
+
+
+def upgrade() -> None:
+    from app.db.csv_import import _texto_a_lista
+
+    conn = op.get_bind()
+    pendientes = _columnas_pendientes(conn)
+    if not pendientes:
+        return
+
+    curso = sa.table("curso", sa.column("cod_curso"), *[sa.column(c) for c in pendientes])
+    filas = conn.execute(sa.select(curso)).mappings().all()
+
+    # En PostgreSQL el texto no se puede convertir a ARRAY con un cast: las
+    # columnas se vacían y se rellenan abajo con los valores ya parseados.
+    with op.batch_alter_table("curso") as batch:
+        for nombre in pendientes:
+            batch.alter_column(
+                nombre,
+                type_=_tipo_lista(),
+                existing_nullable=True,
+                postgresql_using="NULL",
+            )
+
+    destino = sa.table(
+        "curso",
+        sa.column("cod_curso", sa.String),
+        *[sa.column(c, _tipo_lista()) for c in pendientes],
+    )
+    for fila in filas:
+        valores = {
+            c: _texto_a_lista(fila[c].strip()) if fila[c] and fila[c].strip() else None
+            for c in pendientes
+        }
+        conn.execute(
+            destino.update().where(destino.c.cod_curso == fila["cod_curso"]).values(**valores)
+        )
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if not sa.inspect(conn).has_table("curso"):
+        return
+
+    curso = sa.table("curso", sa.column("cod_curso"), *[sa.column(c, _tipo_lista()) for c in COLUMNAS])
+    filas = conn.execute(sa.select(curso)).mappings().all()
+
+    with op.batch_alter_table("curso") as batch:
+        for nombre, largo in COLUMNAS.items():
+            batch.alter_column(
+                nombre,
+                type_=sa.String(largo),
+                existing_nullable=True,
+                postgresql_using="NULL",
+            )
+
+    destino = sa.table("curso", sa.column("cod_curso", sa.String), *[sa.column(c, sa.String) for c in COLUMNAS])
+    for fila in filas:
+        valores = {c: _lista_a_texto(c, fila[c]) for c in COLUMNAS}
+        conn.execute(
+            destino.update().where(destino.c.cod_curso == fila["cod_curso"]).values(**valores)
+        )
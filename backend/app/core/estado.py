@@ -0,0 +1,220 @@
+"""
+Estado de arranque de la aplicación
+Readiness y métricas de carga por artefacto (datos CSV, modelos, features,
+catálogo), progreso de la etapa en curso y fallo de arranque.
+
+Estados que reporta /ready:
+- "starting": cargando (importación de datos o precarga de modelos).
+- "ready" / "degraded": listo; "degraded" si algún artefacto falló pero la
+  app puede responder con sus fallbacks. /ready responde 503 con "degraded"
+  salvo que READY_PERMITIR_DEGRADADO lo acepte.
+- "failed": el arranque no puede completarse (p. ej. no hay datos).
+
+Además se registra cada etapa del arranque (datos, imports, catálogo, feature
+store, modelos) con su duración y la memoria residente (RSS) antes y después,
+para el endpoint /arranque.
+"""
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+_lock = threading.Lock()
+_listo = threading.Event()
+_artefactos: Dict[str, dict] = {}
+_detalle: Optional[str] = "Iniciando"
+_progreso: Optional[dict] = None
+_fallido = False
+_etapas: List[dict] = []
+_segundos_hasta_listo: Optional[float] = None
+
+# Módulos cuyo import domina el arranque; /arranque indica si ya se cargaron
+MODULOS_PESADOS = ("numpy", "pandas", "joblib", "sklearn")
+
+
+def rss_mb() -> Optional[float]:
+    """Memoria residente actual del proceso en MB (None si no se puede leer)."""
+    try:
+        with open("/proc/self/statm") as f:
+            paginas = int(f.read().split()[1])
+        return round(paginas * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # pico, no actual
+        return round(maximo / (2**20 if sys.platform == "darwin" else 2**10), 1)
+    except Exception:
+        return None
+
+
+def segundos_proceso() -> Optional[float]:
+    """Segundos desde que arrancó el proceso (Linux; None en otros sistemas)."""
+    try:
+        with open("/proc/self/stat") as f:
+            # el nombre del comando va entre paréntesis y puede tener espacios
+            campos = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return round(uptime - int(campos[19]) / os.sysconf("SC_CLK_TCK"), 3)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def registrar_etapa(
+    nombre: str,
+    segundos: float,
+    rss_inicio: Optional[float],
+    ok: bool = True,
+    error: Optional[str] = None,
+) -> None:
+    """Guardar la métrica de una etapa del arranque (la RSS final se toma aquí)."""
+    rss_fin = rss_mb()
+    with _lock:
+        _etapas.append({
+            "etapa": nombre,
+            "segundos": round(segundos, 4),
+            "rss_mb_inicio": rss_inicio,
+            "rss_mb_fin": rss_fin,
+            "rss_mb_delta": round(rss_fin - rss_inicio, 1) if rss_fin is not None and rss_inicio is not None else None,
+            "ok": ok,
+            "error": error,
+        })
+
+
+@contextmanager
+def medir_etapa(nombre: str):
+    """Medir duración y RSS de una etapa del arranque.
+
+    Ejemplo de uso:
+        with medir_etapa("feature_store"):
+            get_df_features()
+    """
+    rss_inicio = rss_mb()
+    inicio = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        registrar_etapa(nombre, time.perf_counter() - inicio, rss_inicio, ok=False, error=str(e))
+        raise
+    else:
+        registrar_etapa(nombre, time.perf_counter() - inicio, rss_inicio)
+
+
+@contextmanager
+def medir_carga(nombre: str):
+    """Medir el tiempo de carga de un artefacto y registrar si falló.
+
+    Ejemplo de uso:
+        with medir_carga("modelo_x_matricula"):
+            modelo = joblib.load(MODEL_PATH)
+    """
+    inicio = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        registrar_carga(nombre, time.perf_counter() - inicio, ok=False, error=str(e))
+        raise
+    else:
+        registrar_carga(nombre, time.perf_counter() - inicio)
+
+
+def registrar_carga(
+    nombre: str,
+    segundos: float,
+    ok: bool = True,
+    error: Optional[str] = None,
+    detalle: Optional[dict] = None,
+) -> None:
+    """Guardar la métrica de carga de un artefacto (``detalle``: p. ej. formato y bytes)."""
+    with _lock:
+        _artefactos[nombre] = {
+            "segundos": round(segundos, 4),
+            "ok": ok,
+            "error": error,
+        }
+        if detalle:
+            _artefactos[nombre]["detalle"] = detalle
+
+
+def registrar_progreso(etapa: str, actual: int, total: int, item: Optional[str] = None) -> None:
+    """Avance de la etapa de arranque en curso (p. ej. tabla 2/4 de la importación)."""
+    global _progreso, _detalle
+    with _lock:
+        _progreso = {"etapa": etapa, "actual": actual, "total": total, "item": item}
+        _detalle = f"{etapa} ({actual}/{total}{': ' + item if item else ''})"
+
+
+def marcar_listo(detalle: Optional[str] = None) -> None:
+    global _detalle, _progreso, _segundos_hasta_listo
+    with _lock:
+        _detalle = detalle
+        _progreso = None
+        if _segundos_hasta_listo is None:
+            _segundos_hasta_listo = segundos_proceso()
+    _listo.set()
+
+
+def marcar_no_listo(detalle: str) -> None:
+    global _detalle, _progreso
+    with _lock:
+        _detalle = detalle
+        _progreso = None
+    _listo.clear()
+
+
+def marcar_fallido(detalle: str) -> None:
+    """El arranque no puede completarse: /ready responde "failed" hasta reiniciar."""
+    global _detalle, _fallido
+    with _lock:
+        _detalle = detalle
+        _fallido = True
+    _listo.clear()
+
+
+def esta_fallido() -> bool:
+    return _fallido
+
+
+def esta_listo() -> bool:
+    return _listo.is_set()
+
+
+def reporte() -> dict:
+    """Resumen del estado para el endpoint /ready."""
+    with _lock:
+        artefactos = {k: dict(v) for k, v in _artefactos.items()}
+        detalle = _detalle
+        progreso = dict(_progreso) if _progreso else None
+    degradado = any(not a["ok"] for a in artefactos.values())
+    if _fallido:
+        status = "failed"
+    elif not esta_listo():
+        status = "starting"
+    else:
+        status = "degraded" if degradado else "ready"
+    return {
+        "status": status,
+        "detalle": detalle,
+        "progreso": progreso,
+        "artefactos": artefactos,
+    }
+
+
+def reporte_arranque() -> dict:
+    """Etapas del arranque con tiempos y RSS, para el endpoint /arranque."""
+    with _lock:
+        etapas = [dict(e) for e in _etapas]
+        hasta_listo = _segundos_hasta_listo
+    return {
+        "status": reporte()["status"],
+        "pid": os.getpid(),
+        "segundos_hasta_listo": hasta_listo,
+        "segundos_proceso": segundos_proceso(),
+        "rss_mb": rss_mb(),
+        "etapas": etapas,
+        "modulos_cargados": {m: m in sys.modules for m in MODULOS_PESADOS},
+    }
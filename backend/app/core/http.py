@@ -0,0 +1,174 @@
+"""
+Serialización y compresión de respuestas HTTP
+
+- ``RespuestaJSON``: clase de respuesta por defecto. Usa orjson si está
+  instalado (varias veces más rápido que json en respuestas grandes como el
+  login o /mejor-horario); si no, cae a la JSONResponse estándar.
+- ``CompresionMiddleware``: comprime con brotli (si está instalado y el
+  cliente lo acepta) o gzip las respuestas que superan un tamaño mínimo.
+"""
+
+import gzip
+import zlib
+
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as RespuestaJSON
+    ORJSON_DISPONIBLE = True
+except ImportError:
+    RespuestaJSON = JSONResponse
+    ORJSON_DISPONIBLE = False
+
+try:
+    import brotli
+    BROTLI_DISPONIBLE = True
+except ImportError:
+    brotli = None
+    BROTLI_DISPONIBLE = False
+
+# Tipos que ya vienen comprimidos: no vale la pena recomprimirlos
+_TIPOS_SIN_COMPRESION = ("image/", "video/", "audio/", "application/zip", "application/gzip")
+
+
+def elegir_codificacion(accept_encoding: str) -> str | None:
+    """Codificación preferida según Accept-Encoding: "br", "gzip" o None."""
+    aceptadas = set()
+    for parte in accept_encoding.lower().split(","):
+        nombre, _, params = parte.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0"):
+            continue
+        aceptadas.add(nombre.strip())
+    if BROTLI_DISPONIBLE and "br" in aceptadas:
+        return "br"
+    if "gzip" in aceptadas:
+        return "gzip"
+    return None
+
+
+def comprimir(datos: bytes, codificacion: str, nivel_gzip: int = 6, nivel_brotli: int = 4) -> bytes:
+    """Comprimir un cuerpo completo con la codificación indicada."""
+    if codificacion == "br":
+        return brotli.compress(datos, quality=nivel_brotli)
+    return gzip.compress(datos, compresslevel=nivel_gzip, mtime=0)
+
+
+class _CompresorIncremental:
+    """Compresión por partes para respuestas en streaming."""
+
+    def __init__(self, codificacion: str, nivel_gzip: int, nivel_brotli: int):
+        if codificacion == "br":
+            self._br = brotli.Compressor(quality=nivel_brotli)
+            self._zlib = None
+        else:
+            self._br = None
+            self._zlib = zlib.compressobj(nivel_gzip, zlib.DEFLATED, 31)  # 31 = cabecera gzip
+
+    def procesar(self, datos: bytes) -> bytes:
+        if self._br is not None:
+            return self._br.process(datos)
+        return self._zlib.compress(datos)
+
+    def terminar(self) -> bytes:
+        if self._br is not None:
+            return self._br.finish()
+        return self._zlib.flush()
+
+
+class CompresionMiddleware:
+    """Middleware ASGI de compresión (brotli/gzip) con umbral de tamaño."""
+
+    def __init__(self, app: ASGIApp, minimo_bytes: int = 1024,
+                 nivel_gzip: int = 6, nivel_brotli: int = 4):
+        self.app = app
+        self.minimo_bytes = minimo_bytes
+        self.nivel_gzip = nivel_gzip
+        self.nivel_brotli = nivel_brotli
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        codificacion = elegir_codificacion(Headers(scope=scope).get("accept-encoding", ""))
+        if codificacion is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _RespuestaComprimida(self, codificacion, send)(scope, receive)
+
+
+class _RespuestaComprimida:
+    def __init__(self, middleware: CompresionMiddleware, codificacion: str, send: Send):
+        self.mw = middleware
+        self.codificacion = codificacion
+        self.send = send
+        self.inicio: Message | None = None
+        self.comprimir = False
+        self.sin_cambios = False
+        self.compresor: _CompresorIncremental | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive) -> None:
+        await self.mw.app(scope, receive, self.enviar)
+
+    def _preparar_cabeceras(self, largo: int | None) -> None:
+        headers = MutableHeaders(raw=self.inicio["headers"])
+        headers["Content-Encoding"] = self.codificacion
+        headers.add_vary_header("Accept-Encoding")
+        if largo is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(largo)
+        # El cuerpo cambia con la codificación: el ETag fuerte pasa a débil
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["ETag"] = "W/" + etag
+
+    async def enviar(self, message: Message) -> None:
+        tipo = message["type"]
+
+        if tipo == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            tipo_contenido = headers.get("content-type", "")
+            self.inicio = message
+            self.comprimir = (
+                "content-encoding" not in headers
+                and message["status"] not in (204, 304)
+                and not tipo_contenido.startswith(_TIPOS_SIN_COMPRESION)
+            )
+            return
+
+        if tipo != "http.response.body" or self.inicio is None or self.sin_cambios:
+            await self.send(message)
+            return
+
+        cuerpo = message.get("body", b"")
+        mas = message.get("more_body", False)
+
+        if self.compresor is None:
+            # Primer fragmento: decidir según tamaño
+            if not self.comprimir or (not mas and len(cuerpo) < self.mw.minimo_bytes):
+                self.sin_cambios = True
+                await self.send(self.inicio)
+                await self.send(message)
+                return
+
+            if not mas:
+                datos = comprimir(cuerpo, self.codificacion, self.mw.nivel_gzip, self.mw.nivel_brotli)
+                self._preparar_cabeceras(len(datos))
+                await self.send(self.inicio)
+                await self.send({"type": "http.response.body", "body": datos})
+                return
+
+            # Streaming: comprimir por partes
+            self.compresor = _CompresorIncremental(self.codificacion, self.mw.nivel_gzip, self.mw.nivel_brotli)
+            self._preparar_cabeceras(None)
+            await self.send(self.inicio)
+
+        datos = self.compresor.procesar(cuerpo)
+        if not mas:
+            datos += self.compresor.terminar()
+        await self.send({"type": "http.response.body", "body": datos, "more_body": mas})
@@ -0,0 +1,116 @@
+"""
+Mantenimiento y consultas de la tabla seccion_bloque (horarios normalizados).
+
+- ``reconstruir_bloques(engine)`` parsea una sola vez el JSON de
+  ``seccion.horarios`` y guarda una fila por sesión con el día como índice y
+  las horas en minutos; lo llama el importador de CSV al recargar seccion.
+- ``consulta_bloques(cursos, evitar)`` devuelve las sesiones de las secciones
+  de esos cursos que no chocan con ninguna de las ventanas ``evitar``; el
+  filtro se resuelve en SQL con comparaciones de enteros.
+
+Reconstrucción manual (backfill):
+    python -m app.db.bloques
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import and_, delete, exists, insert, or_, select
+from sqlalchemy.engine import Engine
+
+from app.models.seccion import Seccion, SeccionBloque
+from app.utils.utils import str_to_dict, str_to_list
+
+# Índice de día usado en seccion_bloque.dia
+DIAS = ("Lun", "Mar", "Mie", "Jue", "Vie", "Sab", "Dom")
+INDICE_DIA = {dia: i for i, dia in enumerate(DIAS)}
+
+
+def a_minutos(hora: str) -> int:
+    """"07:30" -> 450"""
+    horas, minutos = hora.split(":")
+    return int(horas) * 60 + int(minutos)
+
+
+def a_hora(minutos: int) -> str:
+    """450 -> "07:30" """
+    return f"{minutos // 60:02d}:{minutos % 60:02d}"
+
+
+def bloques_de_seccion(cod_curso: str, seccion_key: str, horarios: str) -> list[dict]:
+    """Filas de seccion_bloque para una sección (sesiones con día desconocido se omiten)."""
+    filas = []
+    for orden, texto in enumerate(str_to_list(horarios)):
+        sesion = str_to_dict(texto)
+        dia = INDICE_DIA.get(sesion.get("Dia"))
+        if dia is None or not sesion.get("Hora_inicio") or not sesion.get("Hora_fin"):
+            print(f"WARNING - Sesión sin día/horas válidos en {cod_curso} {seccion_key}: {sesion.get('Horario')}")
+            continue
+        filas.append({
+            "cod_curso": cod_curso,
+            "seccion_key": seccion_key,
+            "orden": orden,
+            "dia": dia,
+            "inicio_min": a_minutos(sesion["Hora_inicio"]),
+            "fin_min": a_minutos(sesion["Hora_fin"]),
+            "grupo": sesion.get("Grupo"),
+            "vacantes": sesion.get("Vacantes"),
+            "matriculados": sesion.get("Matriculados"),
+        })
+    return filas
+
+
+def reconstruir_bloques(engine: Engine) -> None:
+    """Recalcular seccion_bloque desde seccion en una transacción."""
+    tabla = SeccionBloque.__table__
+    tabla.create(bind=engine, checkfirst=True)
+
+    with engine.begin() as conn:
+        secciones = conn.execute(
+            select(Seccion.cod_curso, Seccion.seccion_key, Seccion.horarios)
+        ).all()
+        filas = []
+        for cod_curso, seccion_key, horarios in secciones:
+            filas.extend(bloques_de_seccion(cod_curso, seccion_key, horarios))
+
+        conn.execute(delete(tabla))
+        if filas:
+            conn.execute(insert(tabla), filas)
+
+
+def consulta_bloques(cod_cursos: list[str], evitar: list[tuple[int, int, int]] | None = None):
+    """SELECT de las sesiones de las secciones de ``cod_cursos`` que no tienen
+    ninguna sesión solapada con las ventanas ``evitar`` [(dia, inicio_min, fin_min)].
+
+    Orden: el de las secciones en la tabla seccion y, dentro de cada una, el
+    de sus sesiones.
+    """
+    b = SeccionBloque.__table__
+    stmt = select(
+        b.c.cod_curso, b.c.seccion_key, b.c.dia, b.c.inicio_min, b.c.fin_min
+    ).where(b.c.cod_curso.in_(cod_cursos)).order_by(b.c.id)
+
+    if evitar:
+        otro = b.alias("choque")
+        choca = or_(*[
+            and_(otro.c.dia == dia, otro.c.inicio_min < fin, otro.c.fin_min > inicio)
+            for dia, inicio, fin in evitar
+        ])
+        stmt = stmt.where(~exists().where(
+            otro.c.cod_curso == b.c.cod_curso,
+            otro.c.seccion_key == b.c.seccion_key,
+            choca,
+        ))
+    return stmt
+
+
+def main() -> None:
+    import time
+    from app.db.database import engine
+
+    inicio = time.perf_counter()
+    reconstruir_bloques(engine)
+    print(f"OK - Bloques de secciones reconstruidos en {time.perf_counter() - inicio:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
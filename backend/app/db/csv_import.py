@@ -4,16 +4,32 @@ Carga inicial de datos desde CSV como tablas nuevas.
 - Crea/actualiza tablas "curso", "alumno" y "matricula" desde:
   data/df_curso_final.csv, data/df_estudiante.csv, data/df_matricula.csv
 - No requiere pandas; usa csv + SQLAlchemy Core.
-- Si la tabla ya existe, se vacía y se recarga para mantener idempotencia.
+- Las columnas de lista (p. ej. curso.prerequisito) se parsean una sola vez
+  aquí y se guardan como ARRAY (PostgreSQL) o JSON (SQLite).
+- Si la tabla ya existe, se recarga aplicando solo las diferencias con el CSV
+  (la tabla nunca queda vacía para los lectores).
+- La huella (sha256) de cada CSV cargado se guarda en la tabla
+  "importacion_csv"; si el archivo no cambió, la tabla no se recarga.
+- En PostgreSQL un advisory lock evita que varios workers importen a la vez:
+  el primero carga y los demás, al obtener el lock, encuentran las huellas al
+  día y no hacen nada.
 """
 
 from __future__ import annotations
 
+import ast
 import csv
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Any, Callable, Dict, List, Tuple
 
 from sqlalchemy import (
+    ARRAY,
+    JSON,
     MetaData,
     Table,
     Column,
@@ -21,9 +37,172 @@ from sqlalchemy import (
     Integer,
     Float,
     Boolean,
+    DateTime,
+    and_,
+    exists,
     inspect,
+    or_,
+    select,
+    text,
+    true,
 )
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
+
+from app.core.config import settings
+from app.core.estado import medir_carga
+from app.db.bloques import reconstruir_bloques
+from app.db.resumen import ORIGENES_RESUMEN, TABLA_RESUMEN, esquema_resumen_obsoleto, reconstruir_resumenes
+from app.models.seccion import SeccionBloque
+from app.utils.utils import str_to_list
+
+# Huella del último CSV cargado en cada tabla
+_metadata_importacion = MetaData()
+importacion_csv = Table(
+    "importacion_csv",
+    _metadata_importacion,
+    Column("tabla", String(50), primary_key=True),
+    Column("archivo", String(200), nullable=False),
+    Column("huella", String(64), nullable=False),
+    Column("importado_en", DateTime(timezone=True), nullable=False),
+)
+
+# Versión de los datos de cada tabla: huella e instante de la última carga,
+# leídos de importacion_csv. Cambia con cualquier importación (otro worker,
+# el job "python -m app.db.csv_import"), así que los cachés en memoria
+# (catálogo, elegibilidad, recursos, login, features en línea) la comparan
+# para saber si deben reconstruirse. Se relee como máximo cada
+# VERSION_DATOS_TTL_SEGUNDOS.
+_versiones: Dict[str, str] = {}
+_versiones_leidas_en = float("-inf")
+_versiones_lock = threading.Lock()
+
+
+def _version(huella: str, importado_en: datetime) -> str:
+    return f"{huella[:16]}:{importado_en.isoformat()}"
+
+
+def versiones_datos() -> Dict[str, str]:
+    """Versión (huella:importado_en) de cada tabla importada, según la BD."""
+    global _versiones, _versiones_leidas_en
+    if time.monotonic() - _versiones_leidas_en < settings.VERSION_DATOS_TTL_SEGUNDOS:
+        return _versiones
+
+    with _versiones_lock:
+        if time.monotonic() - _versiones_leidas_en < settings.VERSION_DATOS_TTL_SEGUNDOS:
+            return _versiones
+        from app.db.database import engine
+
+        try:
+            with engine.connect() as conn:
+                filas = conn.execute(select(
+                    importacion_csv.c.tabla, importacion_csv.c.huella, importacion_csv.c.importado_en
+                )).all()
+            _versiones = {tabla: _version(huella, importado_en) for tabla, huella, importado_en in filas}
+        except Exception as e:
+            # Sin tabla de importación (BD nueva) o BD caída: se mantiene la última versión
+            print(f"WARNING - No se pudo leer la versión de los datos: {e}")
+        _versiones_leidas_en = time.monotonic()
+        return _versiones
+
+
+def version_tabla(nombre: str) -> str:
+    """Versión de los datos de una tabla ("" si nunca se importó)."""
+    return versiones_datos().get(nombre, "")
+
+
+def invalidar_versiones() -> None:
+    """Forzar la relectura de versiones (p. ej. tras importar en este proceso)."""
+    global _versiones_leidas_en
+    _versiones_leidas_en = float("-inf")
+
+
+# Las tablas derivadas (p. ej. alumno_resumen) también tienen fila en
+# importacion_csv: su huella resume las versiones de las tablas de origen
+# con las que se construyeron. Si alguna se reimportó después, la derivada
+# está desactualizada.
+def _huella_origenes(versiones: Dict[str, str], origenes: Tuple[str, ...]) -> str:
+    return hashlib.sha256("|".join(versiones.get(t, "") for t in origenes).encode("utf-8")).hexdigest()
+
+
+def derivada_vigente(derivada: str, origenes: Tuple[str, ...]) -> bool:
+    """True si la tabla derivada se construyó con las versiones vigentes de sus orígenes."""
+    versiones = versiones_datos()
+    return versiones.get(derivada, "").split(":", 1)[0] == _huella_origenes(versiones, origenes)[:16]
+
+
+def _versiones_en(conn: Connection, tablas: Tuple[str, ...]) -> Dict[str, str]:
+    filas = conn.execute(select(
+        importacion_csv.c.tabla, importacion_csv.c.huella, importacion_csv.c.importado_en
+    ).where(importacion_csv.c.tabla.in_(tablas)))
+    return {tabla: _version(huella, importado_en) for tabla, huella, importado_en in filas}
+
+
+def guardar_huella_derivada(conn: Connection, derivada: str, origenes: Tuple[str, ...]) -> None:
+    """Registrar (en la transacción de la reconstrucción) de qué versiones sale la derivada."""
+    _metadata_importacion.create_all(bind=conn)
+    huella = _huella_origenes(_versiones_en(conn, origenes), origenes)
+    _guardar_huella(conn, derivada, "+".join(origenes), huella)
+    invalidar_versiones()
+
+
+def _derivada_desactualizada(engine: Engine, derivada: str, origenes: Tuple[str, ...]) -> bool:
+    with engine.connect() as conn:
+        versiones = _versiones_en(conn, (derivada, *origenes))
+    return versiones.get(derivada, "").split(":", 1)[0] != _huella_origenes(versiones, origenes)[:16]
+
+
+# Clave del advisory lock de PostgreSQL para la importación (arbitraria, fija)
+LOCK_IMPORTACION = 7_120_251
+
+
+def huella_archivo(path: Path) -> str:
+    """sha256 del contenido del archivo."""
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _huellas_guardadas(engine: Engine) -> Dict[str, str]:
+    with engine.connect() as conn:
+        filas = conn.execute(select(importacion_csv.c.tabla, importacion_csv.c.huella))
+        return {tabla: huella for tabla, huella in filas}
+
+
+def _guardar_huella(conn: Connection, tabla: str, archivo: str, huella: str) -> None:
+    conn.execute(importacion_csv.delete().where(importacion_csv.c.tabla == tabla))
+    conn.execute(importacion_csv.insert().values(
+        tabla=tabla,
+        archivo=archivo,
+        huella=huella,
+        importado_en=datetime.now(timezone.utc),
+    ))
+
+
+def _derivada_vacia(engine: Engine, tabla: Table) -> bool:
+    """True si una tabla derivada falta o está vacía (p. ej. BD recién migrada)."""
+    if not inspect(engine).has_table(tabla.name):
+        return True
+    with engine.connect() as conn:
+        return conn.execute(select(*tabla.primary_key.columns).limit(1)).first() is None
+
+
+@contextmanager
+def _lock_importacion(engine: Engine):
+    """Advisory lock de sesión en PostgreSQL; en otros motores no hace nada."""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:k)"), {"k": LOCK_IMPORTACION})
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:k)"), {"k": LOCK_IMPORTACION})
+            conn.commit()
 
 
 def _infer_type(values: List[str]):
@@ -101,12 +280,33 @@ def _ensure_table(engine: Engine, table_name: str, headers: List[str], preview_r
     return table
 
 
+def _es_lista(col_type) -> bool:
+    """Columnas de lista: ARRAY en PostgreSQL o JSON en el resto (ver Curso)."""
+    return isinstance(col_type, (ARRAY, JSON))
+
+
+def _texto_a_lista(s: str) -> List[str]:
+    """Convertir "['CALCULO I', 'MATEMATICA II']" o "[MA101, MA102]" a lista."""
+    try:
+        parsed = ast.literal_eval(s)
+        if isinstance(parsed, (list, tuple)):
+            return [str(x) for x in parsed]
+    except (ValueError, SyntaxError):
+        pass
+    if s.startswith("[") and s.endswith("]"):
+        s = s[1:-1]  # lista sin comillas: "[MA101, MA102]"
+    return str_to_list(s)
+
+
 def _normalize_value(val: Any, col_type) -> Any:
     if val is None:
         return None
     s = str(val).strip()
     if s == "":
         return None
+    # Listas: se parsean aquí una sola vez y se guardan nativas
+    if _es_lista(col_type):
+        return _texto_a_lista(s)
     # Booleanos comunes
     if isinstance(col_type, Boolean):
         return s.lower() in {"true", "1", "t"}
@@ -124,56 +324,345 @@ def _normalize_value(val: Any, col_type) -> Any:
     return s
 
 
-def _load_csv_into_table(engine: Engine, table: Table, csv_path: Path) -> None:
-    """Vaciar e insertar todas las filas del CSV en la tabla dada."""
-    # Cargar todas las filas (streaming simple)
-    with csv_path.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        col_types = {c.name: c.type for c in table.columns}
+# Filas por lote en la carga con executemany
+TAMANO_LOTE = 5000
+
+# Número (entero, decimal o notación científica) tal como lo acepta float()
+_REGEX_NUMERO = r"^[+-]?([0-9]+[.]?[0-9]*|[.][0-9]+)([eE][+-]?[0-9]+)?$"
 
-        rows: List[Dict[str, Any]] = []
-        for row in reader:
+
+def _lotes_normalizados(csv_path: Path, table: Table):
+    """Leer el CSV en streaming y producir lotes de filas ya normalizadas."""
+    col_types = {c.name: c.type for c in table.columns}
+    with csv_path.open("r", encoding="utf-8-sig", newline="") as f:
+        lote: List[Dict[str, Any]] = []
+        for row in csv.DictReader(f):
             item: Dict[str, Any] = {}
             for k, v in row.items():
                 col_name = k.lower()
                 if col_name in col_types:
                     item[col_name] = _normalize_value(v, col_types[col_name])
-            rows.append(item)
+            lote.append(item)
+            if len(lote) >= TAMANO_LOTE:
+                yield lote
+                lote = []
+        if lote:
+            yield lote
+
+
+def _insertar_executemany(conn: Connection, table: Table, csv_path: Path) -> None:
+    """Carga genérica (SQLite y otros): INSERT executemany por lotes."""
+    for lote in _lotes_normalizados(csv_path, table):
+        conn.execute(table.insert(), lote)
+
+
+def _expresion_cast(col: Column, origen: str, dialect) -> str:
+    """Expresión SQL que replica _normalize_value para una columna de texto."""
+    valor = f"NULLIF(btrim({origen}, E' \\t\\r\\n'), '')"
+    if isinstance(col.type, Boolean):
+        return f"(lower({valor}) IN ('true', '1', 't'))"
+    if isinstance(col.type, Integer):
+        tipo = col.type.compile(dialect=dialect)
+        return (
+            f"CASE WHEN {valor} ~ '{_REGEX_NUMERO}' "
+            f"THEN trunc({valor}::double precision)::{tipo} END"
+        )
+    if isinstance(col.type, Float):
+        return f"CASE WHEN {valor} ~ '{_REGEX_NUMERO}' THEN {valor}::double precision END"
+    return valor
+
+
+def _copiar_postgres(conn: Connection, table: Table, csv_path: Path) -> None:
+    """Carga masiva en PostgreSQL: COPY a una tabla temporal de texto y
+    INSERT ... SELECT con las conversiones de tipo hechas en SQL."""
+    with csv_path.open("r", encoding="utf-8-sig", newline="") as f:
+        headers = next(csv.reader(f), [])
+        f.seek(0)  # utf-8-sig vuelve a saltar el BOM tras el seek
+
+        preparer = conn.dialect.identifier_preparer
+        staging = preparer.quote(f"_copia_{table.name}")
+        columnas_csv = [preparer.quote(h.lower()) for h in headers]
 
+        conn.exec_driver_sql(
+            f"CREATE TEMP TABLE {staging} ({', '.join(c + ' text' for c in columnas_csv)}) "
+            "ON COMMIT DROP"
+        )
+        cursor = conn.connection.driver_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {staging} ({', '.join(columnas_csv)}) FROM STDIN WITH (FORMAT csv, HEADER true)",
+                f,
+            )
+        finally:
+            cursor.close()
+
+    destino = [c for c in table.columns if c.name in {h.lower() for h in headers}]
+    columnas = ", ".join(preparer.quote(c.name) for c in destino)
+    expresiones = ", ".join(_expresion_cast(c, preparer.quote(c.name), conn.dialect) for c in destino)
+    conn.exec_driver_sql(
+        f"INSERT INTO {preparer.format_table(table)} ({columnas}) SELECT {expresiones} FROM {staging}"
+    )
+
+
+def _tabla_staging(table: Table) -> Table:
+    """Tabla temporal con las mismas columnas (sin restricciones) que la destino."""
+    return Table(
+        f"_nueva_{table.name}",
+        MetaData(),
+        *[Column(c.name, c.type) for c in table.columns],
+        prefixes=["TEMPORARY"],
+    )
+
+
+def _insert_dialecto(conn: Connection):
+    """insert() con soporte de ON CONFLICT del dialecto, o None si no lo tiene."""
+    if conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif conn.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert
+
+
+def _aplicar_diferencias(conn: Connection, table: Table, staging: Table) -> Tuple[int, int]:
+    """Llevar la tabla al contenido de staging tocando solo las filas que cambian.
+
+    - Borra las filas cuya clave primaria ya no está en el CSV.
+    - Inserta las nuevas y actualiza las que cambiaron (INSERT ... ON CONFLICT).
+
+    Retorna (filas borradas, filas insertadas o actualizadas).
+    """
+    pk = list(table.primary_key.columns)
+    insert = _insert_dialecto(conn)
+    columnas = [c.name for c in table.columns]
+    origen = select(*[staging.c[n] for n in columnas]).where(true())  # WHERE: ambigüedad de SQLite
+
+    if not pk or insert is None:
+        # Sin clave primaria no hay forma de emparejar filas: recarga completa
+        borradas = conn.execute(table.delete()).rowcount
+        insertadas = conn.execute(table.insert().from_select(columnas, origen)).rowcount
+        return borradas, insertadas
+
+    misma_clave = and_(*[staging.c[c.name] == c for c in pk])
+    borradas = conn.execute(table.delete().where(~exists().where(misma_clave))).rowcount
+
+    stmt = insert(table).from_select(columnas, origen)
+    otras = [c for c in table.columns if not c.primary_key]
+    if otras:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=pk,
+            set_={c.name: stmt.excluded[c.name] for c in otras},
+            where=or_(*[c.is_distinct_from(stmt.excluded[c.name]) for c in otras]),
+        )
+    else:
+        stmt = stmt.on_conflict_do_nothing(index_elements=pk)
+    return borradas, conn.execute(stmt).rowcount
+
+
+def _load_csv_into_table(engine: Engine, table: Table, csv_path: Path, huella: str | None = None) -> None:
+    """Recargar la tabla desde el CSV sin dejarla vacía en ningún momento.
+
+    El CSV se carga primero en una tabla temporal (COPY en PostgreSQL, INSERT
+    executemany por lotes en el resto) y luego se aplican solo las diferencias
+    sobre la tabla real, en la misma transacción: los lectores ven los datos
+    anteriores hasta el commit y las filas sin cambios no se reescriben. Si se
+    pasa la huella del archivo, se registra también en esa transacción.
+    """
+    staging = _tabla_staging(table)
     with engine.begin() as conn:
-        # Vaciar tabla para recarga idempotente
-        conn.execute(table.delete())
-        if rows:
-            conn.execute(table.insert(), rows)
+        staging.drop(conn, checkfirst=True)
+        staging.create(conn)
+        # COPY convierte tipos en SQL; las columnas de lista se parsean en Python
+        con_listas = any(_es_lista(c.type) for c in table.columns)
+        if engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2" and not con_listas:
+            _copiar_postgres(conn, staging, csv_path)
+        else:
+            _insertar_executemany(conn, staging, csv_path)
+
+        borradas, cambiadas = _aplicar_diferencias(conn, table, staging)
+        staging.drop(conn)
+        if huella is not None:
+            _guardar_huella(conn, table.name, csv_path.name, huella)
+
+    print(f"OK - {table.name}: {cambiadas} filas insertadas/actualizadas, {borradas} borradas")
 
 
-def import_csv_tables(engine: Engine) -> None:
+# CSV de data/ -> tabla destino (en orden de carga)
+ARCHIVOS_CSV = {
+    "df_curso_final_con_recursos.csv": "curso",
+    "df_estudiante_final.csv": "alumno",
+    "df_matricula_1.csv": "matricula",
+    "secciones_playground.csv": "seccion",
+}
+DATA_DIR = Path(__file__).resolve().parents[2] / "data"
+
+
+def import_csv_tables(
+    engine: Engine,
+    forzar: bool = False,
+    progreso: Callable[[int, int, str], None] | None = None,
+) -> List[str]:
     """Crear/actualizar tablas y cargar CSVs estándar en data/.
 
     - df_curso_final.csv  -> curso
     - df_estudiante_final.csv    -> alumno
     - df_matricula.csv     -> matricula
     - unitrack-secciones.csv -> seccion
+
+    Solo recarga las tablas cuyo CSV cambió desde la última importación (o
+    todas si ``forzar``). ``progreso(i, total, tabla)`` se llama antes de
+    procesar cada tabla; el tiempo de carga de cada una queda en
+    app.core.estado como "csv_<tabla>". Retorna la lista de tablas recargadas.
     """
-    base_path = Path(__file__).resolve().parents[2] / "data"
-    mapping = {
-        "df_curso_final_con_recursos.csv": "curso",
-        "df_estudiante_final.csv": "alumno",
-        "df_matricula_1.csv": "matricula",
-        "secciones_playground.csv": "seccion",
-    }
-    
-    for fname, tname in mapping.items():
-        csv_path = base_path / fname
-        if not csv_path.exists():
-            # Si falta un CSV, continuar con los demás
-            raise FileNotFoundError(f"Archivo CSV no encontrado: {csv_path}")
-        
-
-        headers, preview = _read_csv_preview(csv_path)
-        if not headers:
+    total = len(ARCHIVOS_CSV)
+
+    with _lock_importacion(engine):
+        pendientes = columnas_lista_como_texto(engine)
+        if pendientes:
+            # Cargar texto en ellas dejaría filas que el ORM no puede leer como lista
+            raise RuntimeError(
+                f"Columnas de lista como texto ({', '.join(pendientes)}): ejecute 'alembic upgrade head'"
+            )
+        _metadata_importacion.create_all(bind=engine)
+        guardadas = {} if forzar else _huellas_guardadas(engine)
+        inspector = inspect(engine)
+        recargadas: List[str] = []
+
+        for i, (fname, tname) in enumerate(ARCHIVOS_CSV.items(), start=1):
+            if progreso is not None:
+                progreso(i, total, tname)
+
+            csv_path = DATA_DIR / fname
+            if not csv_path.exists():
+                # Si falta un CSV, continuar con los demás
+                raise FileNotFoundError(f"Archivo CSV no encontrado: {csv_path}")
+
+            huella = huella_archivo(csv_path)
+            if guardadas.get(tname) == huella and inspector.has_table(tname):
+                continue
+
+            headers, preview = _read_csv_preview(csv_path)
+            if not headers:
+                continue
+
+            with medir_carga(f"csv_{tname}"):
+                table = _ensure_table(engine, tname, headers, preview)
+                _load_csv_into_table(engine, table, csv_path, huella)
+            invalidar_versiones()
+            recargadas.append(tname)
+
+        # Índices de los modelos (faltan si la tabla la creó este importador)
+        asegurar_indices(engine)
+
+        # Resumen académico derivado de matricula y curso (también si la
+        # última reconstrucción no llegó a terminar o el esquema cambió)
+        if _derivada_desactualizada(engine, TABLA_RESUMEN, ORIGENES_RESUMEN) or esquema_resumen_obsoleto(engine):
+            with medir_carga("resumenes"):
+                reconstruir_resumenes(
+                    engine,
+                    al_terminar=lambda conn: guardar_huella_derivada(conn, TABLA_RESUMEN, ORIGENES_RESUMEN),
+                )
+
+        # Horarios normalizados derivados de seccion
+        if "seccion" in recargadas or _derivada_vacia(engine, SeccionBloque.__table__):
+            with medir_carga("bloques"):
+                reconstruir_bloques(engine)
+
+    if recargadas:
+        print(f"OK - CSV importados: {', '.join(recargadas)}")
+    else:
+        print("OK - CSV sin cambios, no se recargó ninguna tabla")
+    return recargadas
+
+
+def columnas_lista_como_texto(engine: Engine) -> List[str]:
+    """Columnas que el modelo declara como lista y que en la base siguen
+    siendo texto (esquema anterior a la migración de listas nativas).
+
+    Se revisa en cada arranque, no solo al recargar: con la huella sin
+    cambios el importador no vuelve a leer esas filas.
+    """
+    from app import models  # noqa: F401  registra los modelos en Base.metadata
+    from app.db.database import Base
+
+    inspector = inspect(engine)
+    pendientes = []
+    for tname in ARCHIVOS_CSV.values():
+        modelo = Base.metadata.tables.get(tname)
+        if modelo is None or not inspector.has_table(tname):
             continue
+        tipos = {c["name"]: c["type"] for c in inspector.get_columns(tname)}
+        for col in modelo.columns:
+            if _es_lista(col.type) and col.name in tipos and not _es_lista(tipos[col.name]):
+                pendientes.append(f"{tname}.{col.name}")
+    return pendientes
+
+
+def asegurar_indices(engine: Engine) -> None:
+    """Crear los índices declarados en los modelos ORM que falten en las
+    tablas importadas (solo aquellos cuyas columnas existen)."""
+    from app import models  # noqa: F401  registra los modelos en Base.metadata
+    from app.db.database import Base
+
+    inspector = inspect(engine)
+    for tname in ARCHIVOS_CSV.values():
+        tabla = Base.metadata.tables.get(tname)
+        if tabla is None or not inspector.has_table(tname):
+            continue
+        existentes = {i["name"] for i in inspector.get_indexes(tname)}
+        columnas = {c["name"] for c in inspector.get_columns(tname)}
+        for indice in tabla.indexes:
+            if indice.name in existentes:
+                continue
+            if not {c.name for c in indice.columns} <= columnas:
+                print(f"WARNING - {tname}: no se puede crear {indice.name}, faltan columnas")
+                continue
+            indice.create(bind=engine)
+            print(f"OK - Índice creado: {indice.name}")
+
+
+def tablas_sin_datos(engine: Engine) -> List[str]:
+    """Tablas importadas desde CSV que no existen o están vacías."""
+    inspector = inspect(engine)
+    vacias = []
+    with engine.connect() as conn:
+        for tname in ARCHIVOS_CSV.values():
+            if not inspector.has_table(tname):
+                vacias.append(tname)
+                continue
+            if conn.execute(text(f"SELECT 1 FROM {tname} LIMIT 1")).first() is None:
+                vacias.append(tname)
+    return vacias
+
+
+def main() -> None:
+    """Importación manual (o como job separado del servidor):
+
+        python -m app.db.csv_import [--forzar]
+    """
+    import sys
+    import time
+
+    from app.core.estado import reporte
+    from app.db.database import engine, init_db
+
+    init_db()
+    inicio = time.perf_counter()
+    import_csv_tables(
+        engine,
+        forzar="--forzar" in sys.argv[1:],
+        progreso=lambda i, total, tabla: print(f"[{i}/{total}] {tabla}"),
+    )
+    for nombre, metrica in reporte()["artefactos"].items():
+        print(f"  {nombre}: {metrica['segundos']:.3f}s")
+    print(f"OK - Importación completada en {time.perf_counter() - inicio:.2f}s")
+
+    vacias = tablas_sin_datos(engine)
+    if vacias:
+        print(f"Error - Tablas sin datos: {', '.join(vacias)}")
+        sys.exit(1)
 
-        table = _ensure_table(engine, tname, headers, preview)
-        _load_csv_into_table(engine, table, csv_path)
 
+if __name__ == "__main__":
+    main()
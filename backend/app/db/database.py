@@ -1,20 +1,80 @@
 """
 Configuración de la base de datos y sesión SQLAlchemy
 Maneja la conexión con PostgreSQL
+
+- ``engine`` / ``get_db``: motor y sesión síncronos (importador, scripts y
+  rutas no críticas).
+- ``async_engine`` / ``get_async_db``: motor asíncrono (asyncpg; aiosqlite en
+  desarrollo) para las rutas calientes, que así no bloquean el event loop
+  mientras esperan a la base de datos. Si el driver asíncrono no está
+  instalado, ``get_async_db`` entrega la sesión síncrona envuelta en
+  ``SesionEnHilo``, que ejecuta cada operación en el threadpool.
 """
 
+from typing import AsyncGenerator, Generator
+
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
 
 from app.core.config import settings
 
+# Driver asíncrono por motor
+_DRIVERS_ASYNC = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def _opciones_pool(url: str, asincrono: bool = False) -> dict:
+    """Tamaño del pool desde Settings (SQLite usa su propio pool por archivo).
+
+    Cada motor tiene su propio pool: por worker se abren hasta
+    DB_POOL_SIZE + DB_MAX_OVERFLOW + DB_ASYNC_POOL_SIZE + DB_ASYNC_MAX_OVERFLOW
+    conexiones.
+    """
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.DB_ASYNC_POOL_SIZE if asincrono else settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_ASYNC_MAX_OVERFLOW if asincrono else settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def url_async(url: str) -> str | None:
+    """La misma URL con el driver asíncrono (None si el motor no tiene uno)."""
+    u = make_url(url)
+    driver = _DRIVERS_ASYNC.get(u.get_backend_name())
+    if driver is None:
+        return None
+    return u.set(drivername=f"{u.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
 # Crear engine de SQLAlchemy
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # Verifica la conexión antes de usarla
     echo=settings.DEBUG,  # Mostrar SQL queries en modo debug
+    **_opciones_pool(settings.DATABASE_URL),
+)
+
+# Engine asíncrono (pool propio, DB_ASYNC_POOL_SIZE / DB_ASYNC_MAX_OVERFLOW)
+async_engine = None
+if settings.DB_ASYNC_ACTIVO and url_async(settings.DATABASE_URL):
+    try:
+        async_engine = create_async_engine(
+            url_async(settings.DATABASE_URL),
+            pool_pre_ping=True,
+            echo=settings.DEBUG,
+            **_opciones_pool(settings.DATABASE_URL, asincrono=True),
+        )
+    except ImportError as e:
+        print(f"WARNING - Driver asíncrono no disponible ({e}); se usará la sesión síncrona en hilos")
+
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, expire_on_commit=False) if async_engine is not None else None
 )
 
 # Crear SessionLocal class
@@ -41,6 +101,52 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+class SesionEnHilo:
+    """Subconjunto de la interfaz de AsyncSession sobre una Session síncrona.
+
+    Cada operación corre en el threadpool, de modo que el event loop no se
+    bloquea aunque no haya driver asíncrono.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.session, *args, **kwargs)
+
+    async def execute(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.session.scalar, statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.session.scalars, statement, *args, **kwargs)
+
+
+async def get_async_db() -> AsyncGenerator:
+    """
+    Dependency asíncrona para las rutas calientes (login, predicción, recomendación)
+
+    Ejemplo de uso:
+        @app.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_async_db)):
+            return (await db.scalars(select(Item))).all()
+
+    Para reutilizar código escrito contra Session: ``await db.run_sync(fn, ...)``.
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    db = SessionLocal()
+    try:
+        yield SesionEnHilo(db)
+    finally:
+        db.close()
+
+
 def init_db() -> None:
     """
     Inicializar la base de datos
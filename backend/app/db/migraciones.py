@@ -0,0 +1,33 @@
+"""
+Migraciones de Alembic al arrancar
+El punto de entrada de producción (app.produccion) aplica ``alembic upgrade
+head`` antes de importar datos, para que el esquema (p. ej. las columnas de
+lista de curso) coincida con los modelos. Corre bajo el mismo lock que la
+importación de CSV: con varios workers sin precarga solo uno migra.
+
+Equivale a:
+    alembic upgrade head
+"""
+
+from pathlib import Path
+
+from sqlalchemy.engine import Engine
+
+from app.db.csv_import import _lock_importacion
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+
+def aplicar_migraciones(engine: Engine) -> None:
+    """Llevar la base a la última revisión de Alembic."""
+    from alembic import command
+    from alembic.config import Config
+
+    # Sin alembic.ini: env.py no llama a fileConfig y no reconfigura el
+    # logging del proceso (gunicorn/uvicorn). La URL la toma env.py de settings.
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+
+    with _lock_importacion(engine):
+        command.upgrade(config, "head")
+    print("OK - Migraciones aplicadas (alembic upgrade head)")
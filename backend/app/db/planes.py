@@ -0,0 +1,92 @@
+"""
+Planes de ejecución de las consultas calientes
+Imprime EXPLAIN ANALYZE (PostgreSQL) o EXPLAIN QUERY PLAN (SQLite) de cada
+consulta del login, la predicción y /mejor-horario, para verificar que usan
+los índices (ver alembic/versions/a3c1f0d2b7e4_indices_consultas_calientes.py).
+
+Uso:
+    python -m app.db.planes [cod_persona]
+"""
+
+from __future__ import annotations
+
+import sys
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from app.db.bloques import consulta_bloques
+from app.db.resumen import NOTA_APROBATORIA, consulta_periodos
+from app.models.alumno import Alumno
+from app.models.curso import Curso
+from app.models.matricula import Matricula
+from app.models.resumen import AlumnoResumen
+from app.models.seccion import Seccion
+
+
+def consultas_calientes(engine: Engine, cod_persona: str) -> dict:
+    """Consultas (con los mismos filtros que las rutas) para un alumno de ejemplo."""
+    with engine.connect() as conn:
+        cursos = list(conn.execute(select(Curso.cod_curso).limit(10)).scalars())
+
+    return {
+        "login: alumno": select(Alumno).where(Alumno.cod_persona == cod_persona).limit(1),
+        "login: matriculas + curso": select(
+            Matricula.per_matricula,
+            Matricula.cod_curso,
+            Matricula.nota,
+            Matricula.hrs_inasistencia,
+            Curso.curso,
+            Curso.creditos,
+        ).outerjoin(Curso, Curso.cod_curso == Matricula.cod_curso).where(
+            Matricula.cod_persona == cod_persona
+        ),
+        "login: periodos (GROUP BY)": consulta_periodos(cod_persona),
+        "login / prediccion: resumen del alumno": select(AlumnoResumen).where(
+            AlumnoResumen.cod_persona == cod_persona,
+            AlumnoResumen.nota_aprobatoria == NOTA_APROBATORIA,
+        ),
+        "login / mejor-horario: secciones IN": select(Seccion).where(Seccion.cod_curso.in_(cursos)),
+        "mejor-horario: bloques sin choque": consulta_bloques(cursos, [(0, 420, 600)]),
+        "login: recursos IN": select(Curso.cod_curso, Curso.resources).where(Curso.cod_curso.in_(cursos)),
+    }
+
+
+def explicar(engine: Engine, stmt) -> list[str]:
+    """Plan de una consulta como lista de líneas."""
+    sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+    if engine.dialect.name == "postgresql":
+        prefijo = "EXPLAIN (ANALYZE, BUFFERS) "
+    else:
+        prefijo = "EXPLAIN QUERY PLAN "
+
+    with engine.connect() as conn:
+        filas = conn.exec_driver_sql(prefijo + sql).all()
+
+    if engine.dialect.name == "postgresql":
+        return [fila[0] for fila in filas]
+    return [" ".join(str(v) for v in fila[1:]) for fila in filas]
+
+
+def main() -> None:
+    from app.db.database import engine
+
+    cod_persona = sys.argv[1] if len(sys.argv) > 1 else None
+    if cod_persona is None:
+        with engine.connect() as conn:
+            cod_persona = conn.execute(select(Matricula.cod_persona).limit(1)).scalar()
+    if cod_persona is None:
+        print("Error - No hay matrículas cargadas")
+        sys.exit(1)
+
+    if engine.dialect.name != "postgresql":
+        print(f"WARNING - {engine.dialect.name}: solo EXPLAIN QUERY PLAN (sin tiempos)")
+
+    for nombre, stmt in consultas_calientes(engine, cod_persona).items():
+        print(f"\n=== {nombre} (cod_persona={cod_persona}) ===")
+        for linea in explicar(engine, stmt):
+            print(f"  {linea}")
+
+
+if __name__ == "__main__":
+    main()
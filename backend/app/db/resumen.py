@@ -0,0 +1,187 @@
+"""
+Mantenimiento de la tabla de resumen académico alumno_resumen: una fila por
+alumno y nota de corte (CORTES_RESUMEN), para que login, elegibilidad y
+/prediccion lean su resumen con una búsqueda por clave primaria.
+
+- ``reconstruir_resumenes(engine)`` recalcula todo con un INSERT ... SELECT
+  agrupado por nota de corte; lo llama el importador de CSV al recargar
+  matricula o curso (o si la tabla tiene un esquema anterior).
+- En la misma transacción se registra en importacion_csv (fila
+  "alumno_resumen") de qué versiones de matricula y curso salen, para que los
+  lectores detecten un resumen desactualizado y calculen en vivo.
+
+Reconstrucción manual (backfill):
+    python -m app.db.resumen
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Optional
+
+from sqlalchemy import Float, Integer, and_, case, cast, delete, func, insert, inspect, literal, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.models.curso import Curso
+from app.models.matricula import Matricula
+from app.models.resumen import AlumnoResumen
+
+# Nota mínima aprobatoria (equivale a round(nota) >= 12)
+NOTA_APROBATORIA = 11.5
+# Nota mínima con la que /prediccion siempre consideró aprobado un curso
+NOTA_APROBATORIA_PREDICCION = 11.0
+# Notas de corte con fila en alumno_resumen
+CORTES_RESUMEN = (NOTA_APROBATORIA_PREDICCION, NOTA_APROBATORIA)
+
+# Fila de importacion_csv que registra las versiones de origen del resumen
+TABLA_RESUMEN = "alumno_resumen"
+ORIGENES_RESUMEN = ("matricula", "curso")
+# Tabla por período de versiones anteriores (se elimina al reconstruir)
+TABLA_PERIODOS_ANTIGUA = "alumno_periodo_resumen"
+
+
+def _centesimas(m, creditos):
+    """Suma de nota*100*créditos en enteros (las notas tienen 2 decimales)."""
+    return func.sum(case((m.c.nota.isnot(None), cast(func.round(m.c.nota * 100), Integer) * creditos), else_=0))
+
+
+def consulta_periodos(cod_persona: str):
+    """SELECT agrupado por período de un alumno sobre matricula LEFT JOIN curso
+    (lo usa el login; lo sirve ix_matricula_persona_periodo).
+
+    promedio_periodo se redondea en SQL a 2 decimales, mitad hacia arriba, con
+    aritmética entera sobre centésimas: igual en SQLite y PostgreSQL y con el
+    mismo criterio que promedio_centesimas.
+    """
+    m = Matricula.__table__
+    c = Curso.__table__
+
+    con_nota = m.c.nota.isnot(None)
+    creditos = func.coalesce(c.c.creditos, 0)
+    creditos_con_nota = func.sum(case((con_nota, creditos), else_=0))
+    centesimas = _centesimas(m, creditos)
+
+    return select(
+        m.c.per_matricula,
+        func.count().label("total_cursos"),
+        func.sum(case((and_(con_nota, m.c.nota >= NOTA_APROBATORIA), 1), else_=0)).label("cursos_aprobados"),
+        func.sum(creditos).label("creditos"),
+        case(
+            (creditos_con_nota > 0, cast((2 * centesimas + creditos_con_nota) // (2 * creditos_con_nota), Float) / 100),
+            else_=None,
+        ).label("promedio_periodo"),
+    ).select_from(
+        m.outerjoin(c, c.c.cod_curso == m.c.cod_curso)
+    ).where(
+        m.c.cod_persona == cod_persona
+    ).group_by(m.c.per_matricula)
+
+
+def promedio_centesimas(suma_centesimas, creditos_con_nota) -> float | None:
+    """Promedio ponderado redondeado a 2 decimales (mitad hacia arriba) a
+    partir de la suma de nota*100*créditos; exacto porque las notas tienen
+    2 decimales."""
+    if not creditos_con_nota:
+        return None
+    s, c = int(suma_centesimas), int(creditos_con_nota)
+    return ((2 * s + c) // (2 * c)) / 100.0
+
+
+def consulta_alumnos(nota_aprobatoria: float, cod_persona: str | None = None):
+    """SELECT agrupado por alumno sobre matricula LEFT JOIN curso para una nota
+    mínima aprobatoria (columnas de alumno_resumen)."""
+    m = Matricula.__table__
+    c = Curso.__table__
+
+    con_nota = m.c.nota.isnot(None)
+    aprobado = and_(con_nota, m.c.nota >= nota_aprobatoria)
+    reprobado = and_(con_nota, m.c.nota < nota_aprobatoria)
+    creditos = func.coalesce(c.c.creditos, 0)
+
+    creditos_con_nota = func.sum(case((con_nota, creditos), else_=0))
+    suma_ponderada = func.sum(case((con_nota, m.c.nota * creditos), else_=0.0))
+    cursos_aprobados = func.sum(case((aprobado, 1), else_=0))
+
+    stmt = select(
+        m.c.cod_persona,
+        literal(float(nota_aprobatoria), Float).label("nota_aprobatoria"),
+        func.count().label("total_cursos"),
+        func.count(func.distinct(m.c.per_matricula)).label("semestres_cursados"),
+        cursos_aprobados.label("cursos_aprobados"),
+        func.sum(case((reprobado, 1), else_=0)).label("cursos_reprobados"),
+        func.sum(creditos).label("creditos_cursados"),
+        func.sum(case((aprobado, creditos), else_=0)).label("creditos_aprobados"),
+        creditos_con_nota.label("creditos_con_nota"),
+        _centesimas(m, creditos).label("suma_centesimas"),
+        case(
+            (creditos_con_nota > 0, suma_ponderada / creditos_con_nota),
+            else_=None,
+        ).label("promedio_general"),
+        case(
+            (cursos_aprobados > 0, func.sum(case((aprobado, m.c.nota), else_=0.0)) / cursos_aprobados),
+            else_=None,
+        ).label("promedio_aprobados"),
+    ).select_from(
+        m.outerjoin(c, c.c.cod_curso == m.c.cod_curso)
+    ).group_by(m.c.cod_persona)
+
+    if cod_persona is not None:
+        stmt = stmt.where(m.c.cod_persona == cod_persona)
+    return stmt
+
+
+
+
+def esquema_resumen_obsoleto(engine: Engine) -> bool:
+    """True si quedan tablas de resumen de un esquema anterior (alumno_resumen
+    sin nota_aprobatoria o la antigua alumno_periodo_resumen)."""
+    inspector = inspect(engine)
+    if inspector.has_table(TABLA_PERIODOS_ANTIGUA):
+        return True
+    if not inspector.has_table(TABLA_RESUMEN):
+        return False
+    return {c["name"] for c in inspector.get_columns(TABLA_RESUMEN)} != set(AlumnoResumen.__table__.c.keys())
+
+
+def _recalcular(conn: Connection) -> None:
+    a = AlumnoResumen.__table__
+
+    conn.execute(delete(a))
+    for nota in CORTES_RESUMEN:
+        consulta = consulta_alumnos(nota)
+        conn.execute(insert(a).from_select([col.name for col in consulta.selected_columns], consulta))
+
+
+def reconstruir_resumenes(engine: Engine, al_terminar: Optional[Callable[[Connection], None]] = None) -> None:
+    """Recalcular alumno_resumen (una fila por alumno y nota de corte) en una
+    transacción.
+
+    ``al_terminar(conn)`` corre dentro de la misma transacción (el importador
+    registra ahí las versiones de origen).
+    """
+    if esquema_resumen_obsoleto(engine):
+        with engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {TABLA_PERIODOS_ANTIGUA}"))
+        AlumnoResumen.__table__.drop(bind=engine, checkfirst=True)
+        print("OK - Tablas de resumen del esquema anterior eliminadas")
+    AlumnoResumen.__table__.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        _recalcular(conn)
+        if al_terminar is not None:
+            al_terminar(conn)
+
+
+def main() -> None:
+    import time
+    from app.db.csv_import import guardar_huella_derivada
+    from app.db.database import engine
+
+    inicio = time.perf_counter()
+    reconstruir_resumenes(
+        engine,
+        al_terminar=lambda conn: guardar_huella_derivada(conn, TABLA_RESUMEN, ORIGENES_RESUMEN),
+    )
+    print(f"OK - Resúmenes académicos reconstruidos en {time.perf_counter() - inicio:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,58 @@ Aplicación principal de FastAPI para UniTrack
 Plataforma Integral de Apoyo Académico Universitario
 """
 
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 from app.core.config import settings
-from app.routes import auth, modelo, prediccion, recursos, recomendacion
-from app.db.database import init_db, engine
-from app.db.csv_import import import_csv_tables
+from app.core import estado
+from app.core.http import CompresionMiddleware, RespuestaJSON
+from app.routes import auth, cursos, modelo, prediccion, recursos, recomendacion
+from app.db.database import async_engine, init_db, engine
+from app.db.csv_import import columnas_lista_como_texto, import_csv_tables, tablas_sin_datos
+from app.services.precarga import precargar_catalogo, precargar_recursos
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Ciclo de vida de la app: carga de datos y precarga de modelos.
+
+    Ambas corren en un hilo aparte para que el servidor acepte tráfico (y
+    /health responda) de inmediato; /ready responde 503 ("starting") hasta
+    que los datos estén importados y los modelos calientes, o "failed" si
+    no hay datos con los que arrancar. Las etapas quedan en /arranque.
+    """
+    if estado.esta_listo() or estado.esta_fallido():
+        # Arranque ya hecho antes del fork (app.produccion): el worker lo hereda
+        app.state.precarga = None
+    else:
+        # Etapa "app": desde que arrancó el proceso hasta aquí (imports de la app)
+        estado.registrar_etapa("app", estado.segundos_proceso() or 0.0, rss_inicio=None)
+        app.state.precarga = asyncio.create_task(asyncio.to_thread(arrancar))
+    yield
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+def arrancar() -> None:
+    """Arranque por etapas (en segundo plano): datos, catálogo y, si
+    PRECARGA_ML, imports de ML, feature store y modelos."""
+    with estado.medir_etapa("datos"):
+        hay_datos = startup_load_data()
+    if not hay_datos:
+        return
+
+    precargar_catalogo()
+    if settings.PRECARGA_ML:
+        precargar_recursos()
+    else:
+        estado.marcar_listo("Catálogo cargado (modelos bajo demanda)")
+        print("OK - Catálogo cargado; modelos de ML bajo demanda")
+
 
 # Crear instancia de FastAPI
 app = FastAPI(
@@ -18,8 +63,19 @@ app = FastAPI(
     description="API REST para la plataforma UniTrack - Sistema de apoyo académico universitario",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=RespuestaJSON,
 )
 
+# Comprimir respuestas grandes (login, /mejor-horario, catálogo)
+if settings.COMPRESION_ACTIVA:
+    app.add_middleware(
+        CompresionMiddleware,
+        minimo_bytes=settings.COMPRESION_MINIMO_BYTES,
+        nivel_gzip=settings.COMPRESION_NIVEL_GZIP,
+        nivel_brotli=settings.COMPRESION_NIVEL_BROTLI,
+    )
+
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -31,6 +87,7 @@ app.add_middleware(
 
 # Registrar rutas
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Autenticación"])
+app.include_router(cursos.router, prefix="/api/v1/cursos", tags=["Cursos"])
 app.include_router(modelo.router, prefix="/api/v1/modelo", tags=["Modelo Predictivo"])
 app.include_router(prediccion.router, prefix="/api/v1/prediccion", tags=["Predicción de Notas"])
 app.include_router(recomendacion.router, prefix="/api/v1/recomendacion", tags=["Recomendación de Matrícula"])
@@ -53,24 +110,78 @@ async def health_check():
     return {"status": "healthy"}
 
 
-@app.on_event("startup")
-async def startup_load_data():
+@app.get("/ready", tags=["Health"])
+async def readiness_check():
+    """Endpoint de readiness: 503 hasta que datos, modelos, features y catálogo estén cargados.
+
+    Si algún artefacto falló ("degraded") también responde 503, salvo con
+    READY_PERMITIR_DEGRADADO (la app sirve con sus fallbacks).
+    """
+    reporte = estado.reporte()
+    degradado_no_permitido = reporte["status"] == "degraded" and not settings.READY_PERMITIR_DEGRADADO
+    if not estado.esta_listo() or degradado_no_permitido:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=reporte)
+    return reporte
+
+
+@app.get("/arranque", tags=["Health"])
+async def reporte_arranque():
+    """Etapas del arranque con su duración y RSS, y módulos pesados ya importados"""
+    return estado.reporte_arranque()
+
+
+def _progreso_importacion(actual: int, total: int, tabla: str) -> None:
+    estado.registrar_progreso("Importando CSV", actual, total, tabla)
+
+
+def startup_load_data() -> bool:
     """Al iniciar: crear tablas ORM y cargar CSVs como tablas nuevas.
 
     - ORM: crea tablas definidas en modelos (si no existen)
     - CSVs: crea/actualiza tablas "curso", "alumno", "matricula" y carga datos
+
+    Retorna False (y marca el arranque como fallido) si alguna tabla queda
+    sin datos o el esquema no está migrado (columnas de lista como texto). Si la importación falla pero las tablas ya tenían datos, se
+    sigue con esos datos y la app queda "degraded".
     """
+    estado.marcar_no_listo("Importando CSV")
+
     try:
         init_db()
-    except Exception:
+    except Exception as e:
         # Continuar aunque falle la creación ORM para intentar carga CSV
-        pass
+        print(f"Error creando tablas ORM: {e}")
+
+    # Esquema sin migrar: las listas de curso se leerían como texto
+    try:
+        pendientes = columnas_lista_como_texto(engine)
+    except Exception as e:
+        pendientes = []
+        print(f"WARNING - No se pudo revisar el esquema: {e}")
+    if pendientes:
+        estado.marcar_fallido(f"Columnas de lista como texto ({', '.join(pendientes)}): ejecute 'alembic upgrade head'")
+        print(f"Error - Columnas de lista como texto: {', '.join(pendientes)} (ejecute 'alembic upgrade head')")
+        return False
+
+    if settings.CSV_IMPORT_AL_INICIAR:
+        try:
+            with estado.medir_carga("importacion_csv"):
+                import_csv_tables(engine, forzar=settings.CSV_IMPORT_FORZAR, progreso=_progreso_importacion)
+        except Exception as e:
+            print(f"Error importando CSV: {e}")
 
     try:
-        import_csv_tables(engine)
-    except Exception:
-        # Evitar tumbar la app si la carga CSV falla
-        pass
+        vacias = tablas_sin_datos(engine)
+    except Exception as e:
+        estado.marcar_fallido(f"Base de datos no disponible: {e}")
+        print(f"Error verificando datos: {e}")
+        return False
+    if vacias:
+        estado.marcar_fallido(f"Tablas sin datos: {', '.join(vacias)}")
+        print(f"Error - Tablas sin datos: {', '.join(vacias)}")
+        return False
+
+    return True
 
 
 if __name__ == "__main__":
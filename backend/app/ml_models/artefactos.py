@@ -0,0 +1,225 @@
+"""
+Empaquetado y carga de los modelos de producción
+Los .pkl de entrenamiento se re-guardan una vez con joblib sin compresión
+(los arrays de numpy quedan alineados dentro del archivo) junto a un
+manifiesto JSON con las features, la versión del formato, las versiones de
+las librerías, los checksums y el tamaño/mtime de cada archivo. Al cargar, un
+modelo empaquetado se abre con joblib.load(mmap_mode="r"): sus arrays se leen
+de las páginas del archivo, que el sistema operativo comparte entre workers,
+en lugar de copiarse a la memoria de cada proceso. Los checksums se calculan
+al empaquetar; al cargar solo se recalculan si cambió el tamaño o el mtime.
+
+Empaquetar (o re-empaquetar tras reentrenar):
+    python -m app.ml_models.artefactos [x_matricula clasificador]
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from app.core.estado import registrar_carga
+
+ML_DIR = Path(__file__).parent
+EMPAQUETADOS_DIR = ML_DIR / "empaquetados"
+
+# Nombre del artefacto -> pickle de entrenamiento
+MODELOS = {
+    "x_matricula": ML_DIR / "modelo_produccion_x_matricula.pkl",
+    "clasificador": ML_DIR / "modelo_produccion_clasificador.pkl",
+}
+
+# Se incrementa si cambia la forma de guardar los artefactos
+FORMATO_VERSION = 1
+
+LIBRERIAS = ("sklearn", "lightgbm", "xgboost", "numpy", "joblib")
+
+
+def ruta_modelo(nombre: str) -> Path:
+    return EMPAQUETADOS_DIR / f"{nombre}.joblib"
+
+
+def ruta_manifiesto(nombre: str) -> Path:
+    return EMPAQUETADOS_DIR / f"{nombre}.json"
+
+
+def sha256_archivo(ruta: Path) -> str:
+    h = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def firma_archivo(ruta: Path) -> dict:
+    """Tamaño y mtime: comprobar que un archivo no cambió sin leerlo."""
+    st = ruta.stat()
+    return {"bytes": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def versiones_librerias() -> dict:
+    """Versiones de las librerías que intervienen en el pickle (las no instaladas se omiten)."""
+    versiones = {"python": sys.version.split()[0]}
+    for nombre in LIBRERIAS:
+        try:
+            versiones[nombre] = __import__(nombre).__version__
+        except ImportError:
+            continue
+    return versiones
+
+
+def leer_manifiesto(nombre: str) -> dict | None:
+    try:
+        with open(ruta_manifiesto(nombre), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _cargar_pickle_original(ruta: Path):
+    """Cargar el pickle de entrenamiento (joblib y, si falla, pickle latin1)."""
+    import joblib
+
+    try:
+        return joblib.load(ruta)
+    except Exception as e:
+        print(f"WARNING - joblib no pudo leer {ruta.name} ({e}); se intenta pickle latin1")
+        with open(ruta, "rb") as f:
+            return pickle.load(f, encoding="latin1")
+
+
+def _escribir_atomico(ruta: Path, escribir) -> None:
+    """Escribir en un temporal y renombrar: los lectores nunca ven un archivo a medias."""
+    temporal = ruta.with_name(ruta.name + ".tmp")
+    escribir(temporal)
+    os.replace(temporal, ruta)
+
+
+def empaquetar(nombre: str) -> dict:
+    """Re-guardar un modelo sin compresión y escribir su manifiesto. Retorna el manifiesto."""
+    import joblib
+
+    origen = MODELOS[nombre]
+    modelo = _cargar_pickle_original(origen)
+    nombres = getattr(modelo, "feature_names_in_", None)
+
+    EMPAQUETADOS_DIR.mkdir(exist_ok=True)
+    destino = ruta_modelo(nombre)
+    _escribir_atomico(destino, lambda ruta: joblib.dump(modelo, ruta, compress=0))
+
+    manifiesto = {
+        "nombre": nombre,
+        "version": FORMATO_VERSION,
+        "archivo": destino.name,
+        **firma_archivo(destino),
+        "sha256": sha256_archivo(destino),
+        "origen": origen.name,
+        "origen_firma": firma_archivo(origen),
+        "origen_sha256": sha256_archivo(origen),
+        "tipo": f"{type(modelo).__module__}.{type(modelo).__name__}",
+        "features": [str(c) for c in nombres] if nombres is not None else None,
+        "librerias": versiones_librerias(),
+        "creado_en": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+    _escribir_atomico(
+        ruta_manifiesto(nombre),
+        lambda ruta: ruta.write_text(json.dumps(manifiesto, indent=2, ensure_ascii=False), encoding="utf-8"),
+    )
+    return manifiesto
+
+
+def _problema_empaquetado(nombre: str, manifiesto: dict | None, origen: Path) -> str | None:
+    """Motivo por el que no se puede usar el artefacto empaquetado (None si es válido)."""
+    if manifiesto is None or not ruta_modelo(nombre).exists():
+        return "sin empaquetar"
+    if manifiesto.get("version") != FORMATO_VERSION:
+        return f"empaquetado con formato {manifiesto.get('version')} (se espera {FORMATO_VERSION})"
+    # Solo si cambió el tamaño o el mtime se lee el archivo para el checksum
+    artefacto = ruta_modelo(nombre)
+    firma = {"bytes": manifiesto.get("bytes"), "mtime_ns": manifiesto.get("mtime_ns")}
+    if firma_archivo(artefacto) != firma and sha256_archivo(artefacto) != manifiesto.get("sha256"):
+        return "con checksum inválido"
+    if (origen.exists() and firma_archivo(origen) != manifiesto.get("origen_firma")
+            and sha256_archivo(origen) != manifiesto.get("origen_sha256")):
+        return "desactualizado respecto de su .pkl"
+    return None
+
+
+def cargar_modelo(nombre: str):
+    """Cargar un modelo de producción registrando tiempo, formato y tamaño.
+
+    Ruta rápida: artefacto empaquetado y válido -> joblib.load(mmap_mode="r").
+    Si no hay artefacto válido se carga el .pkl original (con un WARNING para
+    empaquetarlo). Retorna None si no se pudo cargar.
+    """
+    import joblib
+
+    origen = MODELOS[nombre]
+    inicio = time.perf_counter()
+    modelo = None
+    error = None
+    detalle: dict = {}
+
+    try:
+        manifiesto = leer_manifiesto(nombre)
+        problema = _problema_empaquetado(nombre, manifiesto, origen)
+        if problema is None:
+            modelo = joblib.load(ruta_modelo(nombre), mmap_mode="r")
+            detalle = {"formato": "joblib_mmap", "bytes": manifiesto["bytes"], "sha256": manifiesto["sha256"][:12]}
+            distintas = {
+                lib: (version, manifiesto["librerias"].get(lib))
+                for lib, version in versiones_librerias().items()
+                if lib != "python" and manifiesto["librerias"].get(lib) not in (None, version)
+            }
+            if distintas:
+                print(f"WARNING - Modelo {nombre} empaquetado con otras versiones: {distintas}")
+        else:
+            print(f"WARNING - Modelo {nombre} {problema}: se carga {origen.name} (python -m app.ml_models.artefactos)")
+            modelo = joblib.load(origen)
+            detalle = {"formato": "pickle", "bytes": origen.stat().st_size}
+        print(f"OK - Modelo {nombre} cargado ({detalle['formato']}) en {time.perf_counter() - inicio:.3f}s")
+    except Exception as e:
+        error = str(e)
+        print(f"Error al cargar modelo {nombre}: {e}")
+        modelo = None
+
+    registrar_carga(f"modelo_{nombre}", time.perf_counter() - inicio, ok=modelo is not None,
+                    error=error, detalle=detalle or None)
+    return modelo
+
+
+def main() -> None:
+    import joblib
+
+    nombres = sys.argv[1:] or list(MODELOS)
+    for nombre in nombres:
+        if nombre not in MODELOS:
+            print(f"Error - Modelo desconocido: {nombre} (opciones: {', '.join(MODELOS)})")
+            sys.exit(1)
+        if not MODELOS[nombre].exists():
+            print(f"WARNING - {MODELOS[nombre].name} no existe, se omite")
+            continue
+
+        manifiesto = empaquetar(nombre)
+
+        # Comparar la carga del original con la del artefacto (ya con imports hechos)
+        inicio = time.perf_counter()
+        joblib.load(MODELOS[nombre])
+        original = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        joblib.load(ruta_modelo(nombre), mmap_mode="r")
+        empaquetado = time.perf_counter() - inicio
+
+        print(
+            f"OK - {nombre}: {manifiesto['archivo']} ({manifiesto['bytes'] / 2**20:.1f} MB, "
+            f"{len(manifiesto['features'] or [])} features, sha256 {manifiesto['sha256'][:12]}) | "
+            f"carga original {original * 1000:.1f} ms, empaquetado {empaquetado * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
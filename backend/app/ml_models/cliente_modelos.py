@@ -0,0 +1,102 @@
+"""
+Cliente liviano del servidor de modelos.
+
+Expone la misma interfaz que ``PredictorNotaMatricula.predecir_notas`` y
+``PredictorNota.predecir_nota``/``predecir_notas_lote`` pero delega en el proceso de
+``app.ml_models.servidor_modelos``, así el worker no carga pickles ni features.
+Solo depende de la librería estándar.
+"""
+
+import socket
+import threading
+
+from app.ml_models import protocolo
+
+
+class ClienteModelos:
+    """Cliente con una conexión persistente por hilo hacia el socket Unix."""
+
+    # Compatibilidad con el predictor en proceso (no hay modelo local)
+    modelo = None
+    modelo_rapido = None
+    lote = None
+
+    def __init__(self, ruta_socket: str, timeout: float = 30.0):
+        self.ruta_socket = ruta_socket
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _conexion(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.ruta_socket)
+            self._local.sock = sock
+        return sock
+
+    def _cerrar(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+        self._local.sock = None
+
+    def _llamar(self, op: int, payload: bytes = b"") -> bytes:
+        """Enviar una solicitud; reintenta una vez con conexión nueva."""
+        for intento in range(2):
+            try:
+                sock = self._conexion()
+                protocolo.enviar_frame(sock, op, payload)
+                estado, respuesta = protocolo.recibir_frame(sock)
+                break
+            except (protocolo.ProtocoloError, OSError):
+                self._cerrar()
+                if intento == 1:
+                    raise
+        if estado != protocolo.ESTADO_OK:
+            raise protocolo.ProtocoloError(respuesta.decode("utf-8", errors="replace"))
+        return respuesta
+
+    def ping(self) -> bool:
+        try:
+            self._llamar(protocolo.OP_PING)
+            return True
+        except Exception:
+            return False
+
+    def predecir_notas(self, cod_persona: int, lista_cod_curso: list[str], per_matricula: str) -> list[tuple[str, float]]:
+        """Misma interfaz y fallback que PredictorNotaMatricula.predecir_notas."""
+        try:
+            payload = protocolo.pack_predecir_notas(cod_persona, lista_cod_curso, per_matricula)
+            return protocolo.unpack_notas(self._llamar(protocolo.OP_PREDECIR_NOTAS, payload))
+        except Exception as e:
+            print(f"Error consultando servidor de modelos: {e}")
+            return [(cod, 14.0) for cod in lista_cod_curso]
+
+    def predecir_nota(self, cod_persona: str, cod_curso: str,
+                      per_matricula: str = None,
+                      historial_academico: dict = None) -> str:
+        """Misma interfaz que PredictorNota.predecir_nota."""
+        promedio = historial_academico.get("promedio_acumulado") if historial_academico else None
+        payload = protocolo.pack_clasificar(cod_persona, cod_curso, per_matricula, promedio)
+        try:
+            categoria, _ = protocolo.unpack_str(self._llamar(protocolo.OP_CLASIFICAR, payload), 0)
+            return categoria
+        except Exception as e:
+            print(f"Error consultando servidor de modelos: {e}")
+            return "Error6"
+
+    def predecir_notas_lote(self, cod_persona: str, lista_cod_curso: list[str],
+                            per_matricula: str = None,
+                            historial_academico: dict = None) -> dict[str, str]:
+        """Misma interfaz que PredictorNota.predecir_notas_lote."""
+        promedio = historial_academico.get("promedio_acumulado") if historial_academico else None
+        payload = protocolo.pack_clasificar_lote(cod_persona, lista_cod_curso, per_matricula, promedio)
+        try:
+            return protocolo.unpack_categorias(self._llamar(protocolo.OP_CLASIFICAR_LOTE, payload))
+        except Exception as e:
+            print(f"Error consultando servidor de modelos: {e}")
+            return {cod: "Error6" for cod in lista_cod_curso}
@@ -0,0 +1,39 @@
+"""
+Feature store compartido por los predictores
+Dataset con features pre-calculadas por (persona, curso, periodo)
+"""
+
+import threading
+
+import pandas as pd
+from pathlib import Path
+
+from app.core.estado import medir_carga
+
+DATA_PATH = Path(__file__).parent / "predictor_nota_data.csv"
+
+_lock = threading.Lock()
+_df_features = None
+_cargado = False
+
+
+def get_df_features():
+    """Devolver el dataset de features, cargándolo una sola vez (thread-safe).
+
+    Retorna None si el CSV no se pudo leer.
+    """
+    global _df_features, _cargado
+    if _cargado:
+        return _df_features
+    with _lock:
+        if not _cargado:
+            print(f"Cargando dataset de features desde: {DATA_PATH}")
+            try:
+                with medir_carga("feature_store"):
+                    _df_features = pd.read_csv(DATA_PATH)
+                print(f"OK - Dataset cargado: {len(_df_features)} filas")
+            except Exception as e:
+                print(f"Error al cargar dataset: {e}")
+                _df_features = None
+            _cargado = True
+    return _df_features
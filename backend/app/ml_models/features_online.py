@@ -0,0 +1,400 @@
+"""
+Constructor de features en línea desde las tablas matricula, alumno y curso.
+
+El dataset ``predictor_nota_data.csv`` solo tiene filas para los
+(persona, curso, periodo) que existían al generarlo offline. Para un periodo
+nuevo (la matrícula que el alumno está armando) este módulo calcula las mismas
+features a partir de la base de datos.
+
+Los agregados se mantienen en memoria y se actualizan de forma incremental:
+cada vez que se reimporta ``matricula`` (cambia su versión en importacion_csv)
+solo se aplican las filas nuevas, modificadas o eliminadas. Calcular las features de
+una matrícula cuesta O(cursos del alumno + cursos pedidos).
+
+Features que dependen de fuentes externas que no están en la BD (POBREZA_*,
+EDAD) se dejan en NaN y el modelo las imputa con la mediana de entrenamiento.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import select
+
+from app.core.estado import medir_carga
+
+# Semanas lectivas por ciclo (para convertir horas semanales en horas totales)
+SEMANAS_CICLO = 16
+NOTA_APROBATORIA = 11.5
+
+_NAN = float("nan")
+
+
+class _Periodo:
+    """Agregados de un alumno en un periodo."""
+
+    __slots__ = ("suma_nota_cred", "creditos_con_nota", "creditos", "horas", "inasistencia", "cursos")
+
+    def __init__(self):
+        self.suma_nota_cred = 0.0
+        self.creditos_con_nota = 0.0
+        self.creditos = 0.0
+        self.horas = 0.0
+        self.inasistencia = 0.0
+        # cod_curso -> nota (None si no tiene nota)
+        self.cursos: Dict[str, Optional[float]] = {}
+
+
+def _cuantil(valores: List[float], q: float) -> float:
+    """Cuantil con interpolación lineal (igual que numpy/pandas) sobre una lista ordenada."""
+    if not valores:
+        return _NAN
+    pos = (len(valores) - 1) * q
+    bajo = math.floor(pos)
+    alto = math.ceil(pos)
+    if bajo == alto:
+        return valores[bajo]
+    return valores[bajo] + (valores[alto] - valores[bajo]) * (pos - bajo)
+
+
+def _estadisticas(valores: List[float], sufijo: str) -> Dict[str, float]:
+    """AVG/QUARTIL/PRCTJE_S/MAX/MIN/DIF de una lista ORDENADA de notas."""
+    if not valores:
+        return {
+            f"{k}_{sufijo}": _NAN
+            for k in ("AVG", "QUARTIL_25", "QUARTIL_50", "QUARTIL_75", "PRCTJE_S",
+                      "MAX", "MIN", "DIF_Q75_Q25", "DIF_MAX_MIN")
+        }
+    q25 = _cuantil(valores, 0.25)
+    q75 = _cuantil(valores, 0.75)
+    aprobados = len(valores) - bisect.bisect_left(valores, NOTA_APROBATORIA)
+    return {
+        f"AVG_{sufijo}": sum(valores) / len(valores),
+        f"QUARTIL_25_{sufijo}": q25,
+        f"QUARTIL_50_{sufijo}": _cuantil(valores, 0.5),
+        f"QUARTIL_75_{sufijo}": q75,
+        f"PRCTJE_S_{sufijo}": aprobados / len(valores),
+        f"MAX_{sufijo}": valores[-1],
+        f"MIN_{sufijo}": valores[0],
+        f"DIF_Q75_Q25_{sufijo}": q75 - q25,
+        f"DIF_MAX_MIN_{sufijo}": valores[-1] - valores[0],
+    }
+
+
+class ConstructorFeatures:
+    """Mantiene agregados por alumno y por curso, y arma filas de features."""
+
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+        self._lock = threading.RLock()
+
+        self._cursos: Dict[str, dict] = {}
+        self._alumnos: Dict[str, dict] = {}
+        self._total_creditos_malla = 0.0
+        self._total_cursos_malla = 0
+
+        # (persona, curso, periodo) -> (nota, hrs_inasistencia)
+        self._filas: Dict[Tuple[str, str, str], Tuple[Optional[float], Optional[float]]] = {}
+        # persona -> periodo -> agregados
+        self._historial: Dict[str, Dict[str, _Periodo]] = defaultdict(dict)
+        # curso -> periodo -> notas ordenadas
+        self._notas_curso: Dict[str, Dict[str, List[float]]] = defaultdict(dict)
+        # (curso, periodo) -> notas ordenadas de periodos anteriores (cache)
+        self._cache_ng: Dict[Tuple[str, str], List[float]] = {}
+
+        # Versión (importacion_csv) de cada tabla con la que se construyó el estado
+        self._versiones: Dict[str, str] = {}
+
+    # ------------------------------------------------------------------
+    # Sincronización con la base de datos
+    # ------------------------------------------------------------------
+    def sincronizar(self, forzar: bool = False) -> None:
+        """Traer cambios de la BD si el importador recargó alguna tabla."""
+        from app.db.csv_import import version_tabla
+
+        actuales = {t: version_tabla(t) for t in ("curso", "alumno", "matricula")}
+        if not forzar and actuales == self._versiones:
+            return
+
+        with self._lock:
+            if not forzar and actuales == self._versiones:
+                return
+            db = self._session_factory()
+            try:
+                if forzar or actuales["curso"] != self._versiones.get("curso"):
+                    self._cargar_cursos(db)
+                if forzar or actuales["alumno"] != self._versiones.get("alumno"):
+                    self._cargar_alumnos(db)
+                if forzar or actuales["matricula"] != self._versiones.get("matricula"):
+                    self._sincronizar_matriculas(db)
+            finally:
+                db.close()
+            self._versiones = actuales
+
+    def _cargar_cursos(self, db) -> None:
+        from app.models.curso import Curso
+        from app.ml_models.recomendador_matricula import CLUSTERS_RAW, create_course_cluster_map
+
+        mapa_cluster = create_course_cluster_map(CLUSTERS_RAW)
+        filas = db.execute(select(
+            Curso.cod_curso, Curso.curso, Curso.creditos, Curso.familia,
+            Curso.nivel_curso, Curso.horas, Curso.tipo,
+        )).all()
+
+        cursos = {}
+        for cod, nombre, creditos, familia, nivel, horas, tipo in filas:
+            cluster = mapa_cluster.get((nombre or "").strip().upper())
+            cursos[cod] = {
+                "curso": nombre,
+                "creditos": float(creditos or 0),
+                "familia": familia,
+                "nivel": nivel,
+                "horas": float(horas or 0),
+                "tipo": tipo,
+                "cluster": str(cluster) if cluster is not None else None,
+            }
+        self._cursos = cursos
+        obligatorios = [c for c in cursos.values() if c["tipo"] == "O"] or list(cursos.values())
+        self._total_creditos_malla = sum(c["creditos"] for c in obligatorios)
+        self._total_cursos_malla = len(obligatorios)
+
+        # Los créditos/horas por periodo dependen del catálogo: recalcular
+        if self._filas:
+            filas_matricula = dict(self._filas)
+            self._resetear_matriculas()
+            for clave, valores in filas_matricula.items():
+                self._aplicar(clave, *valores)
+
+    def _cargar_alumnos(self, db) -> None:
+        from app.models.alumno import Alumno
+
+        filas = db.execute(select(Alumno.cod_persona, Alumno.ptje_ingreso)).all()
+        self._alumnos = {str(cod): {"ptje_ingreso": ptje} for cod, ptje in filas}
+
+    def _resetear_matriculas(self) -> None:
+        self._filas = {}
+        self._historial = defaultdict(dict)
+        self._notas_curso = defaultdict(dict)
+        self._cache_ng = {}
+
+    def _sincronizar_matriculas(self, db) -> None:
+        """Aplicar solo el delta entre lo que hay en memoria y la tabla."""
+        from app.models.matricula import Matricula
+
+        filas = db.execute(select(
+            Matricula.cod_persona, Matricula.cod_curso, Matricula.per_matricula,
+            Matricula.nota, Matricula.hrs_inasistencia,
+        )).all()
+
+        nuevas = {
+            (str(p), c, per): (nota, hrs)
+            for p, c, per, nota, hrs in filas
+        }
+
+        for clave in [k for k in self._filas if k not in nuevas]:
+            self._quitar(clave)
+        for clave, valores in nuevas.items():
+            anterior = self._filas.get(clave)
+            if anterior == valores:
+                continue
+            if anterior is not None:
+                self._quitar(clave)
+            self._aplicar(clave, *valores)
+
+    def _aplicar(self, clave, nota, hrs) -> None:
+        persona, cod_curso, periodo = clave
+        info = self._cursos.get(cod_curso, {})
+        creditos = info.get("creditos", 0.0)
+
+        agg = self._historial[persona].setdefault(periodo, _Periodo())
+        agg.cursos[cod_curso] = nota
+        agg.creditos += creditos
+        agg.horas += info.get("horas", 0.0) * SEMANAS_CICLO
+        agg.inasistencia += float(hrs or 0)
+        if nota is not None:
+            agg.suma_nota_cred += nota * creditos
+            agg.creditos_con_nota += creditos
+            bisect.insort(self._notas_curso[cod_curso].setdefault(periodo, []), nota)
+
+        self._filas[clave] = (nota, hrs)
+        self._invalidar_cache(cod_curso)
+
+    def _quitar(self, clave) -> None:
+        persona, cod_curso, periodo = clave
+        nota, hrs = self._filas.pop(clave)
+        info = self._cursos.get(cod_curso, {})
+        creditos = info.get("creditos", 0.0)
+
+        agg = self._historial[persona].get(periodo)
+        if agg is not None:
+            agg.cursos.pop(cod_curso, None)
+            agg.creditos -= creditos
+            agg.horas -= info.get("horas", 0.0) * SEMANAS_CICLO
+            agg.inasistencia -= float(hrs or 0)
+            if nota is not None:
+                agg.suma_nota_cred -= nota * creditos
+                agg.creditos_con_nota -= creditos
+            if not agg.cursos:
+                del self._historial[persona][periodo]
+
+        if nota is not None:
+            notas = self._notas_curso[cod_curso].get(periodo, [])
+            i = bisect.bisect_left(notas, nota)
+            if i < len(notas) and notas[i] == nota:
+                notas.pop(i)
+        self._invalidar_cache(cod_curso)
+
+    def _invalidar_cache(self, cod_curso: str) -> None:
+        if self._cache_ng:
+            for k in [k for k in self._cache_ng if k[0] == cod_curso]:
+                del self._cache_ng[k]
+
+    # ------------------------------------------------------------------
+    # Features
+    # ------------------------------------------------------------------
+    def _notas_curso_antes(self, cod_curso: str, per_matricula: str) -> List[float]:
+        clave = (cod_curso, per_matricula)
+        notas = self._cache_ng.get(clave)
+        if notas is None:
+            notas = sorted(
+                n
+                for per, lista in self._notas_curso.get(cod_curso, {}).items()
+                if per < per_matricula
+                for n in lista
+            )
+            self._cache_ng[clave] = notas
+        return notas
+
+    def _notas_curso_ciclo_pasado(self, cod_curso: str, per_matricula: str) -> List[float]:
+        periodos = [p for p, lista in self._notas_curso.get(cod_curso, {}).items() if p < per_matricula and lista]
+        if not periodos:
+            return []
+        return self._notas_curso[cod_curso][max(periodos)]
+
+    def construir(self, cod_persona, lista_cod_curso: List[str], per_matricula: str) -> pd.DataFrame:
+        """Armar filas de features (mismo formato que el CSV) para una matrícula.
+
+        Solo usa el historial de periodos anteriores a ``per_matricula``.
+        Retorna un DataFrame vacío si el alumno no existe.
+        """
+        self.sincronizar()
+        persona = str(cod_persona)
+
+        with self._lock:
+            if persona not in self._alumnos:
+                return pd.DataFrame()
+
+            historial = sorted(
+                (p, agg) for p, agg in self._historial.get(persona, {}).items() if p < per_matricula
+            )
+
+            suma_nc = sum(a.suma_nota_cred for _, a in historial)
+            cred_nota = sum(a.creditos_con_nota for _, a in historial)
+            creditos = sum(a.creditos for _, a in historial)
+            horas = sum(a.horas for _, a in historial)
+            inasistencia = sum(a.inasistencia for _, a in historial)
+
+            prom_hist = suma_nc / cred_nota if cred_nota else _NAN
+            inas_hist = 100.0 * inasistencia / horas if horas else _NAN
+            if historial:
+                prev = historial[-1][1]
+                prom_prev = prev.suma_nota_cred / prev.creditos_con_nota if prev.creditos_con_nota else _NAN
+                inas_prev = 100.0 * prev.inasistencia / prev.horas if prev.horas else _NAN
+            else:
+                prom_prev = _NAN
+                inas_prev = _NAN
+
+            # Notas del alumno por familia y cluster (periodos anteriores)
+            notas_familia: Dict[str, List[float]] = defaultdict(list)
+            notas_cluster: Dict[str, List[float]] = defaultdict(list)
+            llevados = set()
+            aprobados = set()
+            creditos_aprobados = 0.0
+            for _, agg in historial:
+                for cod, nota in agg.cursos.items():
+                    llevados.add(cod)
+                    if nota is None:
+                        continue
+                    info = self._cursos.get(cod, {})
+                    if info.get("familia"):
+                        notas_familia[info["familia"]].append(nota)
+                    if info.get("cluster") is not None:
+                        notas_cluster[info["cluster"]].append(nota)
+                    if nota >= NOTA_APROBATORIA and cod not in aprobados:
+                        aprobados.add(cod)
+                        creditos_aprobados += info.get("creditos", 0.0)
+
+            base = {
+                "COD_PERSONA": int(persona) if persona.isdigit() else persona,
+                "PER_MATRICULA": per_matricula,
+                "PTJE_INGRESO": self._alumnos[persona].get("ptje_ingreso"),
+                "POBREZA_RES": _NAN,
+                "POBREZA_PRO": _NAN,
+                "EDAD": _NAN,
+                "PROM_ACUMULADO_HIST": prom_hist,
+                "PROMEDIO_CICLO_PASADO": prom_prev,
+                "DIF_PROM_SHOCK": prom_prev - prom_hist,
+                "PRCTJ_INASISTENCIA_HISTORICO": inas_hist,
+                "PRCTJ_INASISTENCIA_CICLO_PASADO": inas_prev,
+                "DIF_INASISTENCIA_SHOCK": inas_prev - inas_hist,
+                "SEM_CURSADOS": len(historial),
+                "PCT_CREDITOS_LLEVADOS": creditos / self._total_creditos_malla if self._total_creditos_malla else _NAN,
+                "PCT_CURSOS_LLEVADOS": len(llevados) / self._total_cursos_malla if self._total_cursos_malla else _NAN,
+                "PCT_CREDITOS_APROBADOS": creditos_aprobados / creditos if creditos else _NAN,
+                "PCT_CURSOS_APROBADOS": len(aprobados) / len(llevados) if llevados else _NAN,
+            }
+
+            filas = []
+            for cod_curso in lista_cod_curso:
+                info = self._cursos.get(cod_curso)
+                if info is None:
+                    continue
+                fila = dict(base)
+                fila.update({
+                    "COD_CURSO": cod_curso,
+                    "CURSO": info["curso"],
+                    "CREDITOS": info["creditos"],
+                    "HRS_CURSO": info["horas"],
+                    "FAMILIA": info["familia"],
+                    "NIVEL_CURSO": info["nivel"],
+                    "CLUSTER_DIFICULTAD": info["cluster"],
+                })
+                fila.update(_estadisticas(self._notas_curso_antes(cod_curso, per_matricula), "COD_CURSO_NG"))
+                fila.update(_estadisticas(self._notas_curso_ciclo_pasado(cod_curso, per_matricula), "COD_CURSO_PC"))
+                fila.update(_estadisticas(sorted(notas_familia.get(info["familia"], [])), "FAMILIA_NG_P"))
+                fila.update(_estadisticas(sorted(notas_cluster.get(info["cluster"], [])), "CLUSTER_DIFICULTAD_NG_P"))
+                filas.append(fila)
+
+        return pd.DataFrame(filas)
+
+
+# Singleton (thread-safe)
+_constructor_instance: Optional[ConstructorFeatures] = None
+_constructor_lock = threading.Lock()
+
+
+def get_constructor_features() -> Optional[ConstructorFeatures]:
+    """Devolver el constructor de features, construyéndolo desde la BD la primera vez.
+
+    Retorna None si la base de datos no está disponible.
+    """
+    global _constructor_instance
+    if _constructor_instance is None:
+        with _constructor_lock:
+            if _constructor_instance is None:
+                from app.db.database import SessionLocal
+                try:
+                    constructor = ConstructorFeatures(SessionLocal)
+                    with medir_carga("features_online"):
+                        constructor.sincronizar(forzar=True)
+                    _constructor_instance = constructor
+                    print("OK - Constructor de features en línea listo")
+                except Exception as e:
+                    print(f"Error al construir features en línea: {e}")
+                    return None
+    return _constructor_instance
@@ -0,0 +1,264 @@
+"""
+Ruta de inferencia de baja latencia para los modelos de producción.
+
+Los modelos se guardan como ``Pipeline(preprocessor, regressor)`` de scikit-learn.
+Llamar a ``Pipeline.predict`` con un DataFrame pequeño cuesta más que el propio
+modelo: valida nombres de columnas, convierte dtypes y recorre el
+``ColumnTransformer`` en cada llamada.
+
+``ModeloCompilado`` resuelve una sola vez (al cargar) qué columnas usa el modelo,
+en qué orden, y pliega la imputación y el escalado en vectores de numpy. Después
+solo recibe matrices ``float32`` ya armadas y llama directamente al estimador final.
+Si el pipeline tiene una estructura que no sabemos plegar, se usa el camino
+original con DataFrame, así que el resultado nunca cambia de semántica.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class ModeloCompilado:
+    """Envoltura de un modelo sklearn con columnas y preprocesamiento resueltos al cargar."""
+
+    def __init__(self, modelo):
+        self.modelo = modelo
+        self.compilado = False
+
+        # Columnas de entrada (en orden) que el modelo realmente consume
+        self.columnas: Optional[List[str]] = None
+        self._imputacion: Optional[np.ndarray] = None
+        self._media: Optional[np.ndarray] = None
+        self._escala: Optional[np.ndarray] = None
+        self._estimador = None
+        self._booster = None
+
+        if modelo is None:
+            return
+
+        try:
+            self._compilar(modelo)
+        except Exception as e:
+            print(f"WARNING - No se pudo compilar el modelo, se usara la ruta DataFrame: {e}")
+            self.compilado = False
+
+        if not self.compilado:
+            nombres = getattr(modelo, "feature_names_in_", None)
+            self.columnas = [str(c) for c in nombres] if nombres is not None else None
+
+    # ------------------------------------------------------------------
+    # Compilación
+    # ------------------------------------------------------------------
+    def _compilar(self, modelo) -> None:
+        """Intentar plegar el pipeline en operaciones vectoriales simples."""
+        from sklearn.base import is_regressor
+        from sklearn.compose import ColumnTransformer
+        from sklearn.pipeline import Pipeline
+
+        if isinstance(modelo, Pipeline):
+            pasos = [paso for _, paso in modelo.steps]
+            estimador = pasos[-1]
+            previos = [p for p in pasos[:-1] if p is not None and p != "passthrough"]
+        else:
+            estimador = modelo
+            previos = []
+
+        if len(previos) > 1:
+            return
+
+        nombres_entrada = getattr(modelo, "feature_names_in_", None)
+        if nombres_entrada is None:
+            return
+        nombres_entrada = [str(c) for c in nombres_entrada]
+
+        columnas: List[str] = []
+        imputacion: List[float] = []
+        media: List[float] = []
+        escala: List[float] = []
+
+        if previos:
+            pre = previos[0]
+            if not isinstance(pre, ColumnTransformer):
+                return
+            if pre.remainder not in ("drop", None) and _columnas_bloque(pre, "remainder", nombres_entrada):
+                return
+
+            for nombre, transformador, cols in pre.transformers_:
+                if nombre == "remainder":
+                    continue
+                cols = _resolver_columnas(cols, nombres_entrada)
+                if cols is None:
+                    return
+                if not cols or transformador == "drop":
+                    continue
+
+                bloque = _plegar_transformador(transformador, len(cols))
+                if bloque is None:
+                    return
+                imp, med, esc = bloque
+                columnas.extend(cols)
+                imputacion.extend(imp)
+                media.extend(med)
+                escala.extend(esc)
+        else:
+            columnas = list(nombres_entrada)
+            imputacion = [np.nan] * len(columnas)
+            media = [0.0] * len(columnas)
+            escala = [1.0] * len(columnas)
+
+        self.columnas = columnas
+        self._imputacion = np.asarray(imputacion, dtype=np.float32)
+        self._media = np.asarray(media, dtype=np.float32)
+        self._escala = np.asarray(escala, dtype=np.float32)
+        self._estimador = estimador
+
+        # Para regresores LightGBM se llama al booster directamente (evita
+        # la validación de sklearn); para clasificadores se respeta predict()
+        # porque traduce probabilidades a etiquetas.
+        if is_regressor(estimador):
+            self._booster = getattr(estimador, "_Booster", None)
+
+        self.compilado = True
+
+    # ------------------------------------------------------------------
+    # Matrices de entrada
+    # ------------------------------------------------------------------
+    def nueva_matriz(self, n_filas: int) -> np.ndarray:
+        """Reservar una matriz float32 con el orden de columnas del modelo."""
+        n_cols = len(self.columnas) if self.columnas else 0
+        return np.empty((n_filas, n_cols), dtype=np.float32)
+
+    def llenar_matriz(self, df: pd.DataFrame, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Copiar las columnas usadas por el modelo desde ``df`` a una matriz float32.
+
+        Las columnas ausentes en ``df`` se dejan como NaN (se imputan en ``predict``).
+        Si se pasa ``out`` se reutiliza ese buffer (debe tener al menos ``len(df)`` filas).
+        """
+        n = len(df)
+        if out is None:
+            out = self.nueva_matriz(n)
+        else:
+            out = out[:n]
+
+        for j, col in enumerate(self.columnas or []):
+            if col in df.columns:
+                out[:, j] = pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+            else:
+                out[:, j] = np.nan
+        return out
+
+    # ------------------------------------------------------------------
+    # Predicción
+    # ------------------------------------------------------------------
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predecir sobre una matriz float32 armada con ``llenar_matriz``/``nueva_matriz``.
+
+        La matriz se modifica en sitio (imputación y escalado) para no reservar memoria.
+        """
+        if not self.compilado:
+            return self.modelo.predict(pd.DataFrame(X, columns=self.columnas))
+
+        if X.dtype != np.float32:
+            X = X.astype(np.float32)
+
+        faltantes = np.isnan(X)
+        if faltantes.any():
+            filas, cols = np.nonzero(faltantes)
+            X[filas, cols] = self._imputacion[cols]
+        X -= self._media
+        X /= self._escala
+
+        if self._booster is not None:
+            return self._booster.predict(X)
+        return self._estimador.predict(X)
+
+    def predict_df(self, df: pd.DataFrame) -> np.ndarray:
+        """Atajo: armar la matriz desde un DataFrame y predecir."""
+        if not self.compilado:
+            if self.columnas is not None:
+                df = df.reindex(columns=self.columnas)
+            return self.modelo.predict(df)
+        return self.predict(self.llenar_matriz(df))
+
+
+def _resolver_columnas(cols, nombres_entrada: List[str]) -> Optional[List[str]]:
+    """Traducir la selección de columnas de un ColumnTransformer a nombres."""
+    if isinstance(cols, str):
+        return [cols]
+    if isinstance(cols, slice) or callable(cols):
+        return None
+    cols = list(cols)
+    if not cols:
+        return []
+    if all(isinstance(c, str) for c in cols):
+        return cols
+    if all(isinstance(c, (bool, np.bool_)) for c in cols):
+        return [n for n, usar in zip(nombres_entrada, cols) if usar]
+    if all(isinstance(c, (int, np.integer)) for c in cols):
+        return [nombres_entrada[int(c)] for c in cols]
+    return None
+
+
+def _columnas_bloque(pre, nombre: str, nombres_entrada: List[str]) -> List[str]:
+    for n, _, cols in pre.transformers_:
+        if n == nombre:
+            return _resolver_columnas(cols, nombres_entrada) or []
+    return []
+
+
+def _plegar_transformador(transformador, n_cols: int):
+    """Plegar imputador/escalador (o un Pipeline de ellos) en vectores.
+
+    Retorna (imputacion, media, escala) o None si hay algún paso desconocido.
+    """
+    from sklearn.pipeline import Pipeline
+    from sklearn.impute import SimpleImputer
+    from sklearn.preprocessing import StandardScaler
+
+    if transformador == "passthrough":
+        pasos = []
+    elif isinstance(transformador, Pipeline):
+        pasos = [p for _, p in transformador.steps if p is not None and p != "passthrough"]
+    else:
+        pasos = [transformador]
+
+    imputacion = np.full(n_cols, np.nan)
+    media = np.zeros(n_cols)
+    escala = np.ones(n_cols)
+    escalado = False
+
+    for paso in pasos:
+        if isinstance(paso, SimpleImputer) and not escalado:
+            faltante = paso.missing_values
+            if not (isinstance(faltante, float) and np.isnan(faltante)) and faltante is not None:
+                return None
+            if getattr(paso, "add_indicator", False):
+                return None
+            estadisticas = np.asarray(paso.statistics_, dtype=np.float64)
+            if estadisticas.shape[0] != n_cols or np.isnan(estadisticas).any():
+                return None
+            imputacion = estadisticas
+        elif isinstance(paso, StandardScaler) and not escalado:
+            # mean_ se calcula aunque with_mean=False: solo se usa si se resta
+            if paso.with_mean:
+                media = getattr(paso, "mean_", None)
+                if media is None:
+                    return None
+                media = np.asarray(media, dtype=np.float64)
+                if media.shape != (n_cols,):
+                    return None
+            if paso.with_std:
+                escala = getattr(paso, "scale_", None)
+                if escala is None:
+                    return None
+                escala = np.asarray(escala, dtype=np.float64)
+                if escala.shape != (n_cols,):
+                    return None
+            escalado = True
+        else:
+            return None
+
+    return imputacion, media, escala
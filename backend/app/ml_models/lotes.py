@@ -0,0 +1,147 @@
+"""
+Micro-batching de predicciones concurrentes.
+
+Durante la matrícula muchas solicitudes llaman a ``predecir_notas`` con pocas
+filas cada una. ``LoteadorPredicciones`` junta las matrices que llegan dentro de
+una ventana corta (``max_espera_ms``) hasta ``max_filas`` filas, ejecuta un único
+``predict`` y reparte los resultados a cada llamador.
+
+La espera es adaptativa: solo se espera a otras solicitudes mientras haya más
+llamadores activos que matrices en el lote, así un llamador solitario (por
+ejemplo el backtracking de /mejor-horario) no paga la ventana de espera.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.ml_models.inferencia import ModeloCompilado
+
+
+class LoteadorPredicciones:
+    """Agrupa predicciones concurrentes en un solo ``predict`` del modelo compilado."""
+
+    def __init__(self, modelo: ModeloCompilado, max_espera_ms: float = 2.0, max_filas: int = 256):
+        self.modelo = modelo
+        self.max_espera = max(max_espera_ms, 0.0) / 1000.0
+        self.max_filas = max(int(max_filas), 1)
+        self.stats = {"solicitudes": 0, "lotes": 0, "filas": 0, "max_lote": 0}
+        self._iniciar_estado()
+
+    def _iniciar_estado(self) -> None:
+        self._pid = os.getpid()
+        self._cola: "queue.Queue[Tuple[np.ndarray, Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._activos = 0
+        self._siguiente: Optional[Tuple[np.ndarray, Future]] = None
+        self._hilo: Optional[threading.Thread] = None
+
+    def _asegurar_hilo(self) -> None:
+        # Tras un fork el hilo del padre no existe en el hijo: reiniciar estado
+        if self._pid != os.getpid():
+            self._iniciar_estado()
+        if self._hilo is None or not self._hilo.is_alive():
+            with self._lock:
+                if self._hilo is None or not self._hilo.is_alive():
+                    self._hilo = threading.Thread(
+                        target=self._bucle, name="loteador-predicciones", daemon=True
+                    )
+                    self._hilo.start()
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def enviar(self, X: np.ndarray) -> Future:
+        """Encolar una matriz float32 y devolver un Future con sus predicciones."""
+        self._asegurar_hilo()
+        futuro: Future = Future()
+        self._cola.put((X, futuro))
+        return futuro
+
+    def predecir(self, X: np.ndarray) -> np.ndarray:
+        """Predecir bloqueando al llamador hasta que su lote se ejecute."""
+        self._asegurar_hilo()
+        with self._lock:
+            self._activos += 1
+        try:
+            return self.enviar(X).result()
+        finally:
+            with self._lock:
+                self._activos -= 1
+
+    # ------------------------------------------------------------------
+    # Hilo recolector
+    # ------------------------------------------------------------------
+    def _bucle(self) -> None:
+        while True:
+            if self._siguiente is not None:
+                primero, self._siguiente = self._siguiente, None
+            else:
+                primero = self._cola.get()
+
+            lote: List[Tuple[np.ndarray, Future]] = [primero]
+            filas = len(primero[0])
+            limite = time.monotonic() + self.max_espera
+
+            while filas < self.max_filas:
+                with self._lock:
+                    activos = self._activos
+                if len(lote) >= activos:
+                    # Nadie más está esperando: ejecutar ya
+                    try:
+                        item = self._cola.get_nowait()
+                    except queue.Empty:
+                        break
+                else:
+                    restante = limite - time.monotonic()
+                    if restante <= 0:
+                        break
+                    try:
+                        item = self._cola.get(timeout=restante)
+                    except queue.Empty:
+                        break
+
+                if filas + len(item[0]) > self.max_filas:
+                    self._siguiente = item
+                    break
+                lote.append(item)
+                filas += len(item[0])
+
+            self._ejecutar(lote, filas)
+
+    def _ejecutar(self, lote: List[Tuple[np.ndarray, Future]], filas: int) -> None:
+        # Descartar los futuros cancelados por su llamador: fijarles resultado
+        # lanzaría InvalidStateError y mataría el hilo recolector
+        lote = [(x, futuro) for x, futuro in lote if futuro.set_running_or_notify_cancel()]
+        if not lote:
+            return
+        filas = sum(len(x) for x, _ in lote)
+
+        try:
+            if len(lote) == 1:
+                X = lote[0][0]
+            else:
+                X = np.vstack([x for x, _ in lote])
+            y = np.asarray(self.modelo.predict(X))
+        except Exception as e:
+            for _, futuro in lote:
+                futuro.set_exception(e)
+            return
+
+        inicio = 0
+        for x, futuro in lote:
+            fin = inicio + len(x)
+            futuro.set_result(y[inicio:fin])
+            inicio = fin
+
+        self.stats["solicitudes"] += len(lote)
+        self.stats["lotes"] += 1
+        self.stats["filas"] += filas
+        self.stats["max_lote"] = max(self.stats["max_lote"], len(lote))
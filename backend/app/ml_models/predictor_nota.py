@@ -3,17 +3,26 @@ Clasificador de Riesgo Académico usando Modelo de Machine Learning
 Predice categorías de rendimiento: 0=Riesgo, 1=Normal, 2=Factible
 """
 
-import pickle
-import pandas as pd
-from pathlib import Path
+import threading
+
+from app.core.config import settings
+from app.ml_models.artefactos import MODELOS, cargar_modelo
+from app.ml_models.cliente_modelos import ClienteModelos
+from app.ml_models.features import DATA_PATH, get_df_features
+from app.ml_models.inferencia import ModeloCompilado
 
 # Rutas de archivos - AHORA USA EL CLASIFICADOR
-MODEL_PATH = Path(__file__).parent / "modelo_produccion_clasificador.pkl"
-DATA_PATH = Path(__file__).parent / "predictor_nota_data.csv"
+MODEL_PATH = MODELOS["clasificador"]
 
 print(f"Buscando modelo clasificador en: {MODEL_PATH}")
 print(f"Buscando datos en: {DATA_PATH}")
 
+# Columnas del dataset que no son features
+COLS_NO_FEATURES = ['NOTA', 'COD_PERSONA', 'COD_CURSO', 'PER_MATRICULA',
+                    'RANKING', 'CURSO', 'CONTRASENIA', 'FECHA_NACIMIENTO',
+                    'DEPARTAMENTO_PRO', 'PROVINCIA_PRO', 'DISTRITO_PRO',
+                    'DEPARTAMENTO_RES', 'PROVINCIA_RES', 'DISTRITO_RES']
+
 # Mapeo de categorías a rangos de notas estimadas
 
 CATEGORIA_LABELS = {
@@ -28,37 +37,83 @@ class PredictorNota:
 
     def __init__(self):
         """Cargar el modelo clasificador y dataset con features pre-calculadas"""
-        # Cargar modelo - intentar con joblib primero, luego pickle
-        self.modelo = None
+        # Artefacto empaquetado (mmap) o, si no hay, el .pkl original
+        self.modelo = cargar_modelo("clasificador")
+
+        # Resolver columnas y preprocesamiento una sola vez
+        self.modelo_rapido = ModeloCompilado(self.modelo)
+
+        # Dataset con features (compartido con el predictor por matrícula)
+        self.df_features = get_df_features()
+
+        # Índice COD_PERSONA -> posiciones de sus filas (se arma la primera vez)
+        self._indice_personas = None
+        self._indice_lock = threading.Lock()
+
+    def _filas_persona(self, cod_persona_num):
+        """Filas del dataset de un estudiante sin escanear todo el DataFrame."""
+        if self._indice_personas is None:
+            with self._indice_lock:
+                if self._indice_personas is None:
+                    self._indice_personas = self.df_features.groupby("COD_PERSONA", sort=False).indices
+        posiciones = self._indice_personas.get(cod_persona_num)
+        if posiciones is None:
+            return self.df_features.iloc[0:0]
+        return self.df_features.iloc[posiciones]
+
+    def predecir_notas_lote(self, cod_persona: str, lista_cod_curso: list[str],
+                            per_matricula: str = None,
+                            historial_academico: dict = None) -> dict[str, str]:
+        """
+        Clasificar varios cursos de un estudiante en una sola llamada al modelo.
+
+        Mismos códigos de error que predecir_nota, por curso.
+
+        Returns:
+            Diccionario {cod_curso: categoria_riesgo}
+        """
+        if self.modelo is None or self.df_features is None:
+            print("Modelo o dataset no están disponibles para clasificación por lote")
+            error = "Error1" if historial_academico else "Error2"
+            return {cod: error for cod in lista_cod_curso}
+
         try:
-            import joblib
-            self.modelo = joblib.load(MODEL_PATH)
-            print(f"OK - Modelo clasificador cargado exitosamente (joblib)")
-        except Exception as e:
-            print(f"Intento con joblib falló: {e}")
             try:
-                import pickle5 as pickle_alt
-                with open(MODEL_PATH, 'rb') as f:
-                    self.modelo = pickle_alt.load(f)
-                print(f"OK - Modelo clasificador cargado exitosamente (pickle5)")
-            except Exception as e2:
-                print(f"Intento con pickle5 falló: {e2}")
-                try:
-                    with open(MODEL_PATH, 'rb') as f:
-                        self.modelo = pickle.load(f, encoding='latin1')
-                    print(f"OK - Modelo clasificador cargado exitosamente (pickle latin1)")
-                except Exception as e3:
-                    print(f"Error al cargar modelo con pickle: {e3}")
-                    self.modelo = None
-
-        # Cargar dataset con features
-        try:
-            print(f"Cargando dataset de features...")
-            self.df_features = pd.read_csv(DATA_PATH)
-            print(f"OK - Dataset cargado: {len(self.df_features)} filas")
+                cod_persona_num = int(cod_persona)
+            except ValueError:
+                cod_persona_num = cod_persona
+
+            df_alumno = self._filas_persona(cod_persona_num)
+            if per_matricula and "PER_MATRICULA" in df_alumno.columns:
+                df_alumno = df_alumno[df_alumno["PER_MATRICULA"] == per_matricula]
+
+            # Última fila de cada curso pedido (mismo criterio que predecir_nota)
+            df_cursos = df_alumno[df_alumno["COD_CURSO"].isin(lista_cod_curso)]
+            filas = df_cursos.groupby("COD_CURSO", sort=False).tail(1)
+
+            resultado = {}
+            if not filas.empty:
+                X = filas.drop(columns=[c for c in COLS_NO_FEATURES if c in filas.columns], errors='ignore')
+                categorias = self.modelo_rapido.predict_df(X)
+                for cod_curso, categoria in zip(filas["COD_CURSO"].values, categorias):
+                    resultado[cod_curso] = CATEGORIA_LABELS.get(categoria, "Error")
+
+            sin_datos = "Error3" if historial_academico else "Error4"
+            for cod_curso in lista_cod_curso:
+                if cod_curso not in resultado:
+                    print(f"WARNING - No hay datos para {cod_persona}/{cod_curso}" +
+                          (f"/{per_matricula}" if per_matricula else ""))
+                    resultado[cod_curso] = sin_datos
+
+            print(f"OK - Clasificacion por lote: {len(filas)} cursos para {cod_persona}")
+            return {cod: resultado[cod] for cod in lista_cod_curso}
+
         except Exception as e:
-            print(f"Error al cargar dataset: {e}")
-            self.df_features = None
+            print(f"Error en clasificación por lote: {e}")
+            import traceback
+            traceback.print_exc()
+            error = "Error5" if historial_academico else "Error6"
+            return {cod: error for cod in lista_cod_curso}
 
     def predecir_nota(self, cod_persona: str, cod_curso: str,
                       per_matricula: str = None,
@@ -90,17 +145,15 @@ class PredictorNota:
             except ValueError:
                 cod_persona_num = cod_persona
 
-            # Buscar fila en dataset
-            filtros = (
-                (self.df_features["COD_PERSONA"] == cod_persona_num) &
-                (self.df_features["COD_CURSO"] == cod_curso)
-            )
+            # Buscar fila en dataset (solo entre las filas del estudiante)
+            df_alumno = self._filas_persona(cod_persona_num)
+            filtros = df_alumno["COD_CURSO"] == cod_curso
 
             # Si se proporciona per_matricula, usarlo como filtro adicional
-            if per_matricula and "PER_MATRICULA" in self.df_features.columns:
-                filtros = filtros & (self.df_features["PER_MATRICULA"] == per_matricula)
+            if per_matricula and "PER_MATRICULA" in df_alumno.columns:
+                filtros = filtros & (df_alumno["PER_MATRICULA"] == per_matricula)
 
-            filas = self.df_features[filtros]
+            filas = df_alumno[filtros]
 
             if filas.empty:
                 print(f"WARNING - No hay datos para {cod_persona}/{cod_curso}" +
@@ -113,15 +166,10 @@ class PredictorNota:
             fila = filas.iloc[-1:].copy()
 
             # Eliminar columnas que no son features
-            cols_eliminar = ['NOTA', 'COD_PERSONA', 'COD_CURSO', 'PER_MATRICULA',
-                           'RANKING', 'CURSO', 'CONTRASENIA', 'FECHA_NACIMIENTO',
-                           'DEPARTAMENTO_PRO', 'PROVINCIA_PRO', 'DISTRITO_PRO',
-                           'DEPARTAMENTO_RES', 'PROVINCIA_RES', 'DISTRITO_RES']
-
-            X = fila.drop(columns=[c for c in cols_eliminar if c in fila.columns], errors='ignore')
+            X = fila.drop(columns=[c for c in COLS_NO_FEATURES if c in fila.columns], errors='ignore')
 
             # Clasificar (devuelve 0, 1, o 2)
-            categoria = self.modelo.predict(X)[0]
+            categoria = self.modelo_rapido.predict_df(X)[0]
 
             # Convertir categoría a nota estimada
             categoria_label = CATEGORIA_LABELS.get(categoria, "Error")
@@ -138,11 +186,17 @@ class PredictorNota:
             return "Error6"
 
 
-# Singleton
+# Singleton (thread-safe: evita cargar el modelo dos veces en paralelo)
 _predictor_instance = None
+_predictor_lock = threading.Lock()
 
 def get_predictor() -> PredictorNota:
     global _predictor_instance
     if _predictor_instance is None:
-        _predictor_instance = PredictorNota()
+        with _predictor_lock:
+            if _predictor_instance is None:
+                if settings.MODELOS_MODO == "servidor":
+                    _predictor_instance = ClienteModelos(settings.MODELOS_SOCKET)
+                else:
+                    _predictor_instance = PredictorNota()
     return _predictor_instance
@@ -4,22 +4,45 @@ Predice la nota que obtendrá un estudiante en un curso considerando
 todos los cursos de su matrícula actual.
 """
 
+import threading
+
 import pandas as pd
-import joblib
-from pathlib import Path
+
+from app.core.config import settings
+from app.ml_models.artefactos import MODELOS, cargar_modelo
+from app.ml_models.cliente_modelos import ClienteModelos
+from app.ml_models.features import DATA_PATH, get_df_features
+from app.ml_models.features_online import get_constructor_features
+from app.ml_models.inferencia import ModeloCompilado
+from app.ml_models.lotes import LoteadorPredicciones
 
 # Rutas de archivos
-MODEL_PATH = Path(__file__).parent / "modelo_produccion_x_matricula.pkl"
-DATA_PATH = Path(__file__).parent / "predictor_nota_data.csv"
-df_predicciones = pd.read_csv(DATA_PATH) # Mejora de velocidad x17
+MODEL_PATH = MODELOS["x_matricula"]
 print(f"Buscando modelo de prediccion por matricula en: {MODEL_PATH}")
 print(f"Buscando datos en: {DATA_PATH}")
 
 
+def _filas_en_linea(cod_persona, lista_cod_curso, per_matricula):
+    """Features calculadas desde la BD para cursos sin fila en el dataset."""
+    if not settings.FEATURES_ONLINE_ACTIVO or not lista_cod_curso:
+        return pd.DataFrame()
+    constructor = get_constructor_features()
+    if constructor is None:
+        return pd.DataFrame()
+    try:
+        return constructor.construir(cod_persona, lista_cod_curso, per_matricula)
+    except Exception as e:
+        print(f"Error construyendo features en línea para {cod_persona}: {e}")
+        return pd.DataFrame()
+
+
 def buscar_fila_prediccion(cod_persona, lista_cod_curso, per_matricula):
     """
     Busca las filas correspondientes a los cursos en el dataset.
-    Si no encuentra datos para el período específico, busca cualquier período disponible.
+    Si no hay fila para el período pedido, calcula las features desde la BD
+    (historial anterior a ese período; su paridad con el dataset se verifica
+    en /prediccion/debug/features-online); como último recurso usa el
+    registro más reciente del dataset para ese estudiante y curso.
 
     Args:
         cod_persona: Código del estudiante
@@ -30,34 +53,41 @@ def buscar_fila_prediccion(cod_persona, lista_cod_curso, per_matricula):
         DataFrame con las filas encontradas
     """
     try:
-        
-        lista_filas_encontradas = []
-
-        for cod_curso in lista_cod_curso:
-            # Primero intentar con el período específico
-            fila_encontrada = df_predicciones[
-                (df_predicciones["COD_PERSONA"] == cod_persona) &
-                (df_predicciones["COD_CURSO"] == cod_curso) &
-                (df_predicciones["PER_MATRICULA"] == per_matricula)
-            ]
-
-            # Si no existe, buscar cualquier período para ese estudiante y curso
-            if fila_encontrada.empty:
-                fila_encontrada = df_predicciones[
-                    (df_predicciones["COD_PERSONA"] == cod_persona) &
-                    (df_predicciones["COD_CURSO"] == cod_curso)
-                ]
-
+        df_predicciones = get_df_features()  # Mejora de velocidad x17 (cargado una sola vez)
+
+        filas_por_curso = {}
+        if df_predicciones is not None:
+            df_alumno = df_predicciones[df_predicciones["COD_PERSONA"] == cod_persona]
+            df_periodo = df_alumno[df_alumno["PER_MATRICULA"] == per_matricula]
+            for cod_curso in lista_cod_curso:
+                fila_encontrada = df_periodo[df_periodo["COD_CURSO"] == cod_curso]
                 if not fila_encontrada.empty:
-                    # Tomar el registro más reciente
-                    fila_encontrada = fila_encontrada.sort_values('PER_MATRICULA', ascending=False).head(1)
-                    print(f"INFO - Usando datos historicos de {fila_encontrada['PER_MATRICULA'].values[0]} para {cod_persona}/{cod_curso}")
-                else:
-                    print(f"WARNING - No hay datos para {cod_persona}/{cod_curso}")
-
+                    filas_por_curso[cod_curso] = fila_encontrada
+        else:
+            df_alumno = None
+
+        # Período nuevo: features en línea desde la BD
+        faltantes = [c for c in lista_cod_curso if c not in filas_por_curso]
+        df_en_linea = _filas_en_linea(cod_persona, faltantes, per_matricula)
+        if not df_en_linea.empty:
+            for cod_curso, fila in df_en_linea.groupby("COD_CURSO", sort=False):
+                filas_por_curso[cod_curso] = fila
+
+        # Último recurso: registro más reciente del dataset
+        for cod_curso in lista_cod_curso:
+            if cod_curso in filas_por_curso:
+                continue
+            fila_encontrada = pd.DataFrame()
+            if df_alumno is not None:
+                fila_encontrada = df_alumno[df_alumno["COD_CURSO"] == cod_curso]
             if not fila_encontrada.empty:
-                lista_filas_encontradas.append(fila_encontrada)
+                fila_encontrada = fila_encontrada.sort_values('PER_MATRICULA', ascending=False).head(1)
+                print(f"INFO - Usando datos historicos de {fila_encontrada['PER_MATRICULA'].values[0]} para {cod_persona}/{cod_curso}")
+                filas_por_curso[cod_curso] = fila_encontrada
+            else:
+                print(f"WARNING - No hay datos para {cod_persona}/{cod_curso}")
 
+        lista_filas_encontradas = [filas_por_curso[c] for c in lista_cod_curso if c in filas_por_curso]
         if not lista_filas_encontradas:
             return pd.DataFrame()
 
@@ -68,6 +98,10 @@ def buscar_fila_prediccion(cod_persona, lista_cod_curso, per_matricula):
         return pd.DataFrame()
 
 
+# Prefijos de las columnas de carga que añade generar_columns
+PREFIJOS_CARGA = ("N_CURSOS_ACTUAL", "N_CREDITOS_ACTUAL", "N_FAMILIA_", "N_CLUSTER_")
+
+
 def generar_columns(df):
     """
     Añade columnas que describen la carga total del semestre.
@@ -116,13 +150,24 @@ class PredictorNotaMatricula:
 
     def __init__(self):
         """Cargar el modelo de predicción por matrícula"""
-        self.modelo = None
-        try:
-            self.modelo = joblib.load(MODEL_PATH)
-            print(f"OK - Modelo de prediccion por matricula cargado exitosamente")
-        except Exception as e:
-            print(f"Error al cargar modelo de prediccion por matricula: {e}")
-            self.modelo = None
+        # Artefacto empaquetado (mmap) o, si no hay, el .pkl original
+        self.modelo = cargar_modelo("x_matricula")
+
+        # Resolver columnas y preprocesamiento una sola vez
+        self.modelo_rapido = ModeloCompilado(self.modelo)
+        columnas = self.modelo_rapido.columnas or []
+        self.usa_carga = not self.modelo_rapido.compilado or any(
+            c.startswith(PREFIJOS_CARGA) for c in columnas
+        )
+
+        # Agrupar predicciones concurrentes en un solo predict
+        self.lote = None
+        if settings.PREDICCION_LOTES_ACTIVO and self.modelo_rapido.compilado:
+            self.lote = LoteadorPredicciones(
+                self.modelo_rapido,
+                max_espera_ms=settings.PREDICCION_LOTES_MAX_ESPERA_MS,
+                max_filas=settings.PREDICCION_LOTES_MAX_FILAS,
+            )
 
     def predecir_notas(self, cod_persona: int, lista_cod_curso: list[str], per_matricula: str) -> list[tuple[str, float]]:
         """
@@ -148,14 +193,15 @@ class PredictorNotaMatricula:
                 print("No se encontraron filas para realizar predicciones.")
                 return [(cod, 14.0) for cod in lista_cod_curso]
 
-            # Generar features de carga
-            x = generar_columns(x)
+            # Generar features de carga (solo si el modelo las consume)
+            if self.usa_carga:
+                x = generar_columns(x)
 
-            # Preparar datos para predicción
-            X_pred = x.drop(columns=['NOTA'], errors='ignore')
-
-            # Predecir en lote
-            predicciones = self.modelo.predict(X_pred)
+            # Predecir en lote sobre la matriz float32 ya ordenada
+            if self.lote is not None:
+                predicciones = self.lote.predecir(self.modelo_rapido.llenar_matriz(x))
+            else:
+                predicciones = self.modelo_rapido.predict_df(x.drop(columns=['NOTA'], errors='ignore'))
 
             # Asociar predicciones con cursos
             cod_cursos_predichos = x['COD_CURSO'].values
@@ -176,11 +222,17 @@ class PredictorNotaMatricula:
             return [(cod, 14.0) for cod in lista_cod_curso]
 
 
-# Singleton
+# Singleton (thread-safe: evita cargar el modelo dos veces en paralelo)
 _predictor_matricula_instance = None
+_predictor_matricula_lock = threading.Lock()
 
 def get_predictor_matricula() -> PredictorNotaMatricula:
     global _predictor_matricula_instance
     if _predictor_matricula_instance is None:
-        _predictor_matricula_instance = PredictorNotaMatricula()
+        with _predictor_matricula_lock:
+            if _predictor_matricula_instance is None:
+                if settings.MODELOS_MODO == "servidor":
+                    _predictor_matricula_instance = ClienteModelos(settings.MODELOS_SOCKET)
+                else:
+                    _predictor_matricula_instance = PredictorNotaMatricula()
     return _predictor_matricula_instance
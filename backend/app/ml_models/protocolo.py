@@ -0,0 +1,191 @@
+"""
+Protocolo binario entre los workers y el servidor de modelos.
+
+Cada mensaje es un frame ``!BI`` (operación/estado, largo del payload) seguido
+del payload. Los strings van como ``!H`` (largo) + bytes UTF-8.
+
+Operaciones:
+- PING:            payload vacío -> respuesta vacía
+- PREDECIR_NOTAS:  ``!q`` cod_persona, str per_matricula, ``!H`` n, n x str cod_curso
+                   -> ``!H`` n, n x (str cod_curso, ``!d`` nota)
+- CLASIFICAR:      str cod_persona, str cod_curso, str per_matricula ("" = None),
+                   ``!d`` promedio_acumulado (NaN = sin historial)
+                   -> str categoria
+- CLASIFICAR_LOTE: str cod_persona, str per_matricula ("" = None),
+                   ``!d`` promedio_acumulado, ``!H`` n, n x str cod_curso
+                   -> ``!H`` n, n x (str cod_curso, str categoria)
+
+Estados de respuesta: OK (0) o ERROR (1, payload = mensaje UTF-8).
+"""
+
+import socket
+import struct
+from typing import Dict, List, Optional, Tuple
+
+OP_PING = 1
+OP_PREDECIR_NOTAS = 2
+OP_CLASIFICAR = 3
+OP_CLASIFICAR_LOTE = 4
+
+ESTADO_OK = 0
+ESTADO_ERROR = 1
+
+_CABECERA = struct.Struct("!BI")
+_STR_LARGO = struct.Struct("!H")
+_INT64 = struct.Struct("!q")
+_FLOAT64 = struct.Struct("!d")
+
+
+class ProtocoloError(Exception):
+    """Error de comunicación con el servidor de modelos"""
+
+
+# ----------------------------------------------------------------------
+# Frames
+# ----------------------------------------------------------------------
+def enviar_frame(sock: socket.socket, codigo: int, payload: bytes = b"") -> None:
+    sock.sendall(_CABECERA.pack(codigo, len(payload)) + payload)
+
+
+def _leer_exacto(sock: socket.socket, n: int) -> bytes:
+    partes = []
+    while n > 0:
+        chunk = sock.recv(n)
+        if not chunk:
+            raise ProtocoloError("Conexión cerrada por el otro extremo")
+        partes.append(chunk)
+        n -= len(chunk)
+    return b"".join(partes)
+
+
+def recibir_frame(sock: socket.socket) -> Tuple[int, bytes]:
+    codigo, largo = _CABECERA.unpack(_leer_exacto(sock, _CABECERA.size))
+    payload = _leer_exacto(sock, largo) if largo else b""
+    return codigo, payload
+
+
+# ----------------------------------------------------------------------
+# Codificación de campos
+# ----------------------------------------------------------------------
+def pack_str(valor: str) -> bytes:
+    datos = valor.encode("utf-8")
+    return _STR_LARGO.pack(len(datos)) + datos
+
+
+def unpack_str(buf: bytes, off: int) -> Tuple[str, int]:
+    (largo,) = _STR_LARGO.unpack_from(buf, off)
+    off += _STR_LARGO.size
+    return buf[off:off + largo].decode("utf-8"), off + largo
+
+
+def pack_predecir_notas(cod_persona: int, lista_cod_curso: List[str], per_matricula: str) -> bytes:
+    partes = [_INT64.pack(int(cod_persona)), pack_str(per_matricula), _STR_LARGO.pack(len(lista_cod_curso))]
+    partes.extend(pack_str(c) for c in lista_cod_curso)
+    return b"".join(partes)
+
+
+def unpack_predecir_notas(buf: bytes) -> Tuple[int, List[str], str]:
+    (cod_persona,) = _INT64.unpack_from(buf, 0)
+    per_matricula, off = unpack_str(buf, _INT64.size)
+    (n,) = _STR_LARGO.unpack_from(buf, off)
+    off += _STR_LARGO.size
+    cursos = []
+    for _ in range(n):
+        cod, off = unpack_str(buf, off)
+        cursos.append(cod)
+    return cod_persona, cursos, per_matricula
+
+
+def pack_notas(notas: List[Tuple[str, float]]) -> bytes:
+    partes = [_STR_LARGO.pack(len(notas))]
+    for cod, nota in notas:
+        partes.append(pack_str(str(cod)))
+        partes.append(_FLOAT64.pack(float(nota)))
+    return b"".join(partes)
+
+
+def unpack_notas(buf: bytes) -> List[Tuple[str, float]]:
+    (n,) = _STR_LARGO.unpack_from(buf, 0)
+    off = _STR_LARGO.size
+    notas = []
+    for _ in range(n):
+        cod, off = unpack_str(buf, off)
+        (nota,) = _FLOAT64.unpack_from(buf, off)
+        off += _FLOAT64.size
+        notas.append((cod, nota))
+    return notas
+
+
+def pack_clasificar(cod_persona: str, cod_curso: str, per_matricula: Optional[str],
+                    promedio_acumulado: Optional[float]) -> bytes:
+    promedio = float("nan") if promedio_acumulado is None else float(promedio_acumulado)
+    return (
+        pack_str(str(cod_persona))
+        + pack_str(cod_curso)
+        + pack_str(per_matricula or "")
+        + _FLOAT64.pack(promedio)
+    )
+
+
+def unpack_clasificar(buf: bytes) -> Tuple[str, str, Optional[str], Optional[float]]:
+    cod_persona, off = unpack_str(buf, 0)
+    cod_curso, off = unpack_str(buf, off)
+    per_matricula, off = unpack_str(buf, off)
+    (promedio,) = _FLOAT64.unpack_from(buf, off)
+    return (
+        cod_persona,
+        cod_curso,
+        per_matricula or None,
+        None if promedio != promedio else promedio,
+    )
+
+
+def pack_clasificar_lote(cod_persona: str, lista_cod_curso: List[str], per_matricula: Optional[str],
+                         promedio_acumulado: Optional[float]) -> bytes:
+    promedio = float("nan") if promedio_acumulado is None else float(promedio_acumulado)
+    partes = [
+        pack_str(str(cod_persona)),
+        pack_str(per_matricula or ""),
+        _FLOAT64.pack(promedio),
+        _STR_LARGO.pack(len(lista_cod_curso)),
+    ]
+    partes.extend(pack_str(c) for c in lista_cod_curso)
+    return b"".join(partes)
+
+
+def unpack_clasificar_lote(buf: bytes) -> Tuple[str, List[str], Optional[str], Optional[float]]:
+    cod_persona, off = unpack_str(buf, 0)
+    per_matricula, off = unpack_str(buf, off)
+    (promedio,) = _FLOAT64.unpack_from(buf, off)
+    off += _FLOAT64.size
+    (n,) = _STR_LARGO.unpack_from(buf, off)
+    off += _STR_LARGO.size
+    cursos = []
+    for _ in range(n):
+        cod, off = unpack_str(buf, off)
+        cursos.append(cod)
+    return (
+        cod_persona,
+        cursos,
+        per_matricula or None,
+        None if promedio != promedio else promedio,
+    )
+
+
+def pack_categorias(categorias: Dict[str, str]) -> bytes:
+    partes = [_STR_LARGO.pack(len(categorias))]
+    for cod, categoria in categorias.items():
+        partes.append(pack_str(str(cod)))
+        partes.append(pack_str(str(categoria)))
+    return b"".join(partes)
+
+
+def unpack_categorias(buf: bytes) -> Dict[str, str]:
+    (n,) = _STR_LARGO.unpack_from(buf, 0)
+    off = _STR_LARGO.size
+    categorias = {}
+    for _ in range(n):
+        cod, off = unpack_str(buf, off)
+        categoria, off = unpack_str(buf, off)
+        categorias[cod] = categoria
+    return categorias
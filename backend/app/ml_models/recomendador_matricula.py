@@ -4,8 +4,10 @@ Evalúa diferentes combinaciones de cursos y recomienda la mejor opción.
 """
 import pandas as pd
 import ast
+import threading
 import numpy as np
 from pathlib import Path
+from app.core.estado import medir_carga
 from app.ml_models.predictor_nota_x_matricula import get_predictor_matricula
 
 # Rutas de archivos
@@ -95,7 +97,21 @@ def build_comprehensive_db(csv_info_path, csv_prereqs_path, csv_graph_path):
 
 
 
-DB = build_comprehensive_db(str(CSV_INFO_PATH), str(CSV_PREREQS_PATH), str(CSV_GRAPH_PATH))
+# Catálogo de cursos (singleton thread-safe, se construye una sola vez)
+_catalogo_cursos = None
+_catalogo_lock = threading.Lock()
+
+
+def get_catalogo_cursos() -> dict:
+    global _catalogo_cursos
+    if _catalogo_cursos is None:
+        with _catalogo_lock:
+            if _catalogo_cursos is None:
+                with medir_carga("catalogo_cursos"):
+                    _catalogo_cursos = build_comprehensive_db(
+                        str(CSV_INFO_PATH), str(CSV_PREREQS_PATH), str(CSV_GRAPH_PATH)
+                    )
+    return _catalogo_cursos
 
 
 
@@ -341,7 +357,7 @@ def ranking_cursos(cod_persona: int, per_matricula: str, cursos: list[str]) -> l
     familia_map = {'CS': 1.0, 'MA': 0.5, 'FG': 0.1, 'ET': 0.3, 'ID': 0.3, 'CB': 0.2}
 
     # Cargar DB
-    
+    DB = get_catalogo_cursos()
 
     if not DB:
         print("Error: No se pudo cargar la base de datos de cursos. Retornando lista original.")
@@ -427,6 +443,7 @@ def sistema_recomendacion(cod_persona: int, per_matricula: str, list_of_bundles:
 
     familia_map = {'CS': 1.0, 'MA': 0.5, 'FG': 0.1, 'ET': 0.3, 'ID': 0.3, 'CB': 0.2}
 
+    DB = get_catalogo_cursos()
     if not DB:
         return {
             "meta": {
@@ -558,6 +575,7 @@ def calcular_score_bundle(cod_persona: int, per_matricula: str, bundle: list) ->
     # --- 2. CARGA DE DATOS ---
     # NOTA: Si vas a llamar a esta función muchas veces en un bucle,
     # es recomendable sacar la carga de la DB fuera de esta función.
+    DB = get_catalogo_cursos()
 
     if not DB:
         # Retornamos un valor muy bajo para indicar error o fallo crítico
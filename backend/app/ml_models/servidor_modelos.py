@@ -0,0 +1,137 @@
+"""
+Servidor local de modelos para despliegues con varios workers.
+
+Con N workers de uvicorn cada proceso cargaría su propia copia de los pickles
+y del dataset de features. Este proceso es el único dueño de los modelos y
+responde predicciones por un socket Unix con el protocolo de
+``app.ml_models.protocolo``. Los workers usan ``ClienteModelos``.
+
+Uso:
+    python -m app.ml_models.servidor_modelos --socket /tmp/unitrack-modelos.sock
+"""
+
+import argparse
+import os
+import signal
+import socket
+import socketserver
+import sys
+
+from app.core.config import settings
+from app.ml_models import protocolo
+
+
+class _ManejadorModelos(socketserver.BaseRequestHandler):
+    """Atiende una conexión persistente: un frame de solicitud -> un frame de respuesta."""
+
+    def handle(self):
+        sock = self.request
+        while True:
+            try:
+                op, payload = protocolo.recibir_frame(sock)
+            except (protocolo.ProtocoloError, ConnectionError, OSError):
+                return
+
+            try:
+                respuesta = self.server.despachar(op, payload)
+                protocolo.enviar_frame(sock, protocolo.ESTADO_OK, respuesta)
+            except Exception as e:
+                try:
+                    protocolo.enviar_frame(sock, protocolo.ESTADO_ERROR, str(e).encode("utf-8"))
+                except OSError:
+                    return
+
+
+class ServidorModelos(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Servidor con un hilo por conexión.
+
+    Las predicciones concurrentes de distintas conexiones se agrupan en el
+    LoteadorPredicciones del predictor por matrícula.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128  # varios workers conectándose a la vez
+
+    def __init__(self, ruta_socket: str):
+        _limpiar_socket_obsoleto(ruta_socket)
+        super().__init__(ruta_socket, _ManejadorModelos)
+        os.chmod(ruta_socket, 0o660)
+
+        # Este proceso es el dueño de los modelos: siempre cargarlos en proceso
+        settings.MODELOS_MODO = "local"
+
+        from app.services.precarga import precargar_recursos
+        from app.ml_models.predictor_nota import get_predictor
+        from app.ml_models.predictor_nota_x_matricula import get_predictor_matricula
+
+        precargar_recursos()
+        self.predictor_matricula = get_predictor_matricula()
+        self.predictor = get_predictor()
+
+    def despachar(self, op: int, payload: bytes) -> bytes:
+        if op == protocolo.OP_PING:
+            return b""
+
+        if op == protocolo.OP_PREDECIR_NOTAS:
+            cod_persona, cursos, per_matricula = protocolo.unpack_predecir_notas(payload)
+            notas = self.predictor_matricula.predecir_notas(cod_persona, cursos, per_matricula)
+            return protocolo.pack_notas(notas)
+
+        if op == protocolo.OP_CLASIFICAR:
+            cod_persona, cod_curso, per_matricula, promedio = protocolo.unpack_clasificar(payload)
+            historial = {"promedio_acumulado": promedio} if promedio is not None else None
+            categoria = self.predictor.predecir_nota(
+                cod_persona, cod_curso, per_matricula=per_matricula, historial_academico=historial
+            )
+            if isinstance(categoria, tuple):
+                categoria = categoria[-1]
+            return protocolo.pack_str(str(categoria))
+
+        if op == protocolo.OP_CLASIFICAR_LOTE:
+            cod_persona, cursos, per_matricula, promedio = protocolo.unpack_clasificar_lote(payload)
+            historial = {"promedio_acumulado": promedio} if promedio is not None else None
+            categorias = self.predictor.predecir_notas_lote(
+                cod_persona, cursos, per_matricula=per_matricula, historial_academico=historial
+            )
+            return protocolo.pack_categorias(categorias)
+
+        raise ValueError(f"Operación desconocida: {op}")
+
+
+def _limpiar_socket_obsoleto(ruta_socket: str) -> None:
+    """Eliminar un socket que quedó de una ejecución anterior (nadie escuchando)."""
+    if not os.path.exists(ruta_socket):
+        return
+    prueba = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        prueba.connect(ruta_socket)
+    except OSError:
+        os.unlink(ruta_socket)
+    else:
+        raise RuntimeError(f"Ya hay un servidor de modelos escuchando en {ruta_socket}")
+    finally:
+        prueba.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Servidor local de modelos de UniTrack")
+    parser.add_argument("--socket", default=settings.MODELOS_SOCKET, help="Ruta del socket Unix")
+    args = parser.parse_args()
+
+    # SIGTERM (docker stop / orquestador) -> salir limpiando el socket
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    servidor = ServidorModelos(args.socket)
+    print(f"OK - Servidor de modelos escuchando en {args.socket}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        if os.path.exists(args.socket):
+            os.unlink(args.socket)
+
+
+if __name__ == "__main__":
+    main()
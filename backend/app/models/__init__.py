@@ -1,6 +1,7 @@
 from app.models.alumno import Alumno
 from app.models.curso import Curso
 from app.models.matricula import Matricula
-from app.models.seccion import Seccion
+from app.models.seccion import Seccion, SeccionBloque
+from app.models.resumen import AlumnoResumen
 
-__all__ = ["Alumno", "Curso", "Matricula", "Seccion"]
+__all__ = ["Alumno", "Curso", "Matricula", "Seccion", "SeccionBloque", "AlumnoResumen"]
@@ -3,9 +3,14 @@ Modelo ORM para la tabla Curso
 Tabla estática (desde la creación de la malla curricular)
 """
 
-from sqlalchemy import Column, String, Integer
+from sqlalchemy import Column, String, Integer, JSON, Text
+from sqlalchemy.dialects.postgresql import ARRAY
 from app.db.database import Base
 
+# Lista de textos: ARRAY nativo en PostgreSQL, JSON en SQLite y el resto.
+# El importador de CSV convierte una sola vez "['CALCULO I', ...]" a lista.
+ListaTexto = JSON().with_variant(ARRAY(Text), "postgresql")
+
 
 class Curso(Base):
     """
@@ -27,10 +32,10 @@ class Curso(Base):
     tipo = Column(String(3), nullable=False) # O -> obligatorio, EH -> electivo humanidades, EP -> electivo de carrera
     
     horas = Column(Integer, nullable=True)  # Horas semanales
-    # opción simple: almacenar la lista como texto separador por comas
-    prerequisito = Column(String(200), nullable=True)  # guarda "CALCULO I,MATEMATICA II"
-    prerequisito_cod = Column(String(200), nullable=True)  # guarda "MA101,MA102"
-    resources = Column(String(1000), nullable=True)  # recursos adicionales (URL u otros)
+    # Listas ya parseadas (ver ListaTexto)
+    prerequisito = Column(ListaTexto, nullable=True)  # ["CALCULO I", "MATEMATICA II"]
+    prerequisito_cod = Column(ListaTexto, nullable=True)  # ["MA101", "MA102"]
+    resources = Column(ListaTexto, nullable=True)  # recursos adicionales (libros, URL u otros)
     descripcion = Column(String(1000), nullable=True)  # descripción del curso
     
     def __repr__(self):
@@ -3,7 +3,7 @@ Modelo ORM para la tabla Matricula
 Tabla dinámica (registro histórico de matrícula)
 """
 
-from sqlalchemy import Column, String, Float, Integer, ForeignKey
+from sqlalchemy import Column, String, Float, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -14,12 +14,22 @@ class Matricula(Base):
     Almacena el registro histórico de matrículas de estudiantes en cursos
     """
     __tablename__ = "matricula"
+    __table_args__ = (
+        # Historial de un alumno agrupado por período (login, resúmenes, features).
+        # En PostgreSQL cubre las columnas leídas para permitir index-only scans.
+        Index(
+            "ix_matricula_persona_periodo",
+            "cod_persona",
+            "per_matricula",
+            postgresql_include=["cod_curso", "nota", "hrs_inasistencia"],
+        ),
+    )
 
     # columns: COD_PERSONA,COD_CURSO,PER_MATRICULA,NOTA,HRS_INASISTENCIA
     # ejemplo de tuplas: 33277,MA100,2017-01,20.0,0
 
     # Primary Key compuesta
-    cod_persona = Column(String(10), ForeignKey("alumno.cod_persona"), primary_key=True, index=True, nullable=False)
+    cod_persona = Column(String(10), ForeignKey("alumno.cod_persona"), primary_key=True, nullable=False)
     cod_curso = Column(String(10), ForeignKey("curso.cod_curso"), primary_key=True, index=True, nullable=False)
     per_matricula = Column(String(7), primary_key=True, index=True, nullable=False)  # Formato: AAAA-MM
     nota = Column(Float, nullable=True)  # Nota final del curso
@@ -0,0 +1,34 @@
+"""
+Modelo ORM para la tabla de resumen académico
+Tabla derivada de matricula JOIN curso (se reconstruye con app.db.resumen)
+"""
+
+from sqlalchemy import Column, String, Float, Integer
+from app.db.database import Base
+
+
+class AlumnoResumen(Base):
+    """
+    Resumen del historial completo de un alumno
+    Una fila por (cod_persona, nota_aprobatoria): cada ruta lee la fila de la
+    nota mínima que usa (11 en /prediccion, 11.5 en login y elegibilidad)
+    """
+    __tablename__ = "alumno_resumen"
+
+    # Primary Key compuesta
+    cod_persona = Column(String(10), primary_key=True, index=True, nullable=False)
+    nota_aprobatoria = Column(Float, primary_key=True, nullable=False)
+
+    total_cursos = Column(Integer, nullable=False)
+    semestres_cursados = Column(Integer, nullable=False)
+    cursos_aprobados = Column(Integer, nullable=False)  # nota >= nota_aprobatoria
+    cursos_reprobados = Column(Integer, nullable=False)
+    creditos_cursados = Column(Integer, nullable=False)
+    creditos_aprobados = Column(Integer, nullable=False)
+    creditos_con_nota = Column(Integer, nullable=False)
+    suma_centesimas = Column(Integer, nullable=False)  # Suma de nota*100*créditos (promedio exacto)
+    promedio_general = Column(Float, nullable=True)  # Ponderado por créditos
+    promedio_aprobados = Column(Float, nullable=True)  # Promedio simple de notas aprobadas
+
+    def __repr__(self):
+        return f"<AlumnoResumen(estudiante='{self.cod_persona}', nota_aprobatoria={self.nota_aprobatoria})>"
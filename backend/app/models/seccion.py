@@ -3,7 +3,7 @@ Modelo ORM para la tabla Curso
 Tabla estática (desde la creación de la malla curricular)
 """
 
-from sqlalchemy import Column, String, Integer
+from sqlalchemy import Column, String, Integer, Index, UniqueConstraint
 from app.db.database import Base
 
 
@@ -28,3 +28,36 @@ class Seccion(Base):
     
     def __repr__(self):
         return f"<Seccion(cod_curso='{self.cod_curso}', nombre='{self.curso}')>"
+
+
+class SeccionBloque(Base):
+    """
+    Modelo de SeccionBloque
+    Una fila por sesión semanal de una sección (horarios de Seccion normalizado).
+    Se reconstruye al importar seccion (app.db.bloques); las horas se guardan
+    en minutos desde las 00:00 para comparar rangos como enteros.
+    """
+    __tablename__ = "seccion_bloque"
+    __table_args__ = (
+        UniqueConstraint("cod_curso", "seccion_key", "orden", name="uq_seccion_bloque_sesion"),
+        # Búsqueda de bloques que chocan con una ventana (dia, rango)
+        Index("ix_seccion_bloque_dia_rango", "dia", "inicio_min", "fin_min"),
+    )
+
+    # Orden de inserción: conserva el orden de las secciones en la tabla seccion
+    id = Column(Integer, primary_key=True, autoincrement=True)
+
+    cod_curso = Column(String, nullable=False)
+    seccion_key = Column(String, nullable=False)
+    orden = Column(Integer, nullable=False)  # Posición de la sesión en horarios
+
+    dia = Column(Integer, nullable=False)  # 0 = Lun ... 6 = Dom
+    inicio_min = Column(Integer, nullable=False)  # 07:00 -> 420
+    fin_min = Column(Integer, nullable=False)
+
+    grupo = Column(String, nullable=True)  # TEORÍA 1, LABORATORIO 1.01, ...
+    vacantes = Column(Integer, nullable=True)
+    matriculados = Column(Integer, nullable=True)
+
+    def __repr__(self):
+        return f"<SeccionBloque(cod_curso='{self.cod_curso}', seccion='{self.seccion_key}', dia={self.dia})>"
@@ -0,0 +1,78 @@
+"""
+Punto de entrada de producción: gunicorn con workers uvicorn y precarga
+Con PRODUCCION_PRECARGA (preload_app) gunicorn importa este módulo en el
+proceso maestro antes de crear los workers: el arranque completo
+(migraciones de Alembic, CSV, catálogo, feature store y modelos) corre una
+sola vez y los workers lo heredan por fork. Las estructuras de solo lectura se comparten entre workers
+(copy-on-write) en lugar de repetirse en cada uno.
+
+Sin precarga, cada worker importa este módulo tras el fork y repite el
+arranque (útil para comparar memoria, ver app/tests/memoria.py).
+
+Uso:
+    python -m app.produccion [opciones de gunicorn]
+    gunicorn -c gunicorn.conf.py
+"""
+
+import gc
+import sys
+from pathlib import Path
+
+from app.core import estado
+from app.core.config import settings
+from app.main import app, arrancar
+
+GUNICORN_CONF = Path(__file__).resolve().parents[1] / "gunicorn.conf.py"
+
+
+def migrar() -> bool:
+    """alembic upgrade head (MIGRACIONES_AL_INICIAR); si falla, el arranque queda "failed"."""
+    if not settings.MIGRACIONES_AL_INICIAR:
+        return True
+    from app.db.database import engine
+    from app.db.migraciones import aplicar_migraciones
+
+    try:
+        with estado.medir_etapa("migraciones"):
+            aplicar_migraciones(engine)
+    except Exception as e:
+        estado.marcar_fallido(f"Migraciones no aplicadas: {e}")
+        print(f"Error aplicando migraciones: {e}")
+        return False
+    return True
+
+
+def precargar() -> None:
+    """Arranque completo y síncrono, antes de servir (y antes del fork con precarga)."""
+    estado.registrar_etapa("app", estado.segundos_proceso() or 0.0, rss_inicio=None)
+    if migrar():
+        arrancar()
+    # Sacar los objetos precargados del GC: si el recolector los recorre en
+    # un worker, marca sus cabeceras y fuerza la copia de esas páginas
+    gc.collect()
+    gc.freeze()
+
+
+def tras_fork() -> None:
+    """En cada worker: no reutilizar las conexiones abiertas por el maestro."""
+    from app.db.database import async_engine, engine
+
+    engine.dispose(close=False)
+    if async_engine is not None:
+        async_engine.sync_engine.dispose(close=False)
+
+
+if __name__ != "__main__":
+    # Al importarlo gunicorn (el lanzador de main() no precarga por su cuenta)
+    precargar()
+
+
+def main() -> None:
+    from gunicorn.app.wsgiapp import run
+
+    sys.argv = ["gunicorn", "-c", str(GUNICORN_CONF), *sys.argv[1:]]
+    run()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,27 @@
 Endpoints de autenticación
 Login simplificado sin contraseña (solo código de estudiante)
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
+from app.core.config import settings
+from app.core.http import RespuestaJSON
+from app.db.database import get_async_db, get_db
 from app.schemas.auth import LoginRequest, LoginResponse
 from app.models.alumno import Alumno
 from app.models.curso import Curso
 from app.models.seccion import Seccion
 from app.models.matricula import Matricula
 
-from app.utils.utils import str_to_dict, str_to_list, str_to_list_simple
+from app.db.resumen import NOTA_APROBATORIA
+from app.services.cache_login import cache_login, version_datos
+from app.services.catalogo import get_catalogo
+from app.services.elegibilidad import get_motor_elegibilidad
+from app.services.historial import resumen_historial, resumen_periodos
+from app.utils.utils import str_to_dict, str_to_list
 from collections import defaultdict
 
 router = APIRouter()
@@ -21,7 +31,7 @@ router = APIRouter()
 @router.post("/login", response_model=LoginResponse)
 async def login(
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Endpoint de login simplificado
@@ -41,9 +51,9 @@ async def login(
     """
 
     # 1) Buscar alumno por código
-    alumno = db.query(Alumno).filter(
-        Alumno.cod_persona == login_data.cod_persona
-    ).first()
+    alumno = await db.scalar(
+        select(Alumno).where(Alumno.cod_persona == login_data.cod_persona).limit(1)
+    )
 
     if not alumno:
         raise HTTPException(
@@ -57,6 +67,24 @@ async def login(
             detail="Contraseña incorrecta"
         )
 
+    # Respuesta ya serializada si los datos no cambiaron desde el último login
+    if not settings.LOGIN_CACHE_ACTIVO:
+        return await db.run_sync(lambda sesion: _construir_login(alumno, login_data, sesion))
+
+    clave = (alumno.cod_persona, login_data.incluir_cursos_info)
+    # La versión puede consultar importacion_csv (una vez por TTL): fuera del loop
+    version = await run_in_threadpool(version_datos)
+    contenido = cache_login.obtener(clave, version)
+    if contenido is None:
+        respuesta = await db.run_sync(lambda sesion: _construir_login(alumno, login_data, sesion))
+        contenido = RespuestaJSON(respuesta.model_dump(mode="json")).body
+        cache_login.guardar(clave, contenido, version)
+
+    return Response(content=contenido, media_type="application/json")
+
+
+def _construir_login(alumno: Alumno, login_data: LoginRequest, db: Session) -> LoginResponse:
+    """Armar la respuesta de login de un alumno ya autenticado."""
     alumno_info = {
         "nombre": alumno.nombre,
         "apellido": alumno.apellido,
@@ -77,121 +105,65 @@ async def login(
     }
 
     
-    # 2) cursos_info: dataframe de los cursos => lista de dicts
-    cursos = db.query(Curso).all()
-    cursos_info = [
-        {
-            "cod_curso": c.cod_curso,
-            "curso": c.curso,
-            "creditos": c.creditos,
-            "familia": c.familia,
-            "nivel_curso": c.nivel_curso,
-            "tipo": c.tipo,
-            "horas": c.horas,
-            "prerequisitos": str_to_list(c.prerequisito),
-            "prerequisitos_cod": str_to_list_simple(c.prerequisito_cod),
-            "descripcion": c.descripcion,
-
-        }
-        for c in cursos
-    ]
-
-    cred_cursos = {c.cod_curso: c.creditos for c in cursos}
+    # 2) cursos_info: catálogo serializado una vez por importación
+    #    (el cliente puede omitirlo y usar /cursos/catalogo con ETag)
+    cursos_info = get_catalogo(db).cursos_info if login_data.incluir_cursos_info else None
 
 
     # 3) matricula_info: diccionario { per_matricula: [cursos llevados en este periodo] }
-
-    matriculas = db.query(Matricula).filter(
+    #    Nombre y créditos del curso vienen en el mismo JOIN (sin cargar la malla completa)
+    matriculas = db.query(
+        Matricula.per_matricula,
+        Matricula.cod_curso,
+        Matricula.nota,
+        Matricula.hrs_inasistencia,
+        Curso.curso,
+        Curso.creditos,
+    ).outerjoin(
+        Curso, Curso.cod_curso == Matricula.cod_curso
+    ).filter(
         Matricula.cod_persona == login_data.cod_persona
     ).all()
 
-    # Mapear cod_curso -> nombre de curso para enriquecer la salida (evita consultas N+1)
-    curso_nombres = {c.cod_curso: c.curso for c in cursos}
-
     matricula_dict = defaultdict(lambda: {"cursos": []})
 
     for m in matriculas:
         matricula_dict[m.per_matricula]["cursos"].append({
             "cod_curso": m.cod_curso,
-            "curso": curso_nombres.get(m.cod_curso),
-            "creditos": cred_cursos.get(m.cod_curso),
+            "curso": m.curso,
+            "creditos": m.creditos,
             "nota": m.nota,
             "hrs_inasistencia": m.hrs_inasistencia
         })
-    
-    for per in matricula_dict.keys():
-        matricula_dict[per]["cant_creditos"] = sum(
-            cred_cursos.get(m["cod_curso"], 0) for m in matricula_dict[per]["cursos"]
-        )
-        matricula_dict[per]["cursos_aprobados"] = sum(
-            1 for m in matricula_dict[per]["cursos"] if m["nota"] is not None and round(m["nota"]) >= 12
-        )
-        matricula_dict[per]["promedio_periodo"] = round(
-            sum(m["nota"]*cred_cursos.get(m["cod_curso"], 0) for m in matricula_dict[per]["cursos"] if m["nota"] is not None) /
-            sum(cred_cursos.get(m["cod_curso"], 0) for m in matricula_dict[per]["cursos"] if m["nota"] is not None), 2
-        ) if any(m["nota"] is not None for m in matricula_dict[per]["cursos"]) else None
 
-        
+    # Totales por período: GROUP BY per_matricula (promedio redondeado en SQL)
+    periodos = resumen_periodos(db, login_data.cod_persona)
 
+    for per, resumen_per in periodos.items():
+        matricula_dict[per]["cant_creditos"] = resumen_per["creditos"]
+        matricula_dict[per]["cursos_aprobados"] = resumen_per["cursos_aprobados"]
+        matricula_dict[per]["promedio_periodo"] = resumen_per["promedio_periodo"]
 
     matricula_info = dict(matricula_dict)
 
+    # Totales del historial: una búsqueda por clave en alumno_resumen
+    resumen = resumen_historial(db, login_data.cod_persona)
     academic_info = {
-        "total_cursos": len(matriculas),
-        "cursos_aprobados": sum(1 for m in matriculas if m.nota is not None and round(m.nota) >= 12),
-        "cursos_reprobados": sum(1 for m in matriculas if m.nota is not None and round(m.nota) < 12),
-        "creditos_aprobados": sum(
-            cred_cursos.get(m.cod_curso, 0) for m in matriculas if m.nota is not None and round(m.nota) >= 12
-        ),
-        "promedio_general": round(
-            sum(m.nota*cred_cursos.get(m.cod_curso, 0) for m in matriculas if m.nota is not None) /
-            sum(cred_cursos.get(m.cod_curso, 0) for m in matriculas if m.nota is not None), 2
-        ) if any(m.nota is not None for m in matriculas) else None
+        "total_cursos": resumen["total_matriculas"],
+        "cursos_aprobados": resumen["cursos_aprobados"],
+        "cursos_reprobados": resumen["cursos_reprobados"],
+        "creditos_aprobados": resumen["creditos_aprobados"],
+        "promedio_general": resumen["promedio_ponderado_redondeado"]
     }
 
 
     # 4) cursos disponibles (cursos cuyas prerequisitos se cumplen y que NO ha llevado)
-
     cursos_aprobados = [
-        m.cod_curso for m in matriculas if m.nota is not None and m.nota >= 11.5
+        m.cod_curso for m in matriculas if m.nota is not None and m.nota >= NOTA_APROBATORIA
     ]
-
-    # Cursos que ya llevó (aprobados o no)
-    cursos_llevados = [
-        m.cod_curso for m in matriculas if m.nota is not None and m.nota >= 11.5
-    ]
-
-
-    cursos_disponibles = []
-    for i in cursos:
-        # Saltar si ya llevó el curso
-        if i.cod_curso in cursos_llevados:
-            continue
-
-        prereqs = str_to_list_simple(i.prerequisito_cod)
-        abierto = True
-        for pr in prereqs:
-            if pr == "300IN" or pr == "400IN":
-                continue  # requisitos especiales que siempre se cumplen
-            elif pr == "100CR":
-                if academic_info["creditos_aprobados"] < 100:
-                    abierto = False
-                    break
-            elif pr not in cursos_aprobados:
-                abierto = False
-                break
-        if abierto:
-            cursos_disponibles.append(i.cod_curso)
-
-            
-    # si lleve algun curso que tiene como prerequisito a otro curso, entonces ya cumplo ese prerequisito
-    
-    for c in cursos:
-        if c.cod_curso in cursos_llevados:
-            prereqs = str_to_list_simple(c.prerequisito_cod)
-            for pre in prereqs:
-                if pre in cursos_disponibles:
-                    cursos_disponibles.remove(pre)
+    motor = get_motor_elegibilidad(db)
+    cursos_disponibles = motor.cursos_disponibles(cursos_aprobados, academic_info["creditos_aprobados"])
+    set_disponibles = set(cursos_disponibles)
 
     print(f"Cursos disponibles para el alumno {alumno.cod_persona}: {len(cursos_disponibles)}")
 
@@ -203,7 +175,7 @@ async def login(
     secciones_info = {}
 
     for s in secciones:
-        if s.cod_curso not in cursos_disponibles:
+        if s.cod_curso not in set_disponibles:
             continue
         if s.cod_curso not in secciones_info:
             secciones_info[s.cod_curso] = {
@@ -212,13 +184,14 @@ async def login(
             }
         secciones_info[s.cod_curso]["horarios"][s.seccion_key] = [str_to_dict(i) for i in str_to_list(s.horarios)]
     # 6) resources_info: diccionario { cod_curso: [resources] }
-
-    resources_info = {}
-
-    for c in cursos:
-        if c.cod_curso not in cursos_disponibles:
-            continue
-        resources_info[c.cod_curso] = str_to_list(c.resources)
+    recursos_cursos = dict(
+        db.query(Curso.cod_curso, Curso.resources).filter(
+            Curso.cod_curso.in_(cursos_disponibles)
+        ).all()
+    )
+    resources_info = {
+        cod: recursos_cursos.get(cod) or [] for cod in cursos_disponibles
+    }
 
     return LoginResponse(
         success=True,
@@ -238,3 +211,9 @@ async def login(
         resources_info=resources_info,
         secciones_info=secciones_info
     )
+
+
+@router.get("/debug/serializacion")
+async def debug_serializacion(cod_persona: str = None, db: Session = Depends(get_db)):
+    from app.tests.serializacion import run_benchmark_serializacion
+    return await run_benchmark_serializacion(db, cod_persona)
@@ -0,0 +1,44 @@
+"""
+Endpoints del catálogo de cursos
+El catálogo se sirve desde bytes pre-serializados con ETag fuerte, así los
+clientes lo descargan una vez y luego solo revalidan (304).
+"""
+
+from fastapi import APIRouter, Depends, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.database import get_db
+from app.services.catalogo import get_catalogo
+
+router = APIRouter()
+
+
+def _etag_coincide(if_none_match: str | None, etag: str) -> bool:
+    """Comparación débil (RFC 9110): la compresión convierte el ETag en W/"..."."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (e.strip().removeprefix("W/") for e in if_none_match.split(","))
+
+
+@router.get("/catalogo")
+async def get_catalogo_cursos(request: Request, db: Session = Depends(get_db)):
+    """
+    Catálogo completo de cursos (mismo formato que cursos_info del login)
+
+    Returns:
+        Lista de cursos en JSON; 304 si el cliente ya tiene la versión vigente
+    """
+    catalogo = await run_in_threadpool(get_catalogo, db)
+    headers = {
+        "ETag": catalogo.etag,
+        "Cache-Control": f"public, max-age={settings.CATALOGO_CACHE_MAX_AGE}, must-revalidate",
+    }
+
+    if _etag_coincide(request.headers.get("if-none-match"), catalogo.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=catalogo.contenido, media_type="application/json", headers=headers)
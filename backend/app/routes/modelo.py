@@ -6,7 +6,7 @@ Utiliza modelos predictivos para estimar notas de estudiantes
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from app.services.modelo import verificar_cursos_alumno
+from app.services.modelo import cursos_no_disponibles
 from app.schemas.modelo import NotasRequest, NotasResponse, MatriculaRequest, MatriculaResponse
 
 from app.db.database import get_db
@@ -96,12 +96,12 @@ async def create_curso(
     # Veficcar si los cursos pueden ser llevados por el alumno
     cod_alumno = matricula_request.cod_alumno
     cod_cursos = matricula_request.cod_cursos
-    for i in cod_cursos:
-        if not verificar_cursos_alumno(cod_alumno, cod_cursos, db):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"El curso con código {i} no puede ser llevado por el alumno {cod_alumno}"
-            )
+    no_disponibles = cursos_no_disponibles(cod_alumno, cod_cursos, db)
+    if no_disponibles:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"El curso con código {', '.join(no_disponibles)} no puede ser llevado por el alumno {cod_alumno}"
+        )
     notas = []
 
     for i in cod_cursos:
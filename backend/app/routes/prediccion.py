@@ -3,32 +3,24 @@ Endpoints para predicción de notas usando ML
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from typing import Optional
 import sys
 from pathlib import Path
 
-from app.db.database import get_db
+from app.db.database import get_async_db
+from app.db.resumen import NOTA_APROBATORIA_PREDICCION
 from app.models.alumno import Alumno
 from app.models.curso import Curso
-from app.models.matricula import Matricula
-
-try:
-    from app.ml_models.predictor_nota import get_predictor
-    PREDICTOR_AVAILABLE = True
-    print("Modelo ML cargado exitosamente")
-except ImportError as e:
-    print(f"Warning: No se pudo cargar el predictor de notas: {e}")
-    PREDICTOR_AVAILABLE = False
-
-try:
-    from app.ml_models.predictor_nota_x_matricula import get_predictor_matricula
-    PREDICTOR_MATRICULA_AVAILABLE = True
-    print("Modelo de prediccion por matricula cargado")
-except ImportError as e:
-    print(f"Warning: No se pudo cargar el predictor por matricula: {e}")
-    PREDICTOR_MATRICULA_AVAILABLE = False
+from app.services.historial import resumen_historial
+from app.services.precarga import MODULO_PREDICTOR, MODULO_PREDICTOR_MATRICULA, importar_ml_async
+
+# Los módulos de ML (pandas, joblib, sklearn) se importan al primer uso o en
+# la precarga del arranque, no al importar esta ruta.
 
 router = APIRouter()
 
@@ -47,6 +39,25 @@ class PrediccionResponse(BaseModel):
     mensaje: Optional[str] = None
 
 
+class PrediccionLoteRequest(BaseModel):
+    cod_persona: str
+    codigos_cursos: list[str]
+    per_matricula: Optional[str] = None
+
+
+class CursoClasificacion(BaseModel):
+    cod_curso: str
+    categoria_riesgo: Optional[str] = None
+
+
+class PrediccionLoteResponse(BaseModel):
+    success: bool
+    cod_persona: str
+    per_matricula: Optional[str] = None
+    predicciones: list[CursoClasificacion]
+    mensaje: Optional[str] = None
+
+
 class PrediccionMatriculaRequest(BaseModel):
     cod_persona: str
     codigos_cursos: list[str]
@@ -66,10 +77,28 @@ class PrediccionMatriculaResponse(BaseModel):
     mensaje: Optional[str] = None
 
 
+def _historial_academico(db: Session, cod_persona: str) -> dict:
+    """Resumen del historial académico (se usa como fallback del clasificador)."""
+    # Este fallback siempre consideró aprobado desde 11 (el login usa 11.5)
+    resumen = resumen_historial(db, cod_persona, nota_aprobatoria=NOTA_APROBATORIA_PREDICCION)
+
+    total_matriculas = resumen['total_matriculas']
+    total_creditos_cursados = resumen['total_creditos_cursados']
+    promedio_acumulado = resumen['promedio_aprobados']
+
+    return {
+        'promedio_acumulado': promedio_acumulado if promedio_acumulado is not None else 12.0,
+        'promedio_ponderado': resumen['promedio_ponderado'],
+        'pct_creditos_aprobados': resumen['creditos_aprobados'] / total_creditos_cursados if total_creditos_cursados > 0 else 0.5,
+        'pct_cursos_aprobados': resumen['cursos_aprobados'] / total_matriculas if total_matriculas > 0 else 0.5,
+        'semestres_cursados': resumen['semestres_cursados']
+    }
+
+
 @router.post("/predecir", response_model=PrediccionResponse)
 async def predecir_nota(
     request: PrediccionRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Predecir la nota de un estudiante en un curso específico
@@ -83,9 +112,9 @@ async def predecir_nota(
     """
 
     # Verificar que el alumno existe
-    alumno = db.query(Alumno).filter(
-        Alumno.cod_persona == request.cod_persona
-    ).first()
+    alumno = await db.scalar(
+        select(Alumno).where(Alumno.cod_persona == request.cod_persona).limit(1)
+    )
 
     if not alumno:
         raise HTTPException(
@@ -94,9 +123,9 @@ async def predecir_nota(
         )
 
     # Verificar que el curso existe
-    curso = db.query(Curso).filter(
-        Curso.cod_curso == request.cod_curso
-    ).first()
+    curso = await db.scalar(
+        select(Curso).where(Curso.cod_curso == request.cod_curso).limit(1)
+    )
 
     if not curso:
         raise HTTPException(
@@ -105,32 +134,8 @@ async def predecir_nota(
         )
 
     # Obtener historial académico del alumno
-    matriculas = db.query(Matricula).filter(
-        Matricula.cod_persona == request.cod_persona
-    ).all()
-
-    # Calcular estadísticas del historial
-    notas_aprobadas = [m.nota for m in matriculas if m.nota and m.nota >= 11]
-    total_matriculas = len(matriculas)
-    creditos_aprobados = sum([
-        db.query(Curso).filter(Curso.cod_curso == m.cod_curso).first().creditos or 0
-        for m in matriculas if m.nota and m.nota >= 11
-    ])
-
-    # Calcular total de créditos posibles (aproximado)
-    total_creditos_cursados = sum([
-        db.query(Curso).filter(Curso.cod_curso == m.cod_curso).first().creditos or 0
-        for m in matriculas
-    ])
-
-    promedio_acumulado = sum(notas_aprobadas) / len(notas_aprobadas) if notas_aprobadas else 12.0
-
-    historial_academico = {
-        'promedio_acumulado': promedio_acumulado,
-        'pct_creditos_aprobados': creditos_aprobados / total_creditos_cursados if total_creditos_cursados > 0 else 0.5,
-        'pct_cursos_aprobados': len(notas_aprobadas) / total_matriculas if total_matriculas > 0 else 0.5,
-        'semestres_cursados': len(set([m.per_matricula for m in matriculas]))
-    }
+    historial_academico = await db.run_sync(_historial_academico, request.cod_persona)
+    promedio_acumulado = historial_academico['promedio_acumulado']
 
     # Datos del alumno
     alumno_data = {
@@ -151,9 +156,11 @@ async def predecir_nota(
 
     # Realizar predicción con modelo ML clasificador
     categoria_riesgo = None
-    if PREDICTOR_AVAILABLE:
+    modulo_predictor = await importar_ml_async(MODULO_PREDICTOR)
+    if modulo_predictor is not None:
         try:
-            predictor = get_predictor()
+            # La primera llamada carga el modelo: fuera del event loop
+            predictor = await run_in_threadpool(modulo_predictor.get_predictor)
             categoria_riesgo = predictor.predecir_nota(
                 request.cod_persona,
                 request.cod_curso,
@@ -180,15 +187,92 @@ async def predecir_nota(
     )
 
 
+@router.post("/predecir-lote", response_model=PrediccionLoteResponse)
+async def predecir_notas_lote(
+    request: PrediccionLoteRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Clasificar el riesgo de varios cursos de un estudiante en una sola predicción.
+    El historial del alumno se consulta una vez y el modelo se llama una vez
+    para todos los cursos.
+
+    Args:
+        request: Código del estudiante, códigos de cursos y período opcional
+        db: Sesión de base de datos
+
+    Returns:
+        Categoría de riesgo por curso
+    """
+    alumno = await db.scalar(
+        select(Alumno).where(Alumno.cod_persona == request.cod_persona).limit(1)
+    )
+
+    if not alumno:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No se encontró alumno con código {request.cod_persona}"
+        )
+
+    # Verificar todos los cursos con una sola consulta
+    existentes = set(await db.scalars(
+        select(Curso.cod_curso).where(Curso.cod_curso.in_(request.codigos_cursos))
+    ))
+    faltantes = [cod for cod in request.codigos_cursos if cod not in existentes]
+    if faltantes:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No se encontraron cursos con código {', '.join(faltantes)}"
+        )
+
+    historial_academico = await db.run_sync(_historial_academico, request.cod_persona)
+
+    modulo_predictor = await importar_ml_async(MODULO_PREDICTOR)
+    if modulo_predictor is None:
+        predicciones = [CursoClasificacion(cod_curso=cod) for cod in request.codigos_cursos]
+        mensaje = "Modelo ML no disponible"
+    else:
+        try:
+            # La primera llamada carga el modelo: fuera del event loop
+            predictor = await run_in_threadpool(modulo_predictor.get_predictor)
+            categorias = await run_in_threadpool(
+                predictor.predecir_notas_lote,
+                request.cod_persona,
+                request.codigos_cursos,
+                per_matricula=request.per_matricula,
+                historial_academico=historial_academico
+            )
+            predicciones = [
+                CursoClasificacion(cod_curso=cod, categoria_riesgo=categorias.get(cod))
+                for cod in request.codigos_cursos
+            ]
+            mensaje = f"Clasificación de {len(predicciones)} cursos"
+        except Exception as e:
+            print(f"Error en predicción ML por lote: {e}")
+            predicciones = [CursoClasificacion(cod_curso=cod) for cod in request.codigos_cursos]
+            mensaje = f"Error en clasificación: {str(e)[:100]}"
+
+    return PrediccionLoteResponse(
+        success=True,
+        cod_persona=request.cod_persona,
+        per_matricula=request.per_matricula,
+        predicciones=predicciones,
+        mensaje=mensaje
+    )
+
+
 @router.post("/predecir-multiple")
 async def predecir_notas_multiples(
     cod_persona: str,
     codigos_cursos: list[str],
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Predecir notas para múltiples cursos de un estudiante
 
+    Usa la clasificación por lote; los cursos inexistentes se reportan
+    individualmente con success=False.
+
     Args:
         cod_persona: Código del estudiante
         codigos_cursos: Lista de códigos de cursos
@@ -197,25 +281,55 @@ async def predecir_notas_multiples(
     Returns:
         Lista de predicciones para cada curso
     """
-    predicciones = []
-
-    for cod_curso in codigos_cursos:
+    existentes = set(await db.scalars(
+        select(Curso.cod_curso).where(Curso.cod_curso.in_(codigos_cursos))
+    ))
+    validos = [cod for cod in codigos_cursos if cod in existentes]
+
+    respuesta_lote = None
+    error_lote = None
+    if validos:
         try:
-            prediccion = await predecir_nota(
-                PrediccionRequest(cod_persona=cod_persona, cod_curso=cod_curso),
+            respuesta_lote = await predecir_notas_lote(
+                PrediccionLoteRequest(cod_persona=cod_persona, codigos_cursos=validos),
                 db
             )
+        except Exception as e:
+            error_lote = str(e)
+
+    categorias = {}
+    if respuesta_lote is not None:
+        categorias = {p.cod_curso: p.categoria_riesgo for p in respuesta_lote.predicciones}
+
+    predicciones = []
+    for cod_curso in codigos_cursos:
+        if cod_curso not in existentes:
             predicciones.append({
                 'cod_curso': cod_curso,
-                'prediccion': prediccion,
-                'success': True
+                'nota_estimada': None,
+                'success': False,
+                # Mismo texto que str() de la HTTPException 404 de /predecir
+                'error': f"{status.HTTP_404_NOT_FOUND}: No se encontró curso con código {cod_curso}"
             })
-        except Exception as e:
+        elif error_lote is not None:
             predicciones.append({
                 'cod_curso': cod_curso,
                 'nota_estimada': None,
                 'success': False,
-                'error': str(e)
+                'error': error_lote
+            })
+        else:
+            categoria = categorias.get(cod_curso)
+            predicciones.append({
+                'cod_curso': cod_curso,
+                'prediccion': PrediccionResponse(
+                    success=True,
+                    cod_persona=cod_persona,
+                    cod_curso=cod_curso,
+                    categoria_riesgo=categoria,
+                    mensaje=f"Clasificación: {categoria}"
+                ),
+                'success': True
             })
 
     return {
@@ -228,7 +342,7 @@ async def predecir_notas_multiples(
 @router.post("/predecir-por-matricula", response_model=PrediccionMatriculaResponse)
 async def predecir_notas_por_matricula(
     request: PrediccionMatriculaRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Predice las notas para múltiples cursos considerando la carga total de la matrícula.
@@ -244,9 +358,9 @@ async def predecir_notas_por_matricula(
     """
 
     # Verificar que el alumno existe
-    alumno = db.query(Alumno).filter(
-        Alumno.cod_persona == request.cod_persona
-    ).first()
+    alumno = await db.scalar(
+        select(Alumno).where(Alumno.cod_persona == request.cod_persona).limit(1)
+    )
 
     if not alumno:
         raise HTTPException(
@@ -254,20 +368,20 @@ async def predecir_notas_por_matricula(
             detail=f"No se encontró alumno con código {request.cod_persona}"
         )
 
-    # Verificar que los cursos existen
+    # Verificar que los cursos existen (una sola consulta)
+    existentes = set(await db.scalars(
+        select(Curso.cod_curso).where(Curso.cod_curso.in_(request.codigos_cursos))
+    ))
     for cod_curso in request.codigos_cursos:
-        curso = db.query(Curso).filter(
-            Curso.cod_curso == cod_curso
-        ).first()
-
-        if not curso:
+        if cod_curso not in existentes:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"No se encontró curso con código {cod_curso}"
             )
 
     # Realizar predicción con modelo de predicción por matrícula
-    if not PREDICTOR_MATRICULA_AVAILABLE:
+    modulo_matricula = await importar_ml_async(MODULO_PREDICTOR_MATRICULA)
+    if modulo_matricula is None:
         # Fallback si el modelo no está disponible
         predicciones = [
             CursoPrediccion(cod_curso=cod, nota_predicha=14.0)
@@ -276,7 +390,8 @@ async def predecir_notas_por_matricula(
         mensaje = "Modelo de predicción por matrícula no disponible. Usando valores por defecto."
     else:
         try:
-            predictor_matricula = get_predictor_matricula()
+            # La primera llamada carga el modelo: fuera del event loop
+            predictor_matricula = await run_in_threadpool(modulo_matricula.get_predictor_matricula)
 
             # Convertir cod_persona a int si es necesario
             try:
@@ -287,8 +402,10 @@ async def predecir_notas_por_matricula(
                     detail=f"El código de persona debe ser un número entero"
                 )
 
-            # Realizar predicción
-            lista_notas = predictor_matricula.predecir_notas(
+            # Realizar predicción en el threadpool para que las solicitudes
+            # concurrentes se agrupen en un mismo lote del modelo
+            lista_notas = await run_in_threadpool(
+                predictor_matricula.predecir_notas,
                 cod_persona=cod_persona_int,
                 lista_cod_curso=request.codigos_cursos,
                 per_matricula=request.per_matricula
@@ -321,3 +438,15 @@ async def predecir_notas_por_matricula(
         predicciones=predicciones,
         mensaje=mensaje
     )
+
+
+@router.get("/debug")
+async def debug_inferencia():
+    from app.tests.inferencia import run_tests_inferencia
+    return run_tests_inferencia()
+
+
+@router.get("/debug/features-online")
+async def debug_features_online(n_grupos: int = 200):
+    from app.tests.features_online import run_tests_features_online
+    return await run_in_threadpool(run_tests_features_online, n_grupos)
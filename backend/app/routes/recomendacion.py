@@ -3,7 +3,8 @@ Endpoints para el sistema de recomendación de matrícula
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, List, Dict
 import sys
@@ -12,29 +13,29 @@ from pathlib import Path
 import heapq
 import time
 
-from app.db.database import get_db
+from app.db.bloques import DIAS, INDICE_DIA, a_hora, a_minutos, consulta_bloques
+from app.db.database import get_async_db
 from app.models.alumno import Alumno
 from app.models.curso import Curso
-from app.models.seccion import Seccion
+from app.services.precarga import MODULO_RECOMENDADOR, importar_ml_async
 
-from app.utils.utils import str_to_dict, str_to_list, str_to_list_simple
-
-try:
-    from app.ml_models.recomendador_matricula import ranking_cursos, calcular_score_bundle
-    RECOMENDADOR_AVAILABLE = True
-    print("Sistema de recomendacion cargado exitosamente")
-except ImportError as e:
-    print(f"Warning: No se pudo cargar el sistema de recomendacion: {e}")
-    RECOMENDADOR_AVAILABLE = False
+# El recomendador (pandas) se importa al primer uso o en la precarga del arranque
 
 router = APIRouter()
 
 
+class VentanaHoraria(BaseModel):
+    dia: str  # "Lun", "Mar", "Mie", "Jue", "Vie", "Sab", "Dom"
+    inicio: str  # "HH:MM"
+    fin: str  # "HH:MM"
+
+
 class RecomendacionRequest(BaseModel):
     cod_persona: str
     per_matricula: str
     max_time: Optional[int] = 30  # en segundos
     bundles: List[str]  # Lista de códigos de cursos disponibles
+    evitar: Optional[List[VentanaHoraria]] = None  # Franjas sin clases (se descartan las secciones que choquen)
 
 
 class RecomendacionResponse(BaseModel):
@@ -48,7 +49,7 @@ class RecomendacionResponse(BaseModel):
 @router.post("/mejor-horario", response_model=RecomendacionResponse)
 async def recomendar_mejor_horario(
     request: RecomendacionRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Evalúa diferentes combinaciones de cursos (bundles) y recomienda la mejor opción.
@@ -75,9 +76,9 @@ async def recomendar_mejor_horario(
     # MANEJO DE ERRORES
 
     # Verificar que el alumno existe
-    alumno = db.query(Alumno).filter(
-        Alumno.cod_persona == request.cod_persona
-    ).first()
+    alumno = await db.scalar(
+        select(Alumno).where(Alumno.cod_persona == request.cod_persona).limit(1)
+    )
 
     if not alumno:
         raise HTTPException(
@@ -101,7 +102,8 @@ async def recomendar_mejor_horario(
             )
 
     # Verificar que el sistema de recomendación está disponible
-    if not RECOMENDADOR_AVAILABLE:
+    recomendador = await importar_ml_async(MODULO_RECOMENDADOR)
+    if recomendador is None:
         return RecomendacionResponse(
             success=False,
             meta={
@@ -122,30 +124,37 @@ async def recomendar_mejor_horario(
 
     # INICIO DEL CODIGO
 
+    # Franjas a evitar en minutos; las secciones que chocan se descartan en SQL
+    ventanas = []
+    for v in request.evitar or []:
+        try:
+            ventana = (INDICE_DIA[v.dia], a_minutos(v.inicio), a_minutos(v.fin))
+        except (KeyError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Franja inválida: {v.dia} {v.inicio}-{v.fin} (día Lun..Dom, horas HH:MM)"
+            )
+        if ventana[1] >= ventana[2]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Franja inválida: {v.dia} {v.inicio}-{v.fin} (inicio debe ser menor que fin)"
+            )
+        ventanas.append(ventana)
+
     # crear horarios posibles dado los cursos disponibles
-    secciones = db.query(Seccion).filter(
-        Seccion.cod_curso.in_(request.bundles)
-    ).all()
+    bloques = (await db.execute(consulta_bloques(request.bundles, ventanas))).all()
 
 
-    cursos = db.query(Curso).all()
-    cred_cursos = {c.cod_curso: c.creditos for c in cursos}
+    cred_cursos = dict((await db.execute(select(Curso.cod_curso, Curso.creditos))).all())
 
     cod_persona_int = int(request.cod_persona)
-    cursos_disp: List[str] = ranking_cursos(cod_persona=cod_persona_int, per_matricula=request.per_matricula, cursos=request.bundles)
+    cursos_disp: List[str] = recomendador.ranking_cursos(cod_persona=cod_persona_int, per_matricula=request.per_matricula, cursos=request.bundles)
     cursos_hor: Dict[str, Dict[str, List[tuple[str, str, str]]]] = {i: {} for i in cursos_disp}    
-    for seccion in secciones:
-        hors = seccion.horarios
-        sec = seccion.seccion_key
-        hors = str_to_list(hors)
-        for h in hors:
-            secs = str_to_dict(h)
-            dia = secs["Dia"]              # debe coincidir con las claves de dict_default
-            hi = secs["Hora_inicio"]
-            hf = secs["Hora_fin"]
-            if sec not in cursos_hor[seccion.cod_curso]:
-                cursos_hor[seccion.cod_curso][sec] = []
-            cursos_hor[seccion.cod_curso][sec].append((dia, hi, hf))
+    for cod_curso, sec, dia, inicio_min, fin_min in bloques:
+        if sec not in cursos_hor[cod_curso]:
+            cursos_hor[cod_curso][sec] = []
+        # dia como clave de dict_default y horas "HH:MM" (mismo formato que horarios)
+        cursos_hor[cod_curso][sec].append((DIAS[dia], a_hora(inicio_min), a_hora(fin_min)))
 
     dict_default: Dict[str, List[tuple[str, str]]] = {
         "Lun": [],
@@ -305,7 +314,7 @@ async def recomendar_mejor_horario(
 
         # 1. Calcular el score usando la función refactorizada
         #    (Asume que cursos_tomados es una lista de códigos ['CS101', ...])
-        current_score = calcular_score_bundle(cod_persona_int, request.per_matricula, cursos_tomados)
+        current_score = recomendador.calcular_score_bundle(cod_persona_int, request.per_matricula, cursos_tomados)
 
         # 2. Optimización rápida: 
         #    Si ya tenemos K elementos y el score actual es peor que el último (el peor de los mejores),
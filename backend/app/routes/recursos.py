@@ -2,17 +2,14 @@
 Endpoints para recursos académicos recomendados
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Optional
-import csv
-from pathlib import Path
 from pydantic import BaseModel
 
-router = APIRouter()
+from app.services.recursos import get_indice_recursos
 
-# Ruta al CSV de recursos
-DATA_DIR = Path(__file__).parent.parent.parent / "data"
-RECURSOS_CSV = DATA_DIR / "recursos_recomendados_cursos_descripcion.csv"
+router = APIRouter()
 
 
 class RecursoRecomendado(BaseModel):
@@ -31,58 +28,30 @@ class RecursosResponse(BaseModel):
     descripcion: Optional[str] = None
 
 
-def cargar_recursos() -> dict:
-    """Cargar recursos desde CSV y retornar como diccionario"""
-    recursos_dict = {}
-
-    try:
-        with open(RECURSOS_CSV, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                curso_nombre = row['curso'].strip().upper()
-                recursos_dict[curso_nombre] = {
-                    'recursos': [
-                        row.get('recurso_1', ''),
-                        row.get('recurso_2', ''),
-                        row.get('recurso_3', ''),
-                        row.get('recurso_4', '')
-                    ],
-                    'descripcion': row.get('descripcion', '')
-                }
-    except Exception as e:
-        print(f"Error cargando recursos: {e}")
-
-    return recursos_dict
-
-
 @router.get("/curso/{nombre_curso}", response_model=RecursosResponse)
 async def get_recursos_curso(nombre_curso: str):
     """
     Obtener recursos recomendados para un curso específico
 
     Args:
-        nombre_curso: Nombre del curso (ej: "MATEMATICA I")
+        nombre_curso: Nombre del curso (ej: "MATEMATICA I") o su código
 
     Returns:
         Recursos y descripción del curso
     """
-    recursos_dict = cargar_recursos()
-    curso_upper = nombre_curso.strip().upper()
+    # Leer la versión de curso puede consultar la BD (una vez por TTL): fuera del loop
+    data = (await run_in_threadpool(get_indice_recursos)).buscar(nombre_curso, cod_curso=nombre_curso)
 
-    if curso_upper not in recursos_dict:
+    if data is None:
         raise HTTPException(
             status_code=404,
             detail=f"No se encontraron recursos para el curso '{nombre_curso}'"
         )
 
-    data = recursos_dict[curso_upper]
-    # Filtrar recursos vacíos
-    recursos = [r for r in data['recursos'] if r.strip()]
-
     return RecursosResponse(
         success=True,
         curso=nombre_curso,
-        recursos=recursos,
+        recursos=data['recursos'],
         descripcion=data.get('descripcion', '')
     )
 
@@ -95,27 +64,15 @@ async def get_todos_recursos():
     Returns:
         Lista de todos los cursos con sus recursos
     """
-    recursos_list = []
-
-    try:
-        with open(RECURSOS_CSV, 'r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                recursos_list.append(RecursoRecomendado(
-                    curso=row['curso'],
-                    recurso_1=row.get('recurso_1'),
-                    recurso_2=row.get('recurso_2'),
-                    recurso_3=row.get('recurso_3'),
-                    recurso_4=row.get('recurso_4'),
-                    descripcion=row.get('descripcion')
-                ))
-    except Exception as e:
+    indice = await run_in_threadpool(get_indice_recursos)
+    if indice.error is not None:
         raise HTTPException(
             status_code=500,
-            detail=f"Error cargando recursos: {str(e)}"
+            detail=f"Error cargando recursos: {indice.error}"
         )
 
-    return recursos_list
+    # Lista ya serializada al cargar el índice
+    return Response(content=indice.todos, media_type="application/json")
 
 
 @router.post("/matriculados")
@@ -129,7 +86,7 @@ async def get_recursos_matriculados(request_data: dict):
     Returns:
         Diccionario con recursos por curso
     """
-    recursos_dict = cargar_recursos()
+    indice = await run_in_threadpool(get_indice_recursos)
     resultado = {}
 
     cursos = request_data.get('cursos', [])
@@ -138,14 +95,12 @@ async def get_recursos_matriculados(request_data: dict):
         curso_code = curso.get('code', '')
         curso_name = curso.get('name', '')
 
-        # Buscar por nombre del curso (normalizado)
-        curso_upper = curso_name.strip().upper()
+        # Buscar por nombre del curso (normalizado) y, si no, por código
+        data = indice.buscar(curso_name, cod_curso=curso_code)
 
-        if curso_upper in recursos_dict:
-            data = recursos_dict[curso_upper]
-            recursos = [r for r in data['recursos'] if r.strip()]
+        if data is not None:
             resultado[curso_code] = {
-                'recursos': recursos,
+                'recursos': list(data['recursos']),
                 'descripcion': data.get('descripcion', '')
             }
         else:
@@ -10,6 +10,9 @@ class LoginRequest(BaseModel):
     """Schema para solicitud de login"""
     cod_persona: str = Field(..., max_length=10, description="Código del estudiante")
     password: str = Field(..., description="Contraseña del estudiante")
+    incluir_cursos_info: bool = Field(
+        True, description="False para omitir cursos_info (obtenerlo de /cursos/catalogo)"
+    )
 
 
 class LoginResponse(BaseModel):
@@ -20,7 +20,7 @@ class NotasResponse(BaseModel):
 class MatriculaRequest(BaseModel):
     """Schema para solicitud de matrícula"""
     cod_alumno: int = Field(..., description="Código del alumno")
-    cod_cursos: list[int] = Field(..., description="Lista de códigos de cursos a matricular")
+    cod_cursos: list[str] = Field(..., description="Lista de códigos de cursos a matricular")
 
 class MatriculaResponse(BaseModel):
     """Schema para respuesta de matrícula"""
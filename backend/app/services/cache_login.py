@@ -0,0 +1,74 @@
+"""
+Caché de respuestas de login por alumno
+Guarda la respuesta ya serializada (bytes) junto con la versión de los datos
+de los que depende: la versión de importación (importacion_csv) de alumno,
+curso, seccion y matricula. Cuando cualquier proceso reimporta alguna de esas
+tablas la versión cambia (a más tardar en VERSION_DATOS_TTL_SEGUNDOS) y las
+entradas viejas dejan de servirse.
+
+Memoria: cada respuesta ocupa del orden de 50 KB (con cursos_info), así que
+el caché se limita por bytes (LOGIN_CACHE_MAX_BYTES, por worker) además de
+por número de entradas.
+"""
+
+import threading
+from collections import OrderedDict
+
+from app.core.config import settings
+from app.db.csv_import import version_tabla
+
+TABLAS_LOGIN = ("alumno", "curso", "seccion", "matricula")
+
+
+def version_datos() -> tuple:
+    """Versión actual de los datos que componen el login (puede consultar la BD)."""
+    return tuple(version_tabla(t) for t in TABLAS_LOGIN)
+
+
+class CacheLogin:
+    """LRU thread-safe de respuestas serializadas, acotado por entradas y por bytes."""
+
+    def __init__(self, max_entradas: int = 1000, max_bytes: int = 32 * 2**20):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._entradas: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"aciertos": 0, "fallos": 0}
+
+    def obtener(self, clave, version: tuple) -> bytes | None:
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None or entrada[0] != version:
+                self.stats["fallos"] += 1
+                return None
+            self._entradas.move_to_end(clave)
+            self.stats["aciertos"] += 1
+            return entrada[1]
+
+    def guardar(self, clave, contenido: bytes, version: tuple) -> None:
+        """Guardar con la versión leída ANTES de construir la respuesta."""
+        if len(contenido) > self.max_bytes:
+            return
+        with self._lock:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self._bytes -= len(anterior[1])
+            self._entradas[clave] = (version, contenido)
+            self._bytes += len(contenido)
+            while len(self._entradas) > self.max_entradas or self._bytes > self.max_bytes:
+                _, (_, descartado) = self._entradas.popitem(last=False)
+                self._bytes -= len(descartado)
+
+    def invalidar(self, cod_persona: str = None) -> None:
+        """Descartar las entradas de un alumno (o todas)."""
+        with self._lock:
+            if cod_persona is None:
+                self._entradas.clear()
+                self._bytes = 0
+                return
+            for clave in [k for k in self._entradas if k[0] == cod_persona]:
+                self._bytes -= len(self._entradas.pop(clave)[1])
+
+
+cache_login = CacheLogin(settings.LOGIN_CACHE_MAX_ENTRADAS, settings.LOGIN_CACHE_MAX_BYTES)
@@ -0,0 +1,68 @@
+"""
+Catálogo de cursos serializado una sola vez
+El catálogo solo cambia cuando se reimporta la tabla curso, así que se guarda
+la lista de cursos, el JSON en bytes y su ETag por versión de importación
+(importacion_csv). El ETag es el hash del JSON: todos los workers dan el mismo
+ETag para el mismo contenido, aunque la reimportación no lo haya cambiado.
+"""
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from app.db.csv_import import version_tabla
+from app.models.curso import Curso
+
+
+@dataclass(frozen=True)
+class CatalogoSerializado:
+    version: str
+    cursos_info: list
+    contenido: bytes
+    etag: str
+
+
+_catalogo: CatalogoSerializado | None = None
+_catalogo_lock = threading.Lock()
+
+
+def serializar_curso(c: Curso) -> dict:
+    """Representación de un curso en cursos_info (login y /cursos/catalogo)."""
+    return {
+        "cod_curso": c.cod_curso,
+        "curso": c.curso,
+        "creditos": c.creditos,
+        "familia": c.familia,
+        "nivel_curso": c.nivel_curso,
+        "tipo": c.tipo,
+        "horas": c.horas,
+        "prerequisitos": c.prerequisito or [],
+        "prerequisitos_cod": c.prerequisito_cod or [],
+        "descripcion": c.descripcion,
+    }
+
+
+def get_catalogo(db: Session) -> CatalogoSerializado:
+    """Catálogo vigente; se reconstruye solo si la tabla curso se reimportó."""
+    global _catalogo
+    version = version_tabla("curso")
+    catalogo = _catalogo
+    if catalogo is not None and catalogo.version == version:
+        return catalogo
+
+    with _catalogo_lock:
+        if _catalogo is not None and _catalogo.version == version:
+            return _catalogo
+
+        cursos = db.query(Curso).order_by(Curso.cod_curso).all()
+        cursos_info = [serializar_curso(c) for c in cursos]
+        contenido = json.dumps(cursos_info, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        # ETag del contenido (determinista por el ORDER BY): la versión solo decide cuándo reconstruir
+        etag = '"' + hashlib.sha256(contenido).hexdigest()[:32] + '"'
+
+        _catalogo = CatalogoSerializado(version, cursos_info, contenido, etag)
+        print(f"OK - Catálogo de cursos serializado ({len(cursos_info)} cursos, {len(contenido)} bytes)")
+        return _catalogo
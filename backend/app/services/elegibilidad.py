@@ -0,0 +1,125 @@
+"""
+Motor de elegibilidad de cursos con máscaras de bits
+Cada curso de la malla tiene un bit; los prerequisitos de cada curso se
+compilan una sola vez (por versión de importación de la tabla curso) en una máscara, y
+"qué cursos puede llevar el alumno" se responde con operaciones de bits.
+
+Reglas (las mismas que usaba el login):
+- Un curso es elegible si no está aprobado y todos sus prerequisitos lo están.
+- ``100CR`` exige al menos 100 créditos aprobados.
+- ``300IN`` y ``400IN`` siempre se consideran cumplidos.
+- Si el alumno aprobó un curso que tiene a X como prerequisito, X deja de
+  ofrecerse (ya se da por cumplido).
+"""
+
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.db.csv_import import version_tabla
+from app.models.curso import Curso
+
+REQUISITO_CREDITOS = "100CR"
+CREDITOS_MINIMOS = 100
+REQUISITOS_LIBRES = {"300IN", "400IN"}
+
+
+def _bits(mascara: int):
+    """Índices de los bits encendidos de una máscara."""
+    while mascara:
+        bajo = mascara & -mascara
+        yield bajo.bit_length() - 1
+        mascara ^= bajo
+
+
+class MotorElegibilidad:
+    """Prerequisitos de la malla compilados a máscaras de bits."""
+
+    def __init__(self, cursos: list, version: str = ""):
+        self.version = version
+        self.codigos: list[str] = []
+        self.indice: dict[str, int] = {}
+
+        for c in cursos:
+            self._bit(c.cod_curso)
+        self.n_cursos = len(self.codigos)
+        self.malla = (1 << self.n_cursos) - 1
+
+        # requisitos[i]: máscara de prerequisitos del curso i
+        self.requisitos: list[int] = [0] * self.n_cursos
+        # dependientes[j]: máscara de cursos que exigen el curso j
+        self.dependientes: dict[int, int] = {}
+        self.requiere_creditos = 0
+
+        for c in cursos:
+            i = self.indice[c.cod_curso]
+            for pre in c.prerequisito_cod or []:
+                if pre in REQUISITOS_LIBRES:
+                    continue
+                if pre == REQUISITO_CREDITOS:
+                    self.requiere_creditos |= 1 << i
+                    continue
+                j = self._bit(pre)  # prerequisitos fuera de la malla también tienen bit
+                self.requisitos[i] |= 1 << j
+                self.dependientes[j] = self.dependientes.get(j, 0) | (1 << i)
+
+        self.con_requisitos = 0
+        for j in self.dependientes:
+            self.con_requisitos |= 1 << j
+
+    def _bit(self, cod_curso: str) -> int:
+        i = self.indice.get(cod_curso)
+        if i is None:
+            i = len(self.codigos)
+            self.codigos.append(cod_curso)
+            self.indice[cod_curso] = i
+        return i
+
+    def mascara(self, codigos) -> int:
+        """Máscara de una colección de códigos (ignora códigos desconocidos)."""
+        m = 0
+        for cod in codigos:
+            i = self.indice.get(cod)
+            if i is not None:
+                m |= 1 << i
+        return m
+
+    def codigos_de(self, mascara: int) -> list[str]:
+        """Códigos de una máscara, en el orden del catálogo."""
+        return [self.codigos[i] for i in _bits(mascara)]
+
+    def disponibles(self, aprobados: int, creditos_aprobados: float) -> int:
+        """Máscara de cursos de la malla que el alumno puede llevar."""
+        bloqueados = 0
+        for j in _bits(self.con_requisitos & ~aprobados):
+            bloqueados |= self.dependientes[j]
+
+        cumplidos = 0
+        for i in _bits(aprobados & self.malla):
+            cumplidos |= self.requisitos[i]
+
+        elegibles = self.malla & ~aprobados & ~bloqueados & ~cumplidos
+        if creditos_aprobados < CREDITOS_MINIMOS:
+            elegibles &= ~self.requiere_creditos
+        return elegibles
+
+    def cursos_disponibles(self, cursos_aprobados, creditos_aprobados: float) -> list[str]:
+        return self.codigos_de(self.disponibles(self.mascara(cursos_aprobados), creditos_aprobados))
+
+
+_motor: MotorElegibilidad | None = None
+_motor_lock = threading.Lock()
+
+
+def get_motor_elegibilidad(db: Session) -> MotorElegibilidad:
+    """Motor vigente; se recompila solo si cambió la versión de la tabla curso."""
+    global _motor
+    version = version_tabla("curso")
+    motor = _motor
+    if motor is not None and motor.version == version:
+        return motor
+
+    with _motor_lock:
+        if _motor is None or _motor.version != version:
+            _motor = MotorElegibilidad(db.query(Curso).all(), version)
+        return _motor
@@ -0,0 +1,96 @@
+"""
+Resumen del historial académico de un alumno
+Se lee de la tabla materializada alumno_resumen (ver app.db.resumen), una
+fila por nota de corte, si se construyó con las versiones vigentes de
+matricula y curso; si está desactualizada, no hay fila o la nota de corte no
+está materializada se calcula con la misma consulta agregada sobre matricula
+JOIN curso.
+Los totales por período del login salen de una consulta agrupada por
+per_matricula.
+"""
+
+from sqlalchemy.orm import Session
+
+from app.db.csv_import import derivada_vigente
+from app.db.resumen import (
+    CORTES_RESUMEN,
+    NOTA_APROBATORIA,
+    ORIGENES_RESUMEN,
+    TABLA_RESUMEN,
+    consulta_alumnos,
+    consulta_periodos,
+    promedio_centesimas,
+)
+from app.models.resumen import AlumnoResumen
+
+
+def resumen_historial(db: Session, cod_persona: str, nota_aprobatoria: float = NOTA_APROBATORIA) -> dict:
+    """
+    Resumen del historial de un alumno.
+
+    Args:
+        db: Sesión de base de datos
+        cod_persona: Código del estudiante
+        nota_aprobatoria: Nota mínima para considerar un curso aprobado
+
+    Returns:
+        Diccionario con total_matriculas, semestres_cursados, cursos_aprobados,
+        cursos_reprobados, creditos_aprobados, total_creditos_cursados,
+        promedio_ponderado (por créditos, None si no hay notas),
+        promedio_ponderado_redondeado (el mismo a 2 decimales, mitad hacia
+        arriba) y promedio_aprobados (None si no aprobó cursos)
+    """
+    fila = None
+    if float(nota_aprobatoria) in CORTES_RESUMEN and derivada_vigente(TABLA_RESUMEN, ORIGENES_RESUMEN):
+        fila = db.get(AlumnoResumen, (cod_persona, float(nota_aprobatoria)))
+    if fila is None:
+        fila = db.execute(consulta_alumnos(nota_aprobatoria, cod_persona)).first()
+    if fila is None:
+        # Alumno sin matrículas
+        return {
+            "total_matriculas": 0,
+            "semestres_cursados": 0,
+            "cursos_aprobados": 0,
+            "cursos_reprobados": 0,
+            "creditos_aprobados": 0,
+            "total_creditos_cursados": 0,
+            "promedio_ponderado": None,
+            "promedio_ponderado_redondeado": None,
+            "promedio_aprobados": None,
+        }
+
+    return {
+        "total_matriculas": int(fila.total_cursos or 0),
+        "semestres_cursados": int(fila.semestres_cursados or 0),
+        "cursos_aprobados": int(fila.cursos_aprobados or 0),
+        "cursos_reprobados": int(fila.cursos_reprobados or 0),
+        "creditos_aprobados": int(fila.creditos_aprobados or 0),
+        "total_creditos_cursados": int(fila.creditos_cursados or 0),
+        "promedio_ponderado": float(fila.promedio_general) if fila.promedio_general is not None else None,
+        "promedio_ponderado_redondeado": promedio_centesimas(fila.suma_centesimas, fila.creditos_con_nota),
+        "promedio_aprobados": float(fila.promedio_aprobados) if fila.promedio_aprobados is not None else None,
+    }
+
+
+def resumen_periodos(db: Session, cod_persona: str) -> dict:
+    """
+    Agregados por período de un alumno con una consulta agrupada
+    (GROUP BY per_matricula sobre matricula JOIN curso).
+
+    Args:
+        db: Sesión de base de datos
+        cod_persona: Código del estudiante
+
+    Returns:
+        Diccionario {per_matricula: {total_cursos, cursos_aprobados, creditos,
+        promedio_periodo}}; promedio_periodo ya viene redondeado a 2 decimales
+    """
+    return {
+        fila.per_matricula: {
+            "total_cursos": int(fila.total_cursos or 0),
+            "cursos_aprobados": int(fila.cursos_aprobados or 0),
+            "creditos": int(fila.creditos or 0),
+            "promedio_periodo": float(fila.promedio_periodo) if fila.promedio_periodo is not None else None,
+        }
+        for fila in db.execute(consulta_periodos(cod_persona))
+    }
@@ -1,7 +1,26 @@
-
 from sqlalchemy.orm import Session
 
+from app.db.resumen import NOTA_APROBATORIA
+from app.models.matricula import Matricula
+from app.services.elegibilidad import get_motor_elegibilidad
+from app.services.historial import resumen_historial
+
+
+def cursos_no_disponibles(cod_alumno: int, cod_cursos: list[str], db: Session) -> list[str]:
+    """Cursos de la lista que el alumno todavía no puede llevar."""
+    aprobados = [
+        cod for (cod,) in db.query(Matricula.cod_curso).filter(
+            Matricula.cod_persona == str(cod_alumno),
+            Matricula.nota >= NOTA_APROBATORIA,
+        ).all()
+    ]
+    creditos_aprobados = resumen_historial(db, str(cod_alumno))["creditos_aprobados"]
+
+    motor = get_motor_elegibilidad(db)
+    disponibles = motor.disponibles(motor.mascara(aprobados), creditos_aprobados)
+    return [cod for cod in cod_cursos if not (motor.mascara([cod]) & disponibles)]
+
 
-def verificar_cursos_alumno(cod_alumno: int, cod_cursos: list[int], db: Session) -> bool:
-    # Lógica para verificar si los cursos pueden ser llevados por el alumno
-    return True  # Placeholder, implementar la lógica real
\ No newline at end of file
+def verificar_cursos_alumno(cod_alumno: int, cod_cursos: list[str], db: Session) -> bool:
+    # Verificar si los cursos pueden ser llevados por el alumno (prerequisitos y créditos)
+    return not cursos_no_disponibles(cod_alumno, cod_cursos, db)
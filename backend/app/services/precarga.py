@@ -0,0 +1,163 @@
+"""
+Precarga y calentamiento de los recursos de ML
+Se ejecuta al iniciar la aplicación para que las primeras solicitudes no paguen
+la carga de los pickles ni del dataset de features.
+
+El arranque va por etapas; cada una registra su tiempo y RSS (ver /arranque):
+- "catalogo": índice de recursos, catálogo de cursos y motor de elegibilidad.
+- "imports": módulos de app.ml_models (numpy, pandas, joblib).
+- "feature_store": dataset de features y constructor de features en línea.
+- "modelos": catálogo del recomendador, modelos y su calentamiento.
+
+Con PRECARGA_ML=False solo corre "catalogo": el proceso queda listo sin
+importar pandas ni sklearn y los módulos de ML se importan en la primera
+solicitud que los usa (importar_ml_async, en el threadpool).
+"""
+
+import importlib
+import threading
+import time
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.estado import marcar_listo, marcar_no_listo, medir_carga, medir_etapa, registrar_carga
+
+MODULO_PREDICTOR = "app.ml_models.predictor_nota"
+MODULO_PREDICTOR_MATRICULA = "app.ml_models.predictor_nota_x_matricula"
+MODULO_RECOMENDADOR = "app.ml_models.recomendador_matricula"
+
+_modulos_ml: dict = {}
+_modulos_lock = threading.Lock()
+
+
+def importar_ml(nombre: str):
+    """Módulo de ML importado al primer uso, o None si no se pudo importar."""
+    if nombre in _modulos_ml:
+        return _modulos_ml[nombre]
+    with _modulos_lock:
+        if nombre not in _modulos_ml:
+            try:
+                _modulos_ml[nombre] = importlib.import_module(nombre)
+            except Exception as e:
+                # Faltan dependencias o falló la carga al importar: las rutas usan su fallback
+                print(f"Warning: No se pudo cargar {nombre}: {e}")
+                _modulos_ml[nombre] = None
+        return _modulos_ml[nombre]
+
+
+async def importar_ml_async(nombre: str):
+    """importar_ml para rutas async: la primera importación (pandas, sklearn,
+    pickles) corre en el threadpool y no bloquea el event loop."""
+    if nombre in _modulos_ml:
+        return _modulos_ml[nombre]
+    return await run_in_threadpool(importar_ml, nombre)
+
+
+def _calentar_modelo(modelo_rapido, lote=None) -> None:
+    """Ejecutar una predicción sobre una fila imputada (todas las features NaN)."""
+    if modelo_rapido is None or modelo_rapido.modelo is None or not modelo_rapido.columnas:
+        return
+    import numpy as np
+
+    X = modelo_rapido.nueva_matriz(1)
+    X.fill(np.nan)
+    if lote is not None:
+        lote.predecir(X)
+    elif modelo_rapido.compilado:
+        modelo_rapido.predict(X)
+
+
+def _esperar_servidor_modelos() -> None:
+    """En modo servidor el worker no carga modelos: espera a que el servidor responda."""
+    from app.ml_models.cliente_modelos import ClienteModelos
+
+    marcar_no_listo(f"Esperando servidor de modelos en {settings.MODELOS_SOCKET}")
+    cliente = ClienteModelos(settings.MODELOS_SOCKET)
+    inicio = time.perf_counter()
+    while not cliente.ping():
+        time.sleep(0.5)
+    registrar_carga("servidor_modelos", time.perf_counter() - inicio)
+
+    try:
+        from app.ml_models.recomendador_matricula import get_catalogo_cursos
+        get_catalogo_cursos()
+    except Exception as e:
+        print(f"Error precargando catálogo de cursos: {e}")
+
+
+def precargar_catalogo() -> None:
+    """Etapa "catalogo": estructuras derivadas de la tabla curso y del CSV de recursos."""
+    from app.db.database import SessionLocal
+    from app.services.catalogo import get_catalogo
+    from app.services.elegibilidad import get_motor_elegibilidad
+    from app.services.recursos import get_indice_recursos
+
+    with medir_etapa("catalogo"):
+        get_indice_recursos()
+        db = SessionLocal()
+        try:
+            get_catalogo(db)
+            get_motor_elegibilidad(db)
+        except Exception as e:
+            print(f"Error precargando catálogo: {e}")
+        finally:
+            db.close()
+
+
+def precargar_recursos() -> None:
+    """Cargar feature store, catálogo y modelos, y calentarlos con una predicción.
+
+    Cada artefacto registra su tiempo de carga en app.core.estado. Un artefacto
+    que falla no bloquea al resto: la app queda "degraded" (usa los fallbacks
+    existentes) en lugar de quedarse sin arrancar.
+    """
+    if settings.MODELOS_MODO == "servidor":
+        with medir_etapa("modelos"):
+            _esperar_servidor_modelos()
+        marcar_listo("Servidor de modelos disponible")
+        print("OK - Servidor de modelos disponible")
+        return
+
+    marcar_no_listo("Cargando modelos y datos")
+
+    with medir_etapa("imports"):
+        for nombre in (MODULO_PREDICTOR_MATRICULA, MODULO_PREDICTOR, MODULO_RECOMENDADOR):
+            importar_ml(nombre)
+
+    with medir_etapa("feature_store"):
+        try:
+            from app.ml_models.features import get_df_features
+            get_df_features()
+        except Exception as e:
+            print(f"Error precargando feature store: {e}")
+
+        if settings.FEATURES_ONLINE_ACTIVO:
+            from app.ml_models.features_online import get_constructor_features
+            get_constructor_features()
+
+    with medir_etapa("modelos"):
+        try:
+            from app.ml_models.recomendador_matricula import get_catalogo_cursos
+            get_catalogo_cursos()
+        except Exception as e:
+            print(f"Error precargando catálogo de cursos: {e}")
+
+        try:
+            from app.ml_models.predictor_nota_x_matricula import get_predictor_matricula
+            predictor_matricula = get_predictor_matricula()
+            with medir_carga("warmup_x_matricula"):
+                _calentar_modelo(predictor_matricula.modelo_rapido, predictor_matricula.lote)
+        except Exception as e:
+            print(f"Error precargando predictor por matrícula: {e}")
+
+        try:
+            from app.ml_models.predictor_nota import get_predictor
+            predictor = get_predictor()
+            with medir_carga("warmup_clasificador"):
+                _calentar_modelo(predictor.modelo_rapido)
+        except Exception as e:
+            print(f"Error precargando clasificador: {e}")
+
+    marcar_listo("Modelos y datos cargados")
+    print("OK - Recursos de ML precargados")
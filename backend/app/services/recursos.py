@@ -0,0 +1,120 @@
+"""
+Índice en memoria de los recursos académicos recomendados
+El CSV de recursos se lee una sola vez y se vuelve a leer solo cuando cambia
+su fecha de modificación (mtime). El índice permite buscar por nombre de curso
+normalizado o por código de curso, y guarda ya serializada la lista completa
+que devuelve /recursos/todos.
+"""
+
+import csv
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from app.core.http import RespuestaJSON
+from app.db.csv_import import version_tabla
+
+DATA_DIR = Path(__file__).parent.parent.parent / "data"
+RECURSOS_CSV = DATA_DIR / "recursos_recomendados_cursos_descripcion.csv"
+
+COLUMNAS_RECURSO = ("recurso_1", "recurso_2", "recurso_3", "recurso_4")
+
+
+def normalizar_nombre(nombre: str) -> str:
+    return (nombre or "").strip().upper()
+
+
+@dataclass
+class IndiceRecursos:
+    mtime: float | None
+    version_curso: str
+    por_nombre: dict = field(default_factory=dict)
+    por_codigo: dict = field(default_factory=dict)
+    todos: bytes = b"[]"
+    error: str | None = None
+
+    def buscar(self, nombre: str = "", cod_curso: str = "") -> dict | None:
+        """Recursos de un curso por nombre normalizado y, si no, por código."""
+        data = self.por_nombre.get(normalizar_nombre(nombre))
+        if data is None and cod_curso:
+            data = self.por_codigo.get(cod_curso.strip().upper())
+        return data
+
+
+def _mtime(ruta: Path) -> float | None:
+    try:
+        return os.stat(ruta).st_mtime
+    except OSError:
+        return None
+
+
+def _codigos_por_nombre() -> dict:
+    """Nombre normalizado -> código, desde la tabla curso."""
+    from app.db.database import SessionLocal
+    from app.models.curso import Curso
+
+    db = SessionLocal()
+    try:
+        return {
+            normalizar_nombre(nombre): cod
+            for cod, nombre in db.query(Curso.cod_curso, Curso.curso).all()
+        }
+    except Exception as e:
+        print(f"WARNING - No se pudo leer la tabla curso para indexar recursos: {e}")
+        return {}
+    finally:
+        db.close()
+
+
+def _construir_indice(mtime: float | None, version_curso: str) -> IndiceRecursos:
+    indice = IndiceRecursos(mtime=mtime, version_curso=version_curso)
+    filas = []
+
+    try:
+        with open(RECURSOS_CSV, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                filas.append({
+                    "curso": row['curso'],
+                    **{col: row.get(col) for col in COLUMNAS_RECURSO},
+                    "descripcion": row.get('descripcion'),
+                })
+                indice.por_nombre[normalizar_nombre(row['curso'])] = {
+                    'recursos': [r for r in (row.get(col, '') for col in COLUMNAS_RECURSO) if r and r.strip()],
+                    'descripcion': row.get('descripcion', ''),
+                }
+    except Exception as e:
+        print(f"Error cargando recursos: {e}")
+        indice.error = str(e)
+        return indice
+
+    for nombre, cod in _codigos_por_nombre().items():
+        data = indice.por_nombre.get(nombre)
+        if data is not None:
+            indice.por_codigo[cod.strip().upper()] = data
+
+    indice.todos = RespuestaJSON(filas).body
+    print(
+        f"OK - Índice de recursos cargado ({len(indice.por_nombre)} cursos, "
+        f"{len(indice.por_codigo)} con código)"
+    )
+    return indice
+
+
+_indice: IndiceRecursos | None = None
+_indice_lock = threading.Lock()
+
+
+def get_indice_recursos() -> IndiceRecursos:
+    """Índice vigente; se reconstruye si cambió el CSV o la versión de la tabla curso."""
+    global _indice
+    mtime = _mtime(RECURSOS_CSV)
+    version = version_tabla("curso")
+    indice = _indice
+    if indice is not None and indice.mtime == mtime and indice.version_curso == version:
+        return indice
+
+    with _indice_lock:
+        if _indice is None or _indice.mtime != mtime or _indice.version_curso != version:
+            _indice = _construir_indice(mtime, version)
+        return _indice
@@ -1,3 +1,3 @@
-from app.tests import recomendador
+from app.tests import recomendador, inferencia, serializacion, memoria, features_online
 
-__all__ = ["recomendador"]
\ No newline at end of file
+__all__ = ["recomendador", "inferencia", "serializacion", "memoria", "features_online"]
@@ -0,0 +1,134 @@
+import traceback
+
+import numpy as np
+
+# Columnas que identifican la fila (no son features) y las que el constructor
+# deja en NaN a propósito (fuentes externas: el modelo las imputa)
+COLUMNAS_CLAVE = ("COD_PERSONA", "PER_MATRICULA", "COD_CURSO")
+COLUMNAS_SIN_FUENTE = ("POBREZA_RES", "POBREZA_PRO", "EDAD")
+
+
+def _muestra_grupos(df, n_grupos: int):
+    """(alumno, periodo) repartidos a lo largo del dataset, en orden determinista."""
+    grupos = df.groupby(["COD_PERSONA", "PER_MATRICULA"], sort=True)
+    claves = list(grupos.groups)
+    if len(claves) > n_grupos:
+        paso = len(claves) / n_grupos
+        claves = [claves[int(i * paso)] for i in range(n_grupos)]
+    return grupos, claves
+
+
+def _iguales(esperado, obtenido) -> bool:
+    esperado_nan = esperado is None or (isinstance(esperado, float) and np.isnan(esperado))
+    obtenido_nan = obtenido is None or (isinstance(obtenido, float) and np.isnan(obtenido))
+    if esperado_nan or obtenido_nan:
+        return esperado_nan and obtenido_nan
+    try:
+        # El CSV guarda los floats redondeados: se toleran diferencias mínimas
+        return bool(np.isclose(float(esperado), float(obtenido), atol=1e-3, rtol=1e-4))
+    except (TypeError, ValueError):
+        return str(esperado).strip() == str(obtenido).strip()
+
+
+def _comparar(df, constructor, n_grupos: int) -> dict:
+    """Construir en línea las filas de cada (alumno, periodo) de la muestra y
+    compararlas columna por columna con las del dataset."""
+    grupos, claves = _muestra_grupos(df, n_grupos)
+    columnas: dict = {}
+    sin_fila = []
+
+    for cod_persona, per_matricula in claves:
+        esperado = grupos.get_group((cod_persona, per_matricula)).drop_duplicates("COD_CURSO").set_index("COD_CURSO")
+        obtenido = constructor.construir(cod_persona, list(esperado.index), per_matricula)
+        if obtenido.empty:
+            sin_fila.append(f"{cod_persona}/{per_matricula}")
+            continue
+        obtenido = obtenido.set_index("COD_CURSO")
+
+        for columna in obtenido.columns:
+            if columna in COLUMNAS_CLAVE or columna in COLUMNAS_SIN_FUENTE or columna not in esperado.columns:
+                continue
+            stats = columnas.setdefault(columna, {"comparadas": 0, "discrepancias": 0, "ejemplos": []})
+            for cod_curso, valor in obtenido[columna].items():
+                stats["comparadas"] += 1
+                valor_dataset = esperado.at[cod_curso, columna]
+                if not _iguales(valor_dataset, valor):
+                    stats["discrepancias"] += 1
+                    if len(stats["ejemplos"]) < 3:
+                        stats["ejemplos"].append({
+                            "fila": f"{cod_persona}/{per_matricula}/{cod_curso}",
+                            "dataset": str(valor_dataset),
+                            "en_linea": str(valor),
+                        })
+
+    return {"grupos": len(claves), "sin_fila": sin_fila, "columnas": columnas}
+
+
+def run_tests_features_online(n_grupos: int = 200):
+    """
+    Ejecuta pruebas de paridad entre las features calculadas en línea
+    (ConstructorFeatures) y las filas existentes del dataset de features para
+    los mismos (alumno, periodo). buscar_fila_prediccion usa la ruta en línea
+    antes que el registro histórico más reciente: solo es confiable si este
+    reporte pasa.
+
+    Retorna:
+    - Un diccionario (JSON) con el reporte de la ejecución: una prueba por
+      feature con el número de discrepancias y algunos ejemplos.
+    """
+    test_report = {
+        "status": "PENDIENTE",
+        "resumen": {
+            "total": 0,
+            "pasaron": 0,
+            "fallaron": 0
+        },
+        "results": {}
+    }
+
+    try:
+        from app.ml_models.features import get_df_features
+        from app.ml_models.features_online import get_constructor_features
+
+        df = get_df_features()
+        if df is None or df.empty:
+            raise ValueError("Dataset de features no disponible")
+        constructor = get_constructor_features()
+        if constructor is None:
+            raise ValueError("Constructor de features en línea no disponible")
+
+        comparacion = _comparar(df, constructor, n_grupos)
+    except Exception as e:
+        test_report["resumen"]["total"] += 1
+        test_report["resumen"]["fallaron"] += 1
+        test_report["results"]["test_paridad_features_online"] = {
+            "status": "FAIL",
+            "description": "Prepara el dataset de features y el constructor en línea.",
+            "error_tipo": type(e).__name__,
+            "error_detalle": str(e),
+            "traceback": traceback.format_exc(),
+        }
+        test_report["status"] = "Parity tests FAILED: Al menos una prueba falló."
+        return test_report
+
+    test_report["input"] = {"grupos": comparacion["grupos"], "sin_fila": comparacion["sin_fila"][:10]}
+
+    all_tests_passed = not comparacion["sin_fila"]
+    for columna, stats in comparacion["columnas"].items():
+        test_name = f"test_paridad_features_online_{columna}"
+        test_report["resumen"]["total"] += 1
+        paso = stats["discrepancias"] == 0
+        test_report["results"][test_name] = {
+            "status": "PASS" if paso else "FAIL",
+            "description": f"Verifica que '{columna}' calculada en línea coincida con la del dataset.",
+            "output": stats,
+        }
+        test_report["resumen"]["pasaron" if paso else "fallaron"] += 1
+        all_tests_passed &= paso
+
+    if all_tests_passed:
+        test_report["status"] = "Parity tests ran successfully: ALL PASS"
+    else:
+        test_report["status"] = "Parity tests FAILED: Al menos una prueba falló."
+
+    return test_report
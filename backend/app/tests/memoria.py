@@ -0,0 +1,194 @@
+"""
+Reporte de memoria por worker: gunicorn con y sin precarga (app.produccion)
+
+Levanta el servidor de producción dos veces (PRODUCCION_PRECARGA True/False),
+espera a que todos los workers estén listos, genera algo de tráfico y lee de
+/proc/<pid>/smaps_rollup la memoria de cada worker:
+- uss_mb: memoria propia del worker (Private_Clean + Private_Dirty).
+- pss_mb: memoria propia más su parte proporcional de la compartida.
+- rss_mb: todo lo residente, incluida la compartida con el maestro.
+
+Solo Linux. Uso:
+    python -m app.tests.memoria [workers]
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import traceback
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _memoria_proceso(pid: int) -> dict:
+    """RSS, PSS y USS (MB) de un proceso desde smaps_rollup."""
+    valores = {}
+    with open(f"/proc/{pid}/smaps_rollup") as f:
+        for linea in f:
+            partes = linea.split()
+            if len(partes) == 3 and partes[2] == "kB":
+                valores[partes[0].rstrip(":")] = int(partes[1])
+    uss = valores.get("Private_Clean", 0) + valores.get("Private_Dirty", 0)
+    return {
+        "pid": pid,
+        "rss_mb": round(valores.get("Rss", 0) / 1024, 1),
+        "pss_mb": round(valores.get("Pss", 0) / 1024, 1),
+        "uss_mb": round(uss / 1024, 1),
+    }
+
+
+def _hijos(pid: int) -> list:
+    hijos = []
+    for tarea in os.listdir(f"/proc/{pid}/task"):
+        with open(f"/proc/{pid}/task/{tarea}/children") as f:
+            hijos.extend(int(h) for h in f.read().split())
+    return hijos
+
+
+def _get(url: str, timeout: float = 5.0):
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as r:
+            return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        return e.code, None
+    except OSError:
+        return None, None
+
+
+def _post(url: str, cuerpo: dict) -> int | None:
+    solicitud = urllib.request.Request(
+        url, data=json.dumps(cuerpo).encode(), headers={"Content-Type": "application/json"}
+    )
+    try:
+        with urllib.request.urlopen(solicitud, timeout=30) as r:
+            r.read()
+            return r.status
+    except urllib.error.HTTPError as e:
+        return e.code
+    except OSError:
+        return None
+
+
+def _esperar_workers(base: str, maestro: int, workers: int, limite: float) -> None:
+    """Esperar a que /ready responda 200 en todos los workers (por pid en /arranque)."""
+    listos = set()
+    fin = time.monotonic() + limite
+    while time.monotonic() < fin:
+        if len(_hijos(maestro)) >= workers:
+            codigo, _ = _get(f"{base}/ready")
+            _, arranque = _get(f"{base}/arranque")
+            if codigo == 200 and arranque:
+                listos.add(arranque["pid"])
+            if len(listos) >= workers:
+                return
+        time.sleep(0.2)
+    raise TimeoutError(f"Solo {len(listos)}/{workers} workers listos en {limite:.0f}s")
+
+
+def _trafico(base: str, cod_personas: list, solicitudes: int) -> None:
+    """Login y predicción para que los workers toquen datos y modelos."""
+    for i in range(solicitudes):
+        cod = cod_personas[i % len(cod_personas)]
+        _post(f"{base}/api/v1/auth/login", {"cod_persona": cod, "password": f"DPD_{cod}"})
+        _post(
+            f"{base}/api/v1/prediccion/predecir-por-matricula",
+            {"cod_persona": cod, "codigos_cursos": ["MA100", "CC101"], "per_matricula": "2025-01"},
+        )
+
+
+def medir_servidor(precarga: bool, workers: int, cod_personas: list, solicitudes: int = 40,
+                   limite: float = 300.0) -> dict:
+    """Levantar app.produccion, medir memoria de maestro y workers y detenerlo."""
+    puerto = _puerto_libre()
+    base = f"http://127.0.0.1:{puerto}"
+    env = dict(
+        os.environ,
+        PRODUCCION_PRECARGA=str(precarga),
+        PRODUCCION_WORKERS=str(workers),
+        PRODUCCION_BIND=f"127.0.0.1:{puerto}",
+        # Se mide memoria, no disponibilidad: un modelo faltante no debe bloquear la espera
+        READY_PERMITIR_DEGRADADO="True",
+    )
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "app.produccion"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    inicio = time.perf_counter()
+    try:
+        _esperar_workers(base, proceso.pid, workers, limite)
+        segundos_listo = time.perf_counter() - inicio
+        _trafico(base, cod_personas, solicitudes)
+
+        por_worker = [_memoria_proceso(pid) for pid in _hijos(proceso.pid)]
+        maestro = _memoria_proceso(proceso.pid)
+        return {
+            "precarga": precarga,
+            "segundos_hasta_listo": round(segundos_listo, 2),
+            "maestro": maestro,
+            "workers": por_worker,
+            "uss_mb_por_worker": round(sum(w["uss_mb"] for w in por_worker) / len(por_worker), 1),
+            "pss_mb_total": round(maestro["pss_mb"] + sum(w["pss_mb"] for w in por_worker), 1),
+        }
+    finally:
+        proceso.terminate()
+        try:
+            proceso.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proceso.kill()
+
+
+def _cod_personas_ejemplo(n: int = 20) -> list:
+    from sqlalchemy import select
+
+    from app.db.database import SessionLocal
+    from app.models.alumno import Alumno
+
+    db = SessionLocal()
+    try:
+        return list(db.scalars(select(Alumno.cod_persona).limit(n)))
+    finally:
+        db.close()
+
+
+def run_reporte_memoria(workers: int = 4, solicitudes: int = 40) -> dict:
+    """
+    Compara la memoria por worker de app.produccion con y sin precarga.
+
+    Retorna:
+    - Un diccionario (JSON) con la medición de cada modo y el ahorro de USS
+      por worker y de PSS total.
+    """
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        return {"error": "El reporte de memoria requiere Linux (/proc/<pid>/smaps_rollup)"}
+
+    try:
+        cod_personas = _cod_personas_ejemplo()
+        con = medir_servidor(True, workers, cod_personas, solicitudes)
+        sin = medir_servidor(False, workers, cod_personas, solicitudes)
+    except Exception as e:
+        return {"error": str(e), "traceback": traceback.format_exc()}
+
+    return {
+        "workers": workers,
+        "solicitudes": solicitudes * 2,
+        "con_precarga": con,
+        "sin_precarga": sin,
+        "ahorro_uss_mb_por_worker": round(sin["uss_mb_por_worker"] - con["uss_mb_por_worker"], 1),
+        "ahorro_pss_mb_total": round(sin["pss_mb_total"] - con["pss_mb_total"], 1),
+    }
+
+
+if __name__ == "__main__":
+    n_workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    print(json.dumps(run_reporte_memoria(n_workers), indent=2))
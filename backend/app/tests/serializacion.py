@@ -0,0 +1,109 @@
+import time
+import json
+import traceback
+
+from app.core.config import settings
+from app.core.http import BROTLI_DISPONIBLE, ORJSON_DISPONIBLE, comprimir
+
+if ORJSON_DISPONIBLE:
+    import orjson
+
+
+def _medir(funcion, repeticiones):
+    """Tiempo medio (ms) de funcion() y su último resultado."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        resultado = funcion()
+    return (time.perf_counter() - inicio) * 1000 / repeticiones, resultado
+
+
+def medir_payload(payload, repeticiones: int = 20) -> dict:
+    """
+    Compara serialización json vs orjson y tamaño sin comprimir / gzip / brotli.
+
+    Usa los mismos parámetros que JSONResponse y ORJSONResponse al renderizar.
+    """
+    ms_json, cuerpo = _medir(
+        lambda: json.dumps(payload, ensure_ascii=False, allow_nan=False, indent=None,
+                           separators=(",", ":")).encode("utf-8"),
+        repeticiones,
+    )
+    medicion = {
+        "bytes": len(cuerpo),
+        "json_ms": round(ms_json, 3),
+    }
+
+    if ORJSON_DISPONIBLE:
+        ms_orjson, _ = _medir(lambda: orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS), repeticiones)
+        medicion["orjson_ms"] = round(ms_orjson, 3)
+        medicion["aceleracion_orjson"] = round(ms_json / ms_orjson, 2) if ms_orjson else None
+
+    ms_gzip, gz = _medir(lambda: comprimir(cuerpo, "gzip", nivel_gzip=settings.COMPRESION_NIVEL_GZIP), repeticiones)
+    medicion["gzip_bytes"] = len(gz)
+    medicion["gzip_ms"] = round(ms_gzip, 3)
+    medicion["gzip_ratio"] = round(len(gz) / len(cuerpo), 3)
+
+    if BROTLI_DISPONIBLE:
+        ms_br, br = _medir(lambda: comprimir(cuerpo, "br", nivel_brotli=settings.COMPRESION_NIVEL_BROTLI), repeticiones)
+        medicion["br_bytes"] = len(br)
+        medicion["br_ms"] = round(ms_br, 3)
+        medicion["br_ratio"] = round(len(br) / len(cuerpo), 3)
+
+    return medicion
+
+
+async def run_benchmark_serializacion(db, cod_persona: str = None) -> dict:
+    """
+    Mide las respuestas reales más grandes de la API: login y /mejor-horario.
+
+    Retorna:
+    - Un diccionario (JSON) con el reporte por payload.
+    """
+    from app.db.database import SesionEnHilo
+    from app.models.alumno import Alumno
+    from app.routes.auth import _construir_login
+    from app.routes.recomendacion import recomendar_mejor_horario, RecomendacionRequest
+    from app.schemas.auth import LoginRequest
+
+    report = {
+        "status": "PENDIENTE",
+        "orjson": ORJSON_DISPONIBLE,
+        "brotli": BROTLI_DISPONIBLE,
+        "results": {},
+    }
+
+    try:
+        query = db.query(Alumno)
+        if cod_persona:
+            query = query.filter(Alumno.cod_persona == cod_persona)
+        alumno = query.first()
+        if alumno is None:
+            report["status"] = "SIN DATOS"
+            return report
+
+        respuesta_login = _construir_login(
+            alumno, LoginRequest(cod_persona=alumno.cod_persona, password=alumno.contrasenia), db
+        )
+        payload_login = respuesta_login.model_dump(mode="json")
+        report["results"]["login"] = medir_payload(payload_login)
+
+        bundles = (payload_login.get("cursos_disponibles") or [])[:6]
+        if bundles:
+            respuesta_horario = await recomendar_mejor_horario(
+                RecomendacionRequest(
+                    cod_persona=alumno.cod_persona,
+                    per_matricula="2025-01",
+                    max_time=5,
+                    bundles=bundles,
+                ),
+                SesionEnHilo(db),
+            )
+            report["results"]["mejor_horario"] = medir_payload(respuesta_horario.model_dump(mode="json"))
+
+        report["status"] = "OK"
+    except Exception as e:
+        report["status"] = "ERROR"
+        report["error"] = str(e)
+        report["traceback"] = traceback.format_exc()
+
+    return report
@@ -0,0 +1,31 @@
+"""
+Configuración de gunicorn para producción (ver app/produccion.py)
+
+    python -m app.produccion
+    gunicorn -c gunicorn.conf.py
+
+Workers uvicorn; con PRODUCCION_PRECARGA el maestro carga datos y modelos
+una vez antes del fork.
+"""
+
+import sys
+
+from app.core.config import settings
+
+wsgi_app = "app.produccion:app"
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = settings.PRODUCCION_WORKERS
+bind = settings.PRODUCCION_BIND
+preload_app = settings.PRODUCCION_PRECARGA
+
+# Sin precarga cada worker carga modelos al importar la app
+timeout = 120
+graceful_timeout = 30
+
+
+def post_fork(server, worker):
+    # Solo con precarga el worker hereda conexiones abiertas por el maestro
+    if "app.produccion" in sys.modules:
+        from app.produccion import tras_fork
+
+        tras_fork()